@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands, tasks
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 
 from datetime import datetime
 from pytz import timezone
@@ -10,6 +10,7 @@ from typing import List, Tuple, Union, Optional, Dict, Any
 from extra import utils
 from extra.menu import PaginatorView
 from extra.tool.voice_channel_history import VoiceChannelHistoryTable, VoiceChannelHistorySystem
+from extra.tool.voice_activity_store import voice_activity_store
 
 allowed_roles = [int(os.getenv('OWNER_ROLE_ID', 123)), int(os.getenv('ADMIN_ROLE_ID', 123)), int(os.getenv('MOD_ROLE_ID', 123))]
 
@@ -25,13 +26,15 @@ class VoiceChannelActivity(*tool_cogs):
 
         self.client = client
         self.server_id = int(os.getenv('SERVER_ID', 123))
+        # Hours of the day that expired from the store and still have to be deleted from the database
+        self.expired_hours: List[int] = []
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """ Tells when the cog is ready to use. """
 
+        await self.load_voice_channel_activity()
         self.calculate.start()
-        self.check_old_record_deletion_time.start()
         self.check_exceeding_voice_channels_from_history.start()
 
         print('VoiceChannelActivity cog is online!')
@@ -56,34 +59,30 @@ class VoiceChannelActivity(*tool_cogs):
             return
 
         if channel := after.channel:
-
-            tzone = timezone('Europe/Berlin')
-            date_and_time = datetime.now().astimezone(tzone)
-            the_time = date_and_time.strftime('%H:%M')
-
-            await self.insert_row(the_time, channel.id, channel.name, member.id, member.name)
+            # Written into the database with the next snapshot
+            self.expired_hours.extend(
+                voice_activity_store.add(await self.get_current_minute(), channel.id, channel.name, member.id, member.name))
 
     @tasks.loop(seconds=60)
     async def calculate(self) -> None:
         """ Calculates all members that are in a voice channel. """
-        tzone = timezone('Europe/Berlin')
-        date_and_time = datetime.now().astimezone(tzone)
-        the_time = date_and_time.strftime('%H:%M')
 
-        print(f'Calculate VC at {the_time}')
+        the_minute = await self.get_current_minute()
+        print(f'Calculate VC at {the_minute // 60:02}:{the_minute % 60:02}')
         guild = self.client.get_guild(self.server_id)
-        channels = [c for c in guild.voice_channels]
 
-        all_channel_members = []
+        for channel in guild.voice_channels:
+            for member in channel.members:
+                self.expired_hours.extend(
+                    voice_activity_store.add(the_minute, channel.id, channel.name, member.id, member.name))
+
+        await self.flush_voice_channel_activity()
 
-        for channel in channels:
-            if channel.members:
-                channel_members = [(the_time, channel.id, channel.name, m.id, m.name) for m in channel.members]
-                all_channel_members.append(channel_members)
+    async def get_current_minute(self) -> int:
+        """ Gets the current minute of the day, in the Europe/Berlin timezone. """
 
-        all_channel_members = [m for c in all_channel_members for m in c]
-        if all_channel_members:
-            await self.insert_first_row(all_channel_members)
+        date_and_time = datetime.now().astimezone(timezone('Europe/Berlin'))
+        return date_and_time.hour * 60 + date_and_time.minute
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -96,9 +95,13 @@ class VoiceChannelActivity(*tool_cogs):
         mycursor, db = await the_database()
         await mycursor.execute("""
             CREATE TABLE VoiceChannelActivity (
-                the_time TIME NOT NULL, channel_id BIGINT NOT NULL,
-                channel_name VARCHAR(50) NOT NULL, member_id BIGINT NOT NULL,
-                member_name VARCHAR(50) NOT NULL) DEFAULT CHARSET utf8mb4
+                the_minute SMALLINT UNSIGNED NOT NULL, channel_id BIGINT NOT NULL,
+                member_id BIGINT NOT NULL, KEY (the_minute))
+        """)
+        await mycursor.execute("""
+            CREATE TABLE VoiceChannelActivityNames (
+                discord_id BIGINT NOT NULL, name VARCHAR(100) NOT NULL,
+                PRIMARY KEY (discord_id)) DEFAULT CHARSET utf8mb4
         """)
         await db.commit()
         await mycursor.close()
@@ -114,8 +117,10 @@ class VoiceChannelActivity(*tool_cogs):
 
         mycursor, db = await the_database()
         await mycursor.execute("DROP TABLE VoiceChannelActivity")
+        await mycursor.execute("DROP TABLE IF EXISTS VoiceChannelActivityNames")
         await db.commit()
         await mycursor.close()
+        voice_activity_store.clear()
         await ctx.send("**Table __VoiceChannelActivity__ dropped!**")
 
     @commands.command(hidden=True)
@@ -128,112 +133,112 @@ class VoiceChannelActivity(*tool_cogs):
 
         mycursor, db = await the_database()
         await mycursor.execute("DELETE FROM VoiceChannelActivity")
+        await mycursor.execute("DELETE FROM VoiceChannelActivityNames")
         await db.commit()
         await mycursor.close()
+        voice_activity_store.clear()
         await ctx.send("**Table __VoiceChannelActivity__ reset!**")
 
-    async def insert_first_row(self, channel_members: List[Tuple[Union[int, str]]]) -> None:
-        """ Inserts the first row of the minute with the info of all users who are in voice channels.
-        :param channel_members: A list of tuples containing the individual members and their info. """
+    async def table_voice_channel_activity_exists(self) -> bool:
+        """ Checks whether the VoiceChannelActivity table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.executemany("""
-            INSERT INTO VoiceChannelActivity (the_time, channel_id, channel_name, member_id, member_name)
-            VALUES (%s, %s, %s, %s, %s)""", channel_members)
-        await db.commit()
-        await mycursor.close()
+        return await table_exists('VoiceChannelActivity')
 
-    async def insert_row(self, the_time: datetime, channel_id: int, channel_name: str, member_id: int, member_name: str) -> None:
-        """ Inserts a row containing info of member and the voice channel that they're currently in.
-        :param the_time: The current time.
-        :param: channel_id: The ID channel that the member is in.
-        :param channel_name: The name of the channel that the member is in.
-        :param member_id: The ID of the member.
-        :param member_name: The name of the member. """
+    async def load_voice_channel_activity(self) -> None:
+        """ Loads the records of the last hours from the database into the store. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO VoiceChannelActivity (the_time, channel_id, channel_name, member_id, member_name)
-            VALUES (%s, %s, %s, %s, %s)""", (the_time, channel_id, channel_name, member_id, member_name))
-        await db.commit()
-        await mycursor.close()
+        if not await self.table_voice_channel_activity_exists():
+            return
 
-    @tasks.loop(seconds=60)
-    async def check_old_record_deletion_time(self, limit_hours: int = 6) -> None:
-        """ Checks whether it's time to delete old records.
-        :param limit_hours: The limit of hours that the DB needs to store,
-        PS: If the number of registered hours in the DB is exceeded, the oldest records will be deleted,
-        so the limit is satisfied again. """
+        mycursor, _ = await the_database()
+        try:
+            await mycursor.execute("SELECT the_minute, channel_id, member_id FROM VoiceChannelActivity")
+            records = await mycursor.fetchall()
+            await mycursor.execute("SELECT discord_id, name FROM VoiceChannelActivityNames")
+            names = await mycursor.fetchall()
+        except Exception as e:
+            # E.g. the table still has the old layout and has to be recreated
+            return print('VoiceChannelActivity load error', e)
+        finally:
+            await mycursor.close()
+
+        self.expired_hours.extend(voice_activity_store.load(records, names, await self.get_current_minute()))
+
+    async def flush_voice_channel_activity(self) -> None:
+        """ Writes the pending records and names into the database, and deletes the expired hours. """
+
+        records, voice_activity_store.pending = voice_activity_store.pending, []
+        names, voice_activity_store.pending_names = voice_activity_store.pending_names, {}
+        expired_hours, self.expired_hours = self.expired_hours, []
+        if not await self.table_voice_channel_activity_exists():
+            return
 
         mycursor, db = await the_database()
-        await mycursor.execute("SELECT DISTINCT HOUR(the_time) FROM VoiceChannelActivity")
-        hours = [h[0] for h in await mycursor.fetchall()]
+        try:
+            for hour in expired_hours:
+                await mycursor.execute(
+                    "DELETE FROM VoiceChannelActivity WHERE the_minute BETWEEN %s AND %s", (hour * 60, hour * 60 + 59))
+
+            if records:
+                await mycursor.executemany("""
+                    INSERT INTO VoiceChannelActivity (the_minute, channel_id, member_id)
+                    VALUES (%s, %s, %s)""", records)
+
+            if names:
+                await mycursor.executemany("""
+                    INSERT INTO VoiceChannelActivityNames (discord_id, name) VALUES (%s, %s)
+                    ON DUPLICATE KEY UPDATE name = VALUES(name)""", list(names.items()))
+
+            if expired_hours:
+                await mycursor.execute("""
+                    DELETE FROM VoiceChannelActivityNames WHERE discord_id NOT IN (
+                        SELECT channel_id FROM VoiceChannelActivity UNION SELECT member_id FROM VoiceChannelActivity)""")
 
-        if limit_hours < len(hours):
-            await mycursor.execute("DELETE FROM VoiceChannelActivity WHERE HOUR(the_time) = %s", (hours.pop(0),))
             await db.commit()
+        except Exception as e:
+            print('VoiceChannelActivity flush error', e)
+        finally:
+            await mycursor.close()
+
+    async def get_minute_range(self, time: str, time2: str = None) -> Tuple[int, int, datetime, str, str]:
+        """ Gets the range of minutes of the day for the given time(s).
+        :param time: The time, either in the (HOUR) or (HOUR:MINUTE) format.
+        :param time2: The end time, in the same format. [Optional]
+        PS: Without an end time, an (HOUR) covers the whole hour, and an (HOUR:MINUTE)
+        either (HOUR:00 - HOUR:29) or (HOUR:30 - HOUR:59).
+        :returns: The first and last minutes, the parsed time and the labels of the first and last minutes. """
 
-    async def get_hour_record_by_channel(self, channel: discord.TextChannel, time: str, time2: str = None) -> List[List[Union[datetime, str, int]]]:
-        """ Gets all user records at a given hour and channel.
-        :param channel_id: The ID of the channel to which you are filtering.
-        :param time: The time to which you are filtering the search. """
-
-        mycursor, db = await the_database()
-        text = ''
-
+        # If in format (HOUR)
         if len(time) < 3:
             time = datetime.strptime(time, '%H')
+            end_hour = datetime.strptime(time2, '%H').hour if time2 else time.hour
+            start, end = time.hour * 60, end_hour * 60 + 59
 
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H')
-                await mycursor.execute("""
-                    SELECT DISTINCT HOUR(the_time), member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND HOUR(the_time) BETWEEN %s AND %s""",
-                    (channel.id, time.hour, time2.hour))
-
-                text = f"Users who joined `{channel}` between `{time.hour}:00` and `{time2.hour}:59`:"
-            else:
-                await mycursor.execute("""
-                    SELECT DISTINCT HOUR(the_time), member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND HOUR(the_time) = %s""",
-                    (channel.id, time.hour))
-
-                text = f"Users who joined `{channel}` between `{time.hour}:00` and `{time.hour}:59`:"
-
+        # If in format (HOUR:MINUTE)
         else:
             time = datetime.strptime(time, '%H:%M')
-
-            # Checks whether two values were passed
             if time2:
                 time2 = datetime.strptime(time2, '%H:%M')
-                the_time1 = f"{time.hour}:{time.minute}"
-                the_time2 = f"{time2.hour}:{time2.minute}"
+                start, end = time.hour * 60 + time.minute, time2.hour * 60 + time2.minute
+            else:
+                start = time.hour * 60 + (0 if time.minute <= 29 else 30)
+                end = start + 29
 
-                text = f"Users who joined `{channel}` between `{the_time1}` and `{the_time2}`:"
+        return start, end, time, f"{start // 60}:{start % 60:02}", f"{end // 60}:{end % 60:02}"
 
-                await mycursor.execute("""
-                    SELECT DISTINCT the_time, member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND the_time BETWEEN %s AND %s""",
-                    (channel.id, the_time1, the_time2))
+    async def get_hour_record_by_channel(self, channel: discord.TextChannel, time: str, time2: str = None) -> List[List[Union[datetime, str, int]]]:
+        """ Gets all user records at a given hour and channel.
+        :param channel_id: The ID of the channel to which you are filtering.
+        :param time: The time to which you are filtering the search. """
 
-            # If not, assumes the second value
-            else:
-                if time.minute >= 0 and time.minute <= 29:
-                    the_time1 = f"{time.hour}:00"
-                    the_time2 = f"{time.hour}:29"
-                else:
-                    the_time1 = f"{time.hour}:30"
-                    the_time2 = f"{time.hour}:59"
+        start, end, time, the_time1, the_time2 = await self.get_minute_range(time, time2)
+        text = f"Users who joined `{channel}` between `{the_time1}` and `{the_time2}`:"
 
-                text = f"Users who joined `{channel}` between `{the_time1}` and `{the_time2}`:"
-                await mycursor.execute("""
-                    SELECT DISTINCT the_time, member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND the_time BETWEEN %s AND %s""",
-                    (channel.id, the_time1, the_time2))
+        members: Dict[int, int] = {}
+        for the_minute, _, member_id in voice_activity_store.scan(start, end, channel_id=channel.id):
+            members.setdefault(member_id, the_minute)
 
-        records = await mycursor.fetchall()
-        await mycursor.close()
+        records = [(the_minute, voice_activity_store.get_name(member_id), member_id) for member_id, the_minute in members.items()]
         return records, time, text
 
     async def get_user_record_by_time(self, member: discord.Member, time: str, time2: str = None) -> List[Union[int, str]]:
@@ -241,71 +246,14 @@ class VoiceChannelActivity(*tool_cogs):
         :param member: The member from whom you want to fetch information.
         :param time: The time at around the user that you are looking for has to have information. """
 
-        mycursor, _ = await the_database()
-
-        text = ''
-        # If in format (HOUR)
-        if len(time) < 3:
-            time = datetime.strptime(time, '%H')
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H')
-                await mycursor.execute("""
-                    SELECT DISTINCT HOUR(the_time), channel_id, channel_name,  member_id
-                    FROM VoiceChannelActivity WHERE HOUR(the_time) BETWEEN %s AND %s AND member_id = %s""",
-                    (time.hour, time2.hour, member.id))
-
-                text = f"User between `{time.hour}` and `{time2.hour}` was in:"
-
-            # If not, gets all values from that hour.
-            else:
-                await mycursor.execute("""
-                    SELECT DISTINCT HOUR(the_time), channel_id, channel_name,  member_id
-                    FROM VoiceChannelActivity WHERE HOUR(the_time) = %s AND member_id = %s""",
-                    (time.hour, member.id))
-
-                text = f"User between `{time.hour}` and `{time.hour}` was in:"
-
-        else:
-            # If in format (HOUR:MINUTE)
-            time = datetime.strptime(time, '%H:%M')
-
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H:%M')
-                the_time1 = f"{time.hour}:{time.minute}"
-                the_time2 = f"{time2.hour}:{time2.minute}"
+        start, end, time, the_time1, the_time2 = await self.get_minute_range(time, time2)
+        text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
 
-                await mycursor.execute("""
-                    SELECT DISTINCT the_time, channel_id, channel_name, member_id
-                    FROM VoiceChannelActivity
-                    WHERE the_time BETWEEN %s AND %s AND member_id = %s""",
-                    (the_time1, the_time2, member.id))
-
-                text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
+        channels: Dict[int, int] = {}
+        for the_minute, channel_id, _ in voice_activity_store.scan(start, end, member_id=member.id):
+            channels.setdefault(channel_id, the_minute)
 
-            # If not, gets values from either (HOUR:00 - HOUR:29) or (HOUR:30 - HOUR:59)
-            else:
-                # If it's between HOUR:00 and HOUR:29
-                if time.minute >= 0 and time.minute <= 29:
-                    the_time1 = f"{time.hour}:00"
-                    the_time2 = f"{time.hour}:29"
-                    text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
-
-                # If it's between HOUR:30 and HOUR:30
-                else:
-                    the_time1 = f"{time.hour}:30"
-                    the_time2 = f"{time.hour}:59"
-                    text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
-
-                await mycursor.execute("""
-                    SELECT DISTINCT the_time, channel_id, channel_name, member_id
-                    FROM VoiceChannelActivity
-                    WHERE the_time BETWEEN %s AND %s AND member_id = %s""",
-                    (the_time1, the_time2, member.id))
-
-        records = await mycursor.fetchall()
-        await mycursor.close()
+        records = [(the_minute, channel_id, voice_activity_store.get_name(channel_id), member.id) for channel_id, the_minute in channels.items()]
         return records, time, text
 
     async def format_time(self, time: str) -> str:
@@ -5,8 +5,10 @@ from discord.ext import commands, tasks
 from datetime import timedelta
 from extra import utils
 from extra.analytics import SlothAnalyticsTable, DataBumpsTable
+from extra.currency.activitybuffer import activity_buffer
 
-from PIL import Image, ImageFont, ImageDraw
+from PIL import Image, ImageDraw
+from extra.imaging.fonts import fonts
 from typing import List
 import os
 import io
@@ -43,7 +45,7 @@ class Analytics(*analytics_cogs):
             members = channel.guild.members
             info = await self.get_info()
             online_members = [om for om in members if str(om.status) == "online"]
-            small = ImageFont.truetype("built titling sb.ttf", 45)
+            small = fonts.get("built titling sb.ttf", 45)
             analytics = Image.open("./png/analytics.png").resize((500, 600))
             draw = ImageDraw.Draw(analytics)
             draw.text((140, 270), f"{info[0]}", (255, 255, 255), font=small)
@@ -89,7 +91,7 @@ class Analytics(*analytics_cogs):
         if not message.guild:
             return
 
-        await self.update_messages()
+        activity_buffer.add_analytics_messages()
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
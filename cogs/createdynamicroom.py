@@ -72,12 +72,7 @@ class DynRoomUserVCstampDatabase:
     async def table_user_dr_vc_ts_exists(self) -> bool:
         """ Checks whether the DynRoomUserVCstamp table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'DynRoomUserVCstamp'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        return len(table_info) != 0
+        return await table_exists('DynRoomUserVCstamp')
 
     async def update_user_dr_vc_ts(self, user_id: int, new_ts: int) -> None:
         """ Updates the user's DynamicRoom voice channel join timestamp.
@@ -214,12 +209,7 @@ class DynamicRoomDatabase:
     async def table_dynamic_rooms_exists(self) -> bool:
         """ Checks whether the DynamicRoom table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'DynamicRoom'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        return any(table_info)
+        return await table_exists('DynamicRoom')
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -332,12 +322,7 @@ class LanguageRoomDatabase:
     async def table_language_room_exists(self) -> bool:
         """ Checks whether the LanguageRoom table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'LanguageRoom'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        return len(table_info) != 0
+        return await table_exists('LanguageRoom')
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -372,12 +357,7 @@ class LanguageRoomDatabase:
     async def table_language_room_exists(self) -> bool:
         """ Checks whether the LanguageRoom table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'LanguageRoom'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        return len(table_info) != 0
+        return await table_exists('LanguageRoom')
 
     async def get_rooms_by_ids(self, ids: set, object_form: bool=False) -> Union[List[List[object]], List[DynamicRoom]]:
         """ Returns room data from given ids.
@@ -3,13 +3,15 @@ from extra import utils
 from discord.ext import commands, tasks
 from datetime import datetime
 import asyncio
-from PIL import Image, ImageFont, ImageDraw
+from io import BytesIO
 import os
 from cogs.slothcurrency import SlothCurrency
 from mysqldb import *
 from typing import List, Union, Any, Optional
 
 from extra.menu import ConfirmSkill
+from extra.imaging.renderer import renderer
+from extra.imaging.renders import render_smartroom_preview
 from extra.smartroom.smartroom import PremiumVcTable, GalaxyVcTable, UserVcStampTable
 
 smart_room_cogs: List[commands.Cog] = [
@@ -212,8 +214,8 @@ class CreateSmartRoom(*smart_room_cogs):
 			return
 
 		# Gets the configuration confirmation
-		await self.make_preview_basic(member.id, name, limit)
-		msg3 = await member.send(file=discord.File(f'./images/smart_vc/user_previews/{member.id}.png'))
+		preview = await self.make_preview_basic(name, limit)
+		msg3 = await member.send(file=discord.File(BytesIO(preview), filename='preview.png'))
 		await msg3.add_reaction('✅')
 		await msg3.add_reaction('❌')
 		bot_msg = msg3
@@ -255,11 +257,6 @@ class CreateSmartRoom(*smart_room_cogs):
 				await creation.delete()
 			else:
 				await self.log_smartroom_creation(member, 'basic', vc=creation)
-			finally:
-				try:
-					os.remove(f'./images/smart_vc/user_previews/{member.id}.png')
-				except Exception:
-					pass
 		else:
 			return
 
@@ -313,8 +310,8 @@ class CreateSmartRoom(*smart_room_cogs):
 			return
 
 		# Gets the configuration confirmation
-		await self.make_preview_premium(member.id, name, name, limit)
-		msg3 = await member.send(file=discord.File(f'./images/smart_vc/user_previews/{member.id}.png'))
+		preview = await self.make_preview_premium(name, name, limit)
+		msg3 = await member.send(file=discord.File(BytesIO(preview), filename='preview.png'))
 		await msg3.add_reaction('✅')
 		await msg3.add_reaction('❌')
 		bot_msg = msg3
@@ -376,11 +373,6 @@ class CreateSmartRoom(*smart_room_cogs):
 					await txt_channel.delete()
 			else:
 				await self.log_smartroom_creation(member, 'premium', vc=vc_channel, txt=txt_channel)
-			finally:
-				try:
-					os.remove(f'./images/smart_vc/user_previews/{member.id}.png')
-				except Exception:
-					pass
 
 		else:
 			return
@@ -503,9 +495,9 @@ class CreateSmartRoom(*smart_room_cogs):
 
 		# Makes the preview image
 		# member_id, cat_name, txt1, txt2, txt3, vc, size
-		await self.make_preview_galaxy(member.id, category_name, txt1_name, vc_name, limit)
+		preview = await self.make_preview_galaxy(category_name, txt1_name, vc_name, limit)
 		# Gets the configuration confirmation
-		msg5 = await member.send(file=discord.File(f'./images/smart_vc/user_previews/{member.id}.png'))
+		msg5 = await member.send(file=discord.File(BytesIO(preview), filename='preview.png'))
 		await msg5.add_reaction('✅')
 		await msg5.add_reaction('❌')
 		bot_msg = msg5
@@ -581,11 +573,6 @@ class CreateSmartRoom(*smart_room_cogs):
 			else:
 				await self.log_smartroom_creation(member, 'galaxy', vc=vc_channel, txt=txt_channel1, cat=the_cat)
 			finally:
-				try:
-					os.remove(f'./images/smart_vc/user_previews/{member.id}.png')
-				except Exception:
-					pass
-
 				await member.send(embed=discord.Embed(description="""**Congrats you created a galaxy room** :tada:
 Here are some rules and rights:
 
@@ -633,62 +620,31 @@ You can only add either **threads** **OR** one **voice channel**"""))
 		else:
 			return reaction, user
 
-	async def overwrite_image(self, member_id, text, coords, color, image) -> None:
-		""" Writes a text on a Smartroom's image preview, and overwrites the original one.
-		:param member_id: The ID of the user who's creating it.
-		:param text: The text that's gonna be written.
-		:param coords: The coordinates for the text.
-		:param color: The color of the text.
-		:param image: The image to write on. """
-
-		small = ImageFont.truetype("./images/smart_vc/uni-sans-regular.ttf", 40)
-		base = Image.open(image)
-		draw = ImageDraw.Draw(base)
-		draw.text(coords, text, color, font=small)
-		base.save(f'./images/smart_vc/user_previews/{member_id}.png')
-
-	async def overwrite_image_with_image(self, member_id, coords, size) -> None:
-		""" Pastes a voice channel image on top of a SmartRoom's image preview
-		and overwrites the original one.
-		:param member_id: The ID of the user who's creating it.
-		:param coords: The coordinates for the image that's gonna be pasted on top of it.
-		:param size: The size of the voice channel. """
-
-		path = f'./images/smart_vc/user_previews/{member_id}.png'
-		user_preview = Image.open(path)
-		size_image = Image.open(size).resize((78, 44), Image.LANCZOS)
-		user_preview.paste(size_image, coords, size_image)
-		user_preview.save(path)
-
-	async def make_preview_basic(self, member_id, vc, size) -> None:
+	async def make_preview_basic(self, vc, size) -> bytes:
 		""" Makes a creation preview for a Basic Room.
-		:param member_id: The ID of the user who's creating it.
 		:param vc: The voice channel name.
 		:param size: The voice channel size; user limit. """
 
 		preview_template = './images/smart_vc/basic/1 preview2.png'
 		color = (132, 142, 142)
-		await self.overwrite_image(member_id, vc, (585, 870), color, preview_template)
-		if int(size) != 0:
-			await self.overwrite_image_with_image(member_id, (405, 870), f'./images/smart_vc/sizes/voice channel ({size}).png')
+		size_image = (f'./images/smart_vc/sizes/voice channel ({size}).png', (405, 870)) if int(size) != 0 else None
+		return await renderer.render(
+			render_smartroom_preview, preview_template, [(vc, (585, 870))], color, size_image)
 
-	async def make_preview_premium(self, member_id, txt, vc, size) -> None:
+	async def make_preview_premium(self, txt, vc, size) -> bytes:
 		""" Makes a creation preview for a Premium Room.
-		:param member_id: The ID of the user who's creating it.
 		:param txt: The name o the first text channel.
 		:param vc: The voice channel name.
 		:param size: The voice channel size; user limit. """
 
 		preview_template = './images/smart_vc/premium/2 preview2.png'
 		color = (132, 142, 142)
-		await self.overwrite_image(member_id, txt.lower(), (585, 760), color, preview_template)
-		await self.overwrite_image(member_id, vc, (585, 955), color, f'./images/smart_vc/user_previews/{member_id}.png')
-		if int(size) != 0:
-			await self.overwrite_image_with_image(member_id, (405, 955), f'./images/smart_vc/sizes/voice channel ({size}).png')
+		size_image = (f'./images/smart_vc/sizes/voice channel ({size}).png', (405, 955)) if int(size) != 0 else None
+		return await renderer.render(
+			render_smartroom_preview, preview_template, [(txt.lower(), (585, 760)), (vc, (585, 955))], color, size_image)
 
-	async def make_preview_galaxy(self, member_id: int, cat_name: str, txt1: str, vc: str, size: int) -> None:
+	async def make_preview_galaxy(self, cat_name: str, txt1: str, vc: str, size: int) -> bytes:
 		""" Makes a creation preview for a Galaxy Room.
-		:param member_id: The ID of the user who's creating it.
 		:param cat_name: The category name.
 		:param txt1: The name o the first text channel.
 		:param txt2: The name o the second text channel.
@@ -698,11 +654,10 @@ You can only add either **threads** **OR** one **voice channel**"""))
 
 		preview_template = './images/smart_vc/galaxy/3 preview2.png'
 		color = (132, 142, 142)
-		await self.overwrite_image(member_id, cat_name, (505, 730), color, preview_template)
-		await self.overwrite_image(member_id, txt1.lower(), (585, 840), color, f'./images/smart_vc/user_previews/{member_id}.png')
-		await self.overwrite_image(member_id, vc, (585, 970), color, f'./images/smart_vc/user_previews/{member_id}.png')
-		if int(size) != 0:
-			await self.overwrite_image_with_image(member_id, (375, 965), f'./images/smart_vc/sizes/voice channel ({size}).png')
+		size_image = (f'./images/smart_vc/sizes/voice channel ({size}).png', (375, 965)) if int(size) != 0 else None
+		return await renderer.render(
+			render_smartroom_preview, preview_template,
+			[(cat_name, (505, 730)), (txt1.lower(), (585, 840)), (vc, (585, 970))], color, size_image)
 
 	async def handle_permissions(self, members: List[discord.Member], galaxy_room: List[Union[int, str]], guild: discord.Guild, allow: bool = True) -> List[str]:
 		""" Handles permissions for a member in one's Galaxy Room.
@@ -1,6 +1,6 @@
 import discord
 from discord import SlashCommandGroup, option, Option, ApplicationContext, slash_command
-from discord.ext import commands, tasks
+from discord.ext import commands
 from typing import List, Union, Any, Optional
 import os
 
@@ -8,6 +8,7 @@ from extra import utils
 from extra.view import GiveawayView
 from extra.prompt.menu import ConfirmButton
 from extra.misc.giveaways import GiveawaysTable, GiveawayEntriesTable
+from extra.scheduler import scheduler
 
 server_id = int(os.getenv('SERVER_ID', 123))
 giveaway_manager_role_id: int = int(os.getenv('GIVEAWAY_MANAGER_ROLE_ID', 123))
@@ -38,12 +39,11 @@ class Giveaways(*giveaway_cogs):
             except:
                 pass
 
-        self.check_old_giveaways.start() # Deletes old giveaways
-        self.check_due_giveaways.start() # Checks due giveaways
+        await scheduler.register('old_giveaways', self.check_old_giveaways, self.get_next_old_giveaway_deadline) # Deletes old giveaways
+        await scheduler.register('due_giveaways', self.check_due_giveaways, self.get_next_giveaway_deadline) # Checks due giveaways
         print('Giveaways cog is online!')
 
 
-    @tasks.loop(minutes=1)
     async def check_due_giveaways(self) -> None:
         """ Checks due giveaways and ends them. """
 
@@ -89,7 +89,6 @@ class Giveaways(*giveaway_cogs):
             # Notifies the giveaway's termination
             await self.update_giveaway(giveaway[0])
 
-    @tasks.loop(minutes=1)
     async def check_old_giveaways(self) -> None:
         """ Looks for old giveaways and deletes them.
         
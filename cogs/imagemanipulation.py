@@ -3,12 +3,34 @@ from discord.ext import commands
 from extra import utils
 
 import os
-from typing import Union, List, Any, Optional
+from typing import List, Any, Optional, Dict, Tuple
 
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image
 from io import BytesIO
 from random import choice
-import math
+
+from extra.imaging.renderer import renderer
+from extra.imaging.renders import apply_image_filters
+from extra.imaging.workingset import working_images
+
+# The filters that can be chained with the filters command, with their filter names and options
+chainable_filters: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    'lighten': ('brightness', {'action': 'lighten'}),
+    'darken': ('brightness', {'action': 'darken'}),
+    'red': ('brightness', {'action': 'lighten', 'g': False, 'b': False}),
+    'blue': ('brightness', {'action': 'lighten', 'r': False, 'g': False}),
+    'yellow': ('brightness', {'action': 'lighten', 'b': False}),
+    'light_blue': ('brightness', {'action': 'lighten', 'r': False}),
+    'purple': ('brightness', {'action': 'lighten', 'g': False}),
+    'green': ('brightness', {'action': 'lighten', 'r': False, 'b': False}),
+    'flip': ('flip', {}),
+    'mirror': ('mirror', {}),
+    'rain': ('rain', {}),
+    'gray': ('gray', {}),
+    'wave': ('wave', {}),
+    'invert': ('invert', {}),
+}
+max_chained_filters: int = 10
 
 class ImageManipulation(commands.Cog):
     """ Categories for image manipulations and visualization. """
@@ -17,9 +39,6 @@ class ImageManipulation(commands.Cog):
         """ Class' init method. """
 
         self.client = client
-        self.cached_image: Union[
-            discord.Member.display_avatar, discord.User.display_avatar,
-            discord.Guild.banner] = None
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -44,7 +63,7 @@ class ImageManipulation(commands.Cog):
         )
 
         embed.set_image(url=display)
-        self.cached_image = display
+        working_images.set(ctx.author.id, ctx.channel.id, display)
         await ctx.reply(embed=embed)
 
     @commands.command()
@@ -70,79 +89,35 @@ class ImageManipulation(commands.Cog):
         )
 
         embed.set_image(url=banner)
-        self.cached_image = banner
+        working_images.set(ctx.author.id, ctx.channel.id, banner)
         await ctx.send(embed=embed)
 
     @commands.command(aliases=["cache", "cached_image", "ci"])
     async def cached(self, ctx) -> None:
-        """ Shows the cached image. """
+        """ Shows your cached image in this channel. """
 
-        file = self.cached_image
+        file = working_images.get(ctx.author.id, ctx.channel.id)
 
         if not file:
             return await ctx.reply(f"**There isn't a cached image, {ctx.author.mention}!**")
 
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-
-        embed.set_image(url='attachment://cached_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'cached_image.png'))
+        await self.send_filtered_image(ctx, file, 'none', 'cached_image.png')
 
     @commands.command()
     async def flip(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Flips an image upside down.
         :param member: The member to flip the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image = ImageOps.flip(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://flipped_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'flipped_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'flip', 'flipped_image.png')
 
     @commands.command(aliases=["side"])
     async def sideways(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Flips an image sideways.
         :param member: The member to flip the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image = ImageOps.mirror(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://mirrored_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'mirrored_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'mirror', 'mirrored_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -150,27 +125,8 @@ class ImageManipulation(commands.Cog):
         """ Rains on an image, making its colors look different.
         :param member: The member of whom to rain on the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image: Image.Image = ImageOps.posterize(image, 2)
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://rain_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'rain_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'rain', 'rain_image.png')
 
 
     @commands.command()
@@ -195,30 +151,12 @@ class ImageManipulation(commands.Cog):
         :param member: The member to rotate the profile picture from. [Optional][Default = Cached Image]
         :param scale: The scale to rotate the image. [Optional][Default = Random] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
+        file = self.get_target_file(ctx, member)
 
         if not scale:
             scale = choice([90, 180, 50, 45, 270, 120, 80])
 
-        image = image.rotate(int(scale))
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://rotated_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'rotated_image.png'))
+        await self.send_filtered_image(ctx, file, 'rotate', 'rotated_image.png', scale=scale)
 
     @commands.command(aliases=['light', 'brighten', 'bright'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -226,24 +164,8 @@ class ImageManipulation(commands.Cog):
         """ Lightens an image.
         :param member: The member of whom to lighten the picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://lightened_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'lightened_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'lightened_image.png', action='lighten', percentage=percentage)
 
     @commands.command(aliases=['dark', 'dim'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -251,83 +173,46 @@ class ImageManipulation(commands.Cog):
         """ Darkens an image.
         :param member: The member of whom to darken the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'darkened_image.png', action='darken', percentage=percentage)
+
+    def get_target_file(self, ctx, member: Optional[discord.Member] = None) -> Any:
+        """ Gets the image to manipulate.
+        :param member: The member to get the profile picture from. [Optional][Default = Cached Image or yours]
+        PS: The cached image is the last one the user worked on in the channel. """
 
         if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='darken', percentage=percentage)
-        self.cached_image = image
+            return member.display_avatar
+
+        if (image := working_images.get(ctx.author.id, ctx.channel.id)) is not None:
+            return image
+        return ctx.author.display_avatar
+
+    async def send_filtered_image(self, ctx, file: Any, filter_name: str, file_name: str, **options) -> None:
+        """ Applies a filter to an image off the event loop, caches and sends the result.
+        :param file: The image or asset to apply the filter to.
+        :param filter_name: The name of the filter.
+        :param file_name: The name of the file to send.
+        :param options: The filter's options. """
+
+        await self.send_chained_image(ctx, file, [(filter_name, options)], file_name)
+
+    async def send_chained_image(self, ctx, file: Any, filters: List[Tuple[str, Dict[str, Any]]], file_name: str) -> None:
+        """ Applies a chain of filters to an image in one render, caches and sends the result.
+        :param file: The image or asset to apply the filters to.
+        :param filters: The names and options of the filters, in order.
+        :param file_name: The name of the file to send. """
+
+        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
+        image, bytes_image = await renderer.render(apply_image_filters, image, filters)
+
+        # The user's next commands in this channel work on the result, without downloading or decoding it again
+        working_images.set(ctx.author.id, ctx.channel.id, image)
         embed = discord.Embed(
             color=int('36393F', 16)
         )
-
-        embed.set_image(url='attachment://darkened_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'darkened_image.png'))
-
-    async def image_to_byte_array(self, image: Image.Image) -> bytes:
-        """ Converts an image to bytes.
-        :param image: The image to convert to bytes. """
-
-        imgByteArr = BytesIO()
-        image.save(imgByteArr, format='png')
-        imgByteArr = imgByteArr.getvalue()
-        return imgByteArr
-
-    async def change_image_brightness(self, file: Any, action: str, percentage: int,
-        r: bool = True, g: bool = True, b: bool = True) -> None:
-        """ Changes the brightness level of each pixel of the image.
-        :param file: The file to execute the task on.
-        :param action: Whether to lighten or darken the image.
-        :param percentage: The percentage to ligthen or darken the image. """
-
-        if not isinstance(file, Image.Image):
-            original_image = Image.open(BytesIO(await file.read()))
-        else:
-            original_image = file
-        pixels = original_image.getdata()
-
-        #initialise the new image
-        new_image = Image.new('RGB', original_image.size)
-        new_image_list = []
-
-        brightness_multiplier = 1.0
-
-        if action == 'lighten':
-            brightness_multiplier += (percentage/100)
-        else:
-            brightness_multiplier -= (percentage/100)
-
-
-        # Fixes non tuple pixel sets
-        if isinstance(pixels[0], int):
-            pixels = [(px, px, px, px) for px in pixels]
-
-        #for each pixel, append the brightened or darkened version to the new image list
-        for pixel in pixels:
-            new_pixel = (
-                int(pixel[0] * brightness_multiplier) if r else int(pixel[0]),
-                int(pixel[1] * brightness_multiplier) if g else int(pixel[1]),
-                int(pixel[2] * brightness_multiplier) if b else int(pixel[2])
-            )
-
-            #check the new pixel values are within rgb range
-            for pixel in new_pixel:
-                if pixel > 255:
-                    pixel = 255
-                elif pixel < 0:
-                    pixel = 0
-
-            new_image_list.append(new_pixel)
-
-        #save the new image
-        new_image.putdata(new_image_list)
-        return new_image
+        embed.set_image(url=f'attachment://{file_name}')
+        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), file_name))
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -335,24 +220,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image redder.
         :param member: The member of whom to increase the red values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, b=False, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://red_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'red_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'red_image.png', action='lighten', percentage=percentage, b=False, g=False)
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -360,24 +229,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image bluer.
         :param member: The member of whom to increase the bluer values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://blue_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'blue_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'blue_image.png', action='lighten', percentage=percentage, r=False, g=False)
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -385,24 +238,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image yellower.
         :param member: The member of whom to increase the yellow values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, b=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://yellow_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'yellow_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'yellow_image.png', action='lighten', percentage=percentage, b=False)
 
     @commands.command(aliases=['lightblue'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -410,24 +247,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image light-bluer.
         :param member: The member of whom to increase the light blue values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://light_blue_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'light_blue_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'light_blue_image.png', action='lighten', percentage=percentage, r=False)
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -435,24 +256,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image purpleer.
         :param member: The member of whom to increase the purple values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://purple_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'purple_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'purple_image.png', action='lighten', percentage=percentage, g=False)
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -460,24 +265,39 @@ class ImageManipulation(commands.Cog):
         """ Makes an image greener.
         :param member: The member of whom to increase the green values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'brightness', 'green_image.png', action='lighten', percentage=percentage, r=False, b=False)
 
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False, b=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
+    @commands.command(aliases=['chain', 'fx'])
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def filters(self, ctx, member: Optional[discord.Member] = None, *specs: str) -> None:
+        """ Applies several filters to an image at once, e.g. `z!filters red:30 darken:20 flip`.
+        :param member: The member to apply the filters to the profile picture. [Optional][Default = Cached Image]
+        :param specs: The filters, in order. The color ones can take a percentage after a `:`. [Default percentage = 55] """
+
+        available = ', '.join(f"`{name}`" for name in chainable_filters)
+        if not specs:
+            return await ctx.reply(f"**Please, inform the filters to apply, {ctx.author.mention}!**\n**Available:** {available}")
+
+        if len(specs) > max_chained_filters:
+            return await ctx.reply(f"**You can only chain up to `{max_chained_filters}` filters, {ctx.author.mention}!**")
+
+        filters: List[Tuple[str, Dict[str, Any]]] = []
+        for spec in specs:
+            name, _, percentage = spec.lower().partition(':')
+            if not (chainable := chainable_filters.get(name)):
+                return await ctx.reply(f"**`{name}` isn't a valid filter, {ctx.author.mention}!**\n**Available:** {available}")
 
-        embed.set_image(url='attachment://green_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'green_image.png'))
+            filter_name, options = chainable
+            if filter_name == 'brightness':
+                if percentage and not percentage.isdigit():
+                    return await ctx.reply(f"**`{percentage}` isn't a valid percentage, {ctx.author.mention}!**")
+                options = {**options, 'percentage': int(percentage) if percentage else 55}
+
+            filters.append((filter_name, options))
+
+        file = self.get_target_file(ctx, member)
+        await self.send_chained_image(ctx, file, filters, 'filtered_image.png')
 
     @commands.command(aliases=['grey'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -485,27 +305,8 @@ class ImageManipulation(commands.Cog):
         """ Makes an image grayer/greyer.
         :param member: The member of whom to increase the gray/grey values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image: Image.Image = ImageOps.grayscale(image)
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://gray_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'gray_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'gray', 'gray_image.png')
 
 
     @commands.command()
@@ -514,109 +315,18 @@ class ImageManipulation(commands.Cog):
         """ Waves an image.
         :param member: The member to wave the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        class WaveDeformer:
-
-            def transform(self, x, y):
-                y = y + 10*math.sin(x/20)
-                return x, y
-
-            def transform_rectangle(self, x0, y0, x1, y1):
-                return (*self.transform(x0, y0),
-                        *self.transform(x0, y1),
-                        *self.transform(x1, y1),
-                        *self.transform(x1, y0),
-                        )
-
-            def getmesh(self, img):
-                self.w, self.h = img.size
-                gridspace = 20
-
-                target_grid = []
-                for x in range(0, self.w, gridspace):
-                    for y in range(0, self.h, gridspace):
-                        target_grid.append((x, y, x + gridspace, y + gridspace))
-
-                source_grid = [self.transform_rectangle(*rect) for rect in target_grid]
-
-                return [t for t in zip(target_grid, source_grid)]
-        
-        wave_image = ImageOps.deform(image, WaveDeformer())
-        self.cached_image = wave_image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://wave_image.png')
-        bytes_image = await self.image_to_byte_array(wave_image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'wave_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'wave', 'wave_image.png')
 
     @commands.command(aliases=["negative", "negate"])
     async def invert(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Inverts an image to its negative form..
         :param member: The member to invert the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        
-        if isinstance(image, Image.Image):
-            image = image.convert('RGB')
-        
-        image = ImageOps.invert(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://inverted_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'inverted_image.png'))
+        file = self.get_target_file(ctx, member)
+        await self.send_filtered_image(ctx, file, 'invert', 'inverted_image.png')
 
 
-    async def get_font(self, image: Image.Image, text: str, font_name: str = None) -> ImageFont:
-        """ Gets the font sized proportionally to the image size.
-        :param image: The image to proportion the font to.
-        :param text: The base text. """
-
-        fontsize = 1  # starting font size
-
-        if not font_name:
-            font_name = 'built titling sb.ttf'
-        font_path: str = f'media/fonts/{font_name}'
-
-        # Portion of image width you want text width to be
-        img_fraction = 0.50
-
-        font = ImageFont.truetype(font_path, fontsize)
-
-        while font.getsize(text)[0] < img_fraction*image.size[0]:
-            # Iterates until the text size is just larger than the criteria
-            fontsize += 1
-            font = ImageFont.truetype(font_path, fontsize)
-
-        # Optionally de-increments to be sure it is less than criteria
-        fontsize -= 1
-        font = ImageFont.truetype(font_path, fontsize)
-
-        return font
-
     @commands.command(aliases=['write', 'cap'])
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def caption(self, ctx, member: Optional[discord.Member] = None, *, text: str = None) -> None:
@@ -624,39 +334,13 @@ class ImageManipulation(commands.Cog):
         :param member: The member to put the caption on the profile picture. [Optional][Default = Cached Image].
         :param text: The caption text to put on the image. """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
+        file = self.get_target_file(ctx, member)
 
         if not text:
             return await ctx.reply("**Please, inform a `caption text`!**")
 
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        
         text = str(text).strip() if text else None
-        # Puts the caption
-        font = await self.get_font(image, text)
-        W, H = image.size
-        draw = ImageDraw.Draw(image)
-        w, h = draw.textsize(text, font=font)
-        draw.text(((W-w)/2,(H-h)/2), text, fill="white", font=font)
-        # draw.text(((W-w)/2,(H-h)/2-120), text, fill="white", font=small)
-
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://captioned_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'captioned_image.png'))
+        await self.send_filtered_image(ctx, file, 'caption', 'captioned_image.png', text=text)
 
 
 def setup(client: commands.Cog) -> None:
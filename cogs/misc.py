@@ -1,16 +1,16 @@
 import discord
 from discord import slash_command, user_command
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from random import randint
 
 import os
-import aiohttp
 
 from typing import List
 from extra import utils
 from extra.slothclasses.player import Player
 from extra.misc.reminder import MemberReminderTable
+from extra.scheduler import scheduler
 
 allowed_roles = [
     int(os.getenv('OWNER_ROLE_ID', 123)), int(os.getenv('ADMIN_ROLE_ID', 123)), int(os.getenv('MOD_ROLE_ID', 123)), int(os.getenv('ASTROSLOTH_ROLE_ID', 123)), 
@@ -29,12 +29,11 @@ class Misc(*misc_cogs):
 
     @commands.Cog.listener()
     async def on_ready(self):
-        self.look_for_due_reminders.start()
+        await scheduler.register('reminders', self.look_for_due_reminders, self.get_next_reminder_deadline)
         print("Misc cog is online!")
 
-    @tasks.loop(minutes=1)
     async def look_for_due_reminders(self) -> None:
-        """ Looks for expired tempmutes and unmutes the users. """
+        """ Looks for due reminders and sends them to the users. """
 
         current_ts = await utils.get_timestamp()
         reminders = await self.get_due_reminders(current_ts)
@@ -90,11 +89,10 @@ class Misc(*misc_cogs):
             await ctx.send(f'**Usage: `{ctx.prefix}numberfact <number>`**', delete_after=3)
             return
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f'http://numbersapi.com/{number}?json') as resp:
-                    file = await resp.json()
-                    fact = file['text']
-                    await ctx.send(f"**Did you know?**\n*{fact}*")
+            async with utils.get_session().get(f'http://numbersapi.com/{number}?json') as resp:
+                file = await resp.json()
+                fact = file['text']
+                await ctx.send(f"**Did you know?**\n*{fact}*")
         except KeyError:
             await ctx.send("**No facts are available for that number.**", delete_after=3)
 
@@ -121,9 +119,7 @@ class Misc(*misc_cogs):
 
         Example:
         z!setreminder "do the dishes" 3m 65s
-        = The bot will remind you in 4 minutes and 5 seconds.
-
-        PS: Seconds may not be always reliable, since the bot checks reminders every minute. """
+        = The bot will remind you in 4 minutes and 5 seconds. """
 
         member = ctx.author
 
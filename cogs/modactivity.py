@@ -5,6 +5,8 @@ from mysqldb import *
 import asyncio
 import os
 from extra import utils
+from extra.rolemembership import role_index
+from extra.moderation.modactivitybuffer import mod_activity_buffer
 from extra.moderation.modactivity import ModActivityTable
 from extra.prompt.menu import ConfirmButton
 
@@ -23,6 +25,14 @@ class ModActivity(ModActivityTable):
 
     @commands.Cog.listener()
     async def on_ready(self):
+        # Moderators who are already in a voice channel start their session now
+        if guild := self.client.get_guild(guild_id):
+            for channel in guild.voice_channels:
+                for member in channel.members:
+                    if member.id not in mod_activity_buffer.sessions and role_index.has_role(member, mod_role_id):
+                        mod_activity_buffer.join_voice(member.id)
+
+        mod_activity_buffer.start()
         print('ModActivity cog is ready!')
 
     @commands.Cog.listener()
@@ -31,32 +41,24 @@ class ModActivity(ModActivityTable):
             return
         if message.author.bot:
             return
-        guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
-        if moderator_role not in message.author.roles:
+        if not role_index.has_role(message.author, mod_role_id):
             return
 
-        await self.get_moderator_current_messages(message.author.id)
-        await self.update_moderator_message(message.author.id)
+        mod_activity_buffer.add_message(message.author.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         if member.bot:
             return
-        guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
-        if moderator_role not in member.roles:
+        if not role_index.has_role(member, mod_role_id):
             return
             
         current_ts = await utils.get_timestamp()
-        old_time = await self.get_moderator_current_timestamp(member.id, current_ts)
-        addition = current_ts - old_time
-
         if not before.channel:
-            return await self.update_moderator_timestamp(member.id)
+            return mod_activity_buffer.join_voice(member.id, current_ts)
 
         if not after.channel:
-            await self.update_moderator_time(member.id, addition)
+            mod_activity_buffer.leave_voice(member.id, current_ts)
 
 
     @utils.is_allowed([senior_mod_role_id], throw_exc=True)
@@ -65,6 +67,7 @@ class ModActivity(ModActivityTable):
     async def modrep(self, ctx):
         """ (STAFF) Shows all the moderators and their statuses in an embedded message. """
 
+        await mod_activity_buffer.flush()
         mod_activities = await self.get_mod_activities()
 
         member: discord.Member = ctx.author
@@ -98,6 +101,7 @@ class ModActivity(ModActivityTable):
             await ctx.send(f"**Timeout, not deleting it, {member.mention}!**", delete_after=3)
         elif confirm_view.value:
             await self.delete_mod_activity()
+            mod_activity_buffer.reset()
             await ctx.send(f"**Mod Activity data reset, {member.mention}!**", delete_after=3)
         else:
             await ctx.send(f"**Not deleting it then, {member.mention}!**", delete_after=3)
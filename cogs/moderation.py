@@ -1,16 +1,17 @@
 import discord
 from discord import user_command
-from discord.ext import commands, tasks, menus
+from discord.ext import commands, menus
 import asyncio
 from mysqldb import *
 from datetime import datetime
 from typing import List, Union, Optional, Dict, Tuple
 import os
 
-from extra.useful_variables import banned_links
+from extra.moderation.linkscanner import link_scanner, reload_link_scanner
 from extra.prompt.menu import Confirm
 from extra.view import ReportSupportView
 from extra import utils
+from extra.scheduler import scheduler
 from extra.menu import MemberSnipeLooping, SnipeLooping
 
 from extra.moderation.firewall import ModerationFirewallTable, BypassFirewallTable
@@ -18,6 +19,7 @@ from extra.moderation.mutedmember import ModerationMutedMemberTable
 from extra.moderation.userinfractions import ModerationUserInfractionsTable
 from extra.moderation.watchlist import ModerationWatchlistTable
 from extra.moderation.fakeaccounts import ModerationFakeAccountsTable
+from extra.moderation.fakeaccountindex import fake_account_index
 from extra.moderation.moderatednicknames import ModeratedNicknamesTable
 from extra.moderation.user_muted_galaxies import UserMutedGalaxiesTable
 
@@ -55,7 +57,8 @@ class Moderation(*moderation_cogs):
 
 	@commands.Cog.listener()
 	async def on_ready(self):
-		self.look_for_expired_tempmutes.start()
+		await scheduler.register('tempmutes', self.look_for_expired_tempmutes, self.get_next_tempmute_deadline)
+		await fake_account_index.load()
 		self.guild = self.client.get_guild(server_id)
 		print('Moderation cog is ready!')
 
@@ -70,40 +73,31 @@ class Moderation(*moderation_cogs):
 		# Checks if someone pinged Staff
 		await self.check_if_pinged_staff(message)
 
-		# Banned links
-		await self.check_banned_links(message)
+		# Banned links and invites
+		videos = [str(v) for v in message.attachments if v.content_type in ['video/mp4', 'video/webm']]
+		if not (scan := link_scanner.scan(message.content, videos)):
+			return
+
+		ctx = await self.client.get_context(message)
+		if await utils.is_allowed(allowed_roles).predicate(ctx):
+			return
+
+		if scan.banned_link:
+			return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
 
 		# Invite tracker
-		msg = str(message.content)
-		if 'discord.gg/' in msg.lower() or 'discord.com/invite/' in msg.lower():
-			invite_root = 'discord.gg/' if 'discord.gg/' in msg.lower() else 'discord.com/invite/'
-			ctx = await self.client.get_context(message)
-			if not await utils.is_allowed(allowed_roles).predicate(ctx):
-				is_from_guild = await self.check_invite_guild(msg, message.guild, invite_root)
-
-				if not is_from_guild:
-					return await self._mute_callback(ctx, member=message.author, reason="Invite Advertisement.")
-
-	async def check_banned_links(self, message: discord.Message) -> None:
-		""" Checks if the message sent was or contains a banned link. """
-
-		videos = [v for v in message.attachments if v.content_type in ['video/mp4', 'video/webm']]
-
-		# Checks it in the message attachments
-		for video in videos:
-			if str(video) in banned_links:
-				ctx = await self.client.get_context(message)
-				if not await utils.is_allowed(allowed_roles).predicate(ctx):
-					return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
-
-		# Checks it in the message content
-		for word in message.content.split():
-			if word in banned_links:
-				ctx = await self.client.get_context(message)
-				if not await utils.is_allowed(allowed_roles).predicate(ctx):
-					return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
-
-	@tasks.loop(minutes=1)
+		is_from_guild = await self.check_invite_guild(message.content, message.guild, scan.invite_root, scan.invite_index)
+		if not is_from_guild:
+			return await self._mute_callback(ctx, member=message.author, reason="Invite Advertisement.")
+
+	@commands.command(hidden=True)
+	@commands.has_permissions(administrator=True)
+	async def reload_banned_links(self, ctx) -> None:
+		""" (ADM) Reloads the banned links list and rebuilds the link scanner. """
+
+		amount = reload_link_scanner()
+		await ctx.send(f"**Reloaded `{amount}` banned links, {ctx.author.mention}!**")
+
 	async def look_for_expired_tempmutes(self) -> None:
 		""" Looks for expired tempmutes and unmutes the users. """
 
@@ -158,10 +152,12 @@ class Moderation(*moderation_cogs):
 				print(e)
 				continue
 
-	async def check_invite_guild(self, msg, guild, invite_root: str):
-		""" Checks whether it's a guild invite or not. """
+	async def check_invite_guild(self, msg, guild, invite_root: str, start_index: Optional[int] = None):
+		""" Checks whether it's a guild invite or not.
+		:param start_index: The index of the invite root in the message, if already known. [Optional] """
 
-		start_index = msg.index(invite_root)
+		if start_index is None:
+			start_index = msg.index(invite_root)
 		end_index = start_index + len(invite_root)
 		invite_hash = ''
 		for c in msg[end_index:]:
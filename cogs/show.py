@@ -6,18 +6,21 @@ from extra.useful_variables import rules
 from extra import utils
 from extra.slothclasses.player import Player
 from extra.analytics import DataBumpsTable
+from extra.lazyimport import lazy_import
 
 from typing import Dict
 import os
 import subprocess
 import sys
 import json
-import wikipedia
 
 allowed_roles = [int(os.getenv('OWNER_ROLE_ID', 123)), int(
     os.getenv('ADMIN_ROLE_ID', 123)), int(os.getenv('MOD_ROLE_ID', 123))]
 guild_ids = [int(os.getenv('SERVER_ID', 123))]
 
+# Only loaded when the wikipedia command is used
+wikipedia = lazy_import('wikipedia')
+
 
 class Show(commands.Cog):
     """ Commands involving showing some information related to the server. """
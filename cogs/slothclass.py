@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks, menus
+from discord.ext import commands, menus
 from mysqldb import the_database
 
 from extra import utils
@@ -7,10 +7,13 @@ from extra.menu import SlothClassPagination
 from extra.customerrors import ActionSkillOnCooldown, ActionSkillsLocked, SkillsUsedRequirement, CommandNotReady
 from extra.slothclasses import agares, cybersloth, merchant, metamorph, munk, prawler, seraph, warrior, db_commands
 from extra.slothclasses.player import Skill
-from extra.slothclasses.player import Player
+from extra.slothclasses.player import Player, skill_sweep_timeout
+from extra.scheduler import scheduler
 
-from typing import Union, List, Dict, Optional
+from typing import Union, List, Dict, Optional, Tuple, Any
 import os
+import asyncio
+import time
 from random import sample, random
 
 classes: Dict[str, object] = {
@@ -21,6 +24,17 @@ classes: Dict[str, object] = {
 }
 
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
+skill_sweep_concurrency = int(os.getenv('SKILL_SWEEP_CONCURRENCY', 4))
+
+# The skill action sweeps, and the skill type whose expired skill actions they handle, if any
+skill_sweeps: List[Tuple[str, Optional[str]]] = [
+    ('check_reflects', 'reflect'), ('check_steals', 'steal'), ('check_protections', 'divine_protection'),
+    ('check_transmutations', 'transmutation'), ('check_shop_potion_items', 'potion'),
+    ('check_shop_ring_items', 'ring'), ('check_shop_egg_items', 'pet_egg'), ('check_hacks', 'hack'),
+    ('check_knock_outs', 'hit'), ('check_wires', 'wire'), ('check_tribe_creations', 'tribe_creation'),
+    ('check_frogs', 'frog'), ('check_sabotages', 'sabotage'), ('check_poisons', 'poison'),
+    ('check_pet_food', None), ('check_baby_food', None),
+]
 
 
 class SlothClass(*classes.values(), db_commands.SlothClassDatabaseCommands):
@@ -31,6 +45,7 @@ class SlothClass(*classes.values(), db_commands.SlothClassDatabaseCommands):
 
         self.client = client
         self.classes = classes
+        self.skill_sweep_stats: Dict[str, Dict[str, Any]] = {}
         super(SlothClass, self).__init__(client)
 
     @commands.Cog.listener()
@@ -38,39 +53,71 @@ class SlothClass(*classes.values(), db_commands.SlothClassDatabaseCommands):
         """ Tells when the cog is ready to use. """
 
         self.bots_txt = await self.client.fetch_channel(bots_and_commands_channel_id)
-        self.check_skill_actions.start()
+        await scheduler.register('skill_actions', self.check_skill_actions, self.get_next_skill_action_deadline)
         self.check_mission_one_completion.start()
         self.check_mission_six_completion.start()
         print("SlothClass cog is online")
 
-    @tasks.loop(minutes=1)
-    async def check_skill_actions(self):
-        """ Checks all skill actions and events. """
-
-        await self.try_to_run(self.check_reflects)
-        await self.try_to_run(self.check_steals)
-        await self.try_to_run(self.check_protections)
-        await self.try_to_run(self.check_transmutations)
-        await self.try_to_run(self.check_shop_potion_items)
-        await self.try_to_run(self.check_shop_ring_items)
-        await self.try_to_run(self.check_shop_egg_items)
-        await self.try_to_run(self.check_hacks)
-        await self.try_to_run(self.check_knock_outs)
-        await self.try_to_run(self.check_wires)
-        await self.try_to_run(self.check_tribe_creations)
-        await self.try_to_run(self.check_frogs)
-        await self.try_to_run(self.check_sabotages)
-        await self.try_to_run(self.check_poisons)
-        await self.try_to_run(self.check_pet_food)
-        await self.try_to_run(self.check_baby_food)
-
-    async def try_to_run(self, func):
-        """ Tries to run a function/method and ignore failures. """
-
-        try:
-            await func()
-        except:
-            pass
+    async def check_skill_actions(self) -> None:
+        """ Checks all skill actions and events, running the sweeps concurrently. """
+
+        expired = await self.get_expired_skill_actions()
+        semaphore = asyncio.Semaphore(skill_sweep_concurrency)
+        await asyncio.gather(*(
+            self.run_skill_sweep(semaphore, sweep, *([expired.get(skill_type, [])] if skill_type else []))
+            for sweep, skill_type in skill_sweeps
+        ))
+
+    async def run_skill_sweep(self, semaphore: asyncio.Semaphore, sweep: str, *args: Any) -> None:
+        """ Runs a skill action sweep, recording its statistics.
+        The sweep itself is never cancelled, since that could stop it halfway through a skill action,
+        only its Discord calls time out (see `Player.sweep_call`).
+        :param semaphore: The semaphore that bounds how many sweeps run at once.
+        :param sweep: The name of the sweep method.
+        :param args: The arguments of the sweep method. """
+
+        stats = self.skill_sweep_stats.setdefault(sweep, {
+            'runs': 0, 'rows': 0, 'failures': 0, 'timeouts': 0, 'last_ms': 0, 'max_ms': 0, 'last_error': None})
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                rows = await getattr(self, sweep)(*args)
+            except asyncio.TimeoutError:
+                stats['timeouts'] += 1
+                stats['last_error'] = f"A Discord call timed out after {skill_sweep_timeout}s"
+                print('Skill sweep timeout', sweep)
+            except Exception as e:
+                stats['failures'] += 1
+                stats['last_error'] = repr(e)
+                print('Skill sweep error', sweep, e)
+            else:
+                stats['rows'] += rows or 0
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                stats['runs'] += 1
+                stats['last_ms'] = elapsed
+                stats['max_ms'] = max(stats['max_ms'], elapsed)
+
+    @commands.command(hidden=True)
+    @commands.has_permissions(administrator=True)
+    async def sweep_stats(self, ctx) -> None:
+        """ (ADM) Shows the statistics of the skill action sweeps. """
+
+        if not self.skill_sweep_stats:
+            return await ctx.send("**No skill action sweeps have run yet!**")
+
+        lines = [
+            f"{sweep:<24} | runs: {s['runs']:<5} rows: {s['rows']:<5} fails: {s['failures']:<3} timeouts: {s['timeouts']:<3} "
+            f"last: {s['last_ms']:.0f}ms max: {s['max_ms']:.0f}ms"
+            for sweep, s in self.skill_sweep_stats.items()
+        ]
+        errors = [f"{sweep}: {s['last_error']}" for sweep, s in self.skill_sweep_stats.items() if s['last_error']]
+        if errors:
+            lines.extend(['', 'Last errors:', *errors])
+
+        text = '\n'.join(lines)
+        await ctx.send(f"```\n{text[:1980]}```")
 
     @commands.command(aliases=['sloth_class', 'slothclasses'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -5,26 +5,27 @@ from discord.member import VoiceState
 from discord.utils import escape_mentions
 from mysqldb import *
 from external_cons import the_drive
-from PIL import Image, ImageDraw, ImageFont
 import os
 
 import shutil
 import asyncio
-import glob
-from itertools import cycle
+from io import BytesIO
 
 from extra.view import ExchangeActivityView
 from extra.menu import InventoryLoop
-from typing import List, Dict, Tuple, Union, Optional
+from typing import Any, List, Dict, Tuple, Union, Optional
 
 from extra.slothclasses.player import Player
 from extra.useful_variables import level_badges, flag_badges, patreon_roles
-from extra.gif_manager import GIF
 from extra import utils
+from extra.imaging.renderer import renderer
+from extra.imaging.rendercache import profile_cache
+from extra.imaging.renders import render_profile, render_text_card
 
 from extra.currency.useritems import UserItemsTable
 from extra.currency.userserveractivity import UserServerActivityTable, UserVoiceSystem
 from extra.currency.usercurrency import UserCurrencyTable
+from extra.currency.activitybuffer import activity_buffer
 
 
 booster_role_id = int(os.getenv('BOOSTER_ROLE_ID', 123))
@@ -65,13 +66,9 @@ class SlothCurrency(*currency_cogs):
         if not await self.check_user_server_activity_table_exists():
             return
 
-        user_info = await self.get_user_activity_info(message.author.id)
-        if not user_info:
-            return await self.insert_user_server_activity(message.author.id, 1)
-
         effects = await self.client.get_cog('SlothClass').get_user_effects(message.author)
         if 'sabotaged' not in effects:
-            await self.update_user_server_messages(message.author.id, 1)
+            activity_buffer.add_messages(message.author.id, 1)
 
 
     # In-game commands
@@ -245,20 +242,15 @@ class SlothCurrency(*currency_cogs):
             skill_action = await SlothClass.get_skill_action_by_target_id_and_skill_type(member.id, 'hack')
             skill_action = skill_action[0] if skill_action else '??'
             hacker = self.client.get_user(skill_action)
-            # Makes the Hacked image and saves it
-            big = ImageFont.truetype("built titling sb.ttf", 80)
-            background = Image.open('sloth_custom_images/background/hacked.png').convert('RGBA')
-            draw = ImageDraw.Draw(background)
-            draw.text((350, 300), f"Hacked by {hacker}", font=big, fill=(0, 0, 0))
-            file_path = f'media/temporary/hacked_{member.id}.png'
-            background.save(file_path, 'png', quality=90)
+            # Makes the Hacked image
+            image_bytes = await renderer.render(
+                render_text_card, 'sloth_custom_images/background/hacked.png',
+                f"Hacked by {hacker}", (350, 300), (0, 0, 0), "built titling sb.ttf", 80)
         except Exception as e:
             print(e)
             return await answer(f"**{author.mention}, something went wrong with it!**")
         else:
-            await answer(file=discord.File(file_path))
-            # await asyncio.sleep(0.5)
-            return os.remove(file_path)
+            await answer(file=discord.File(BytesIO(image_bytes), filename=f'hacked_{member.id}.png'))
 
     async def send_frogged_image(self, answer: discord.PartialMessageable, author: discord.Member, member: discord.Member, knocked_out: bool = False) -> None:
         """ Makes and sends a frogged image.
@@ -273,26 +265,15 @@ class SlothCurrency(*currency_cogs):
             skill_action = await SlothClass.get_skill_action_by_target_id_and_skill_type(member.id, 'frog')
             skill_action = skill_action[0] if skill_action else '??'
             metamorph = self.client.get_user(skill_action)
-            # Makes the Hacked image and saves it
-            big = ImageFont.truetype("built titling sb.ttf", 80)
-            background = None
-
-            if knocked_out:
-                background = Image.open('sloth_custom_images/background/frogged_ko.png').convert('RGBA')
-            else:
-                background = Image.open('sloth_custom_images/background/frogged.png').convert('RGBA')
-
-            draw = ImageDraw.Draw(background)
-            draw.text((170, 170), f"{metamorph}", font=big, fill=(39, 126, 205))
-            file_path = f'media/temporary/frogged_{member.id}.png'
-            background.save(file_path, 'png', quality=90)
+            # Makes the Frogged image
+            background_path = 'sloth_custom_images/background/frogged_ko.png' if knocked_out else 'sloth_custom_images/background/frogged.png'
+            image_bytes = await renderer.render(
+                render_text_card, background_path, f"{metamorph}", (170, 170), (39, 126, 205), "built titling sb.ttf", 80)
         except Exception as e:
             print(e)
             return await answer(f"**{author.mention}, something went wrong with it!**")
         else:
-            await answer(file=discord.File(file_path))
-            # await asyncio.sleep(0.5)
-            return os.remove(file_path)
+            await answer(file=discord.File(BytesIO(image_bytes), filename=f'frogged_{member.id}.png'))
 
     @commands.command(name="profile")
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -365,149 +346,85 @@ class SlothCurrency(*currency_cogs):
                 await SlothClass.check_virus(ctx=ctx, target=member)
             return
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
-        background = Image.open(await self.get_user_specific_type_item(member.id, 'background'))
+        spec = await self.get_profile_render_spec(ctx, member, sloth_profile, user_info, effects)
+        async with ctx.typing():
+            try:
+                image_bytes, extension = await self.render_profile_image(member, spec)
+                await answer(file=discord.File(BytesIO(image_bytes), filename=f'profile_{member.id}.{extension}'))
+            except Exception as e:
+                print(e)
+                pass
+
+    async def render_profile_image(self, member: discord.Member, spec: Dict[str, Any]) -> Tuple[bytes, str]:
+        """ Renders a user's profile, or gets it from the render cache if nothing changed since the last time.
+        :param member: The member whose profile is gonna be rendered.
+        :param spec: The profile's render spec.
+        :returns: The encoded image and its file extension. """
+
+        # The avatar is keyed by its hash, so it's only downloaded on cache misses
+        key = profile_cache.make_key(spec, member.display_avatar.key)
+        if cached := profile_cache.get(key):
+            return cached
+
+        spec['pfp'] = await utils.get_user_pfp(member)
+        image_bytes, extension = await renderer.render(render_profile, spec)
+        profile_cache.set(key, image_bytes, extension)
+        return image_bytes, extension
+
+    async def get_profile_render_spec(self, ctx, member: discord.Member, sloth_profile: List[Union[int, str]],
+        user_info: List[List[Union[int, str]]], effects: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """ Gathers everything needed to render a user's profile, but the profile picture,
+        so it can be rendered off the event loop.
+        :param ctx: The context of the command.
+        :param member: The member whose profile is gonna be rendered.
+        :param sloth_profile: The member's Sloth profile.
+        :param user_info: The member's currency info.
+        :param effects: The member's current effects. """
+
+        SlothClass = self.client.get_cog('SlothClass')
 
         # Checks whether user is transmutated
-        sloth = None
         if await SlothClass.has_effect(effects, 'transmutated'):
-            sloth = Image.open(f"./sloth_custom_images/sloth/transmutated_sloth.png")
+            sloth = "./sloth_custom_images/sloth/transmutated_sloth.png"
         else:
-            sloth = Image.open(f"./sloth_custom_images/sloth/{sloth_profile[1].title()}.png")
-
-        # Gets an item image for each equippable slot
-        body = Image.open(await self.get_user_specific_type_item(member.id, 'body'))
-        hand = Image.open(await self.get_user_specific_type_item(member.id, 'hand'))
-        foot = Image.open(await self.get_user_specific_type_item(member.id, 'foot'))
-        head = Image.open(await self.get_user_specific_type_item(member.id, 'head'))
-        hud = Image.open(await self.get_user_specific_type_item(member.id, 'hud'))
-        
-        # Pastes all item images
-        pfp = await utils.get_user_pfp(member)
-        background.paste(sloth, (0, 0), sloth)
-        background.paste(body, (0, 0), body)
-        background.paste(head, (0, 0), head)
-        background.paste(foot, (0, 0), foot)
-        background.paste(hand, (0, 0), hand)
-        background.paste(hud, (0, 0), hud)
-
-        # Checks if user is a booster
+            sloth = f"./sloth_custom_images/sloth/{sloth_profile[1].title()}.png"
+
+        # Gets an item image for each equippable slot, in the order they're pasted
+        layers = [sloth]
+        for item_type in ['body', 'head', 'foot', 'hand', 'hud']:
+            layers.append(await self.get_user_specific_type_item(member.id, item_type))
+
+        # Checks if user is a booster and all flag badges that the user has
+        flag_badge_specs = []
         booster_role = discord.utils.get(ctx.guild.roles, id=booster_role_id)
+        flags = await utils.get_member_public_flags(member)
         if booster_role in member.roles:
-            if flag_badge := flag_badges.get('discord_server_booster'):
-                file_path = f"./sloth_custom_images/badge/{flag_badge[0]}"
-                if os.path.isfile(file_path):
-                    booster_badge = Image.open(file_path).resize((50, 50)).convert('RGBA')
-                    background.paste(booster_badge, flag_badge[1], booster_badge)
+            flags.insert(0, 'discord_server_booster')
 
-        # Pastes all flag badges that the user has
-        flags = await utils.get_member_public_flags(member)
         for flag in flags:
             if flag_badge := flag_badges.get(flag):
-                file_path = f"./sloth_custom_images/badge/{flag_badge[0]}"
-                if os.path.isfile(file_path):
-                    flag_image = Image.open(file_path).resize((50, 50)).convert('RGBA')
-                    background.paste(flag_image, flag_badge[1], flag_image)
+                flag_badge_specs.append((f"./sloth_custom_images/badge/{flag_badge[0]}", flag_badge[1]))
 
-        # Checks whether user has level badges
+        # Gets the level badges the user has reached, the highest first
         user_level = await self.client.get_cog('SlothReputation').get_specific_user(member.id)
-        for key, value in reversed(list(level_badges.items())):
-            if user_level[0][2] >= key:
-                file_path = f"sloth_custom_images/badge/{value[0]}.png"
-                if os.path.isfile(file_path):
-                    level_badge = Image.open(file_path)
-                    background.paste(level_badge, value[1], level_badge)
-                    break
-
-        # Tries to print the user's profile picture
-        try:
-            background.paste(pfp, (201, 2), pfp)
-        except Exception:
-            pass
-
-        draw = ImageDraw.Draw(background)
-        draw.text((310, 5), f"{str(member)[:10]}", (255, 255, 255), font=small)
-        draw.text((80, 525), f"{user_info[0][1]}", (255, 255, 255), font=small)
-        file_path = f'media/temporary/profile_{member.id}.png'
-        background.save(file_path, 'png', quality=90)
-
-        all_effects = {key: value for (key, value) in effects.items() if value.get('has_gif')}
-        async with ctx.typing():
-
-            if all_effects:
-                try:
-                    gif_file_path = await self.make_gif_image(user_id=member.id, all_effects=all_effects)
-                    await answer(file=discord.File(gif_file_path))
-
-                except Exception as e:
-                    print(e)
-                    pass
-                finally:
-                    os.remove(file_path)
-                    os.remove(gif_file_path)
-            else:
-                try:
-                    await answer(file=discord.File(file_path))
-                except:
-                    pass
-                finally:
-                    os.remove(file_path)
-
-    async def make_gif_image(self, user_id: int, all_effects: Dict[str, Dict[str, Union[List[str], Tuple[int]]]]) -> str:
-        """ Makes a gif image out a profile image.
-        :param user_id: The ID of the user for whom to make the GIF.
-        :param all_effects: All effects that the user currently has. """
-
-        gif_file_path = f'media/temporary/profile_{user_id}.gif'
-
-        try:
-            profile = Image.open(f'media/temporary/profile_{user_id}.png').convert('RGBA')
-            gif = GIF(image=profile, frame_duration=40)
-            path = 'media/effects'
-
-            # Gets all frames of each effect and resize them properly, respectively.
-            for effect in all_effects:
-                full_path = f"{path}/{effect}"
-                # Checks whether the effect folder exists
-                if os.path.isdir(full_path):
-                    # Gets all frame images from the folder
-                    for i in range(len(glob.glob(f"{full_path}/*.png"))):
-                        frame = Image.open(f"{full_path}/{effect}_{i+1}.png")  # convert('RGBA') # remove this convert later
-                        # Checs whether frame has to be resized
-                        if all_effects[effect]['resize']:
-                            frame = frame.resize(all_effects[effect]['resize']).convert('RGBA')
-                        # Appends to its respective frame list
-                        all_effects[effect]['frames'].append(frame)
-
-            # Loops through the frames based on the amount of frames of the longest effect.
-            longest_gif = max([len(frames['frames']) for frames in all_effects.values()])
-
-            for efx in all_effects.keys():
-                all_effects[efx]['frames'] = cycle(all_effects[efx]['frames'])
-
-            for i in range(longest_gif):
-                # Gets a frame of each effect in each iteration of the loop
-                base = gif.new_frame()
-                await asyncio.sleep(0)
-                for efx, value in all_effects.items():
-                    # print(all_effects[efx]['cords'])
-                    cords = all_effects[efx]['cords']
-                    frame = next(all_effects[efx]['frames'])
-                    # print(efx, frame)
-                    base.paste(frame, cords, frame)
-                    gif.add_frame(base)
-
-                if i >= 400:
-                    break
-
-            else:
-                gif.export(gif_file_path)
-
-        except Exception as e:
-            print(e)
-            pass
-        finally:
-            return gif_file_path
+        level_badge_specs = [
+            (f"sloth_custom_images/badge/{value[0]}.png", value[1])
+            for key, value in reversed(list(level_badges.items())) if user_level[0][2] >= key
+        ]
+
+        return {
+            'font_path': "built titling sb.ttf",
+            'background': await self.get_user_specific_type_item(member.id, 'background'),
+            'layers': layers,
+            'flag_badges': flag_badge_specs,
+            'level_badges': level_badge_specs,
+            'name': f"{str(member)[:10]}",
+            'money': f"{user_info[0][1]}",
+            'effects': {
+                key: {'cords': value['cords'], 'resize': value['resize']}
+                for key, value in effects.items() if value.get('has_gif')
+            },
+        }
 
     @commands.command()
     @commands.has_permissions(administrator=True)
@@ -576,6 +493,10 @@ class SlothCurrency(*currency_cogs):
                         pass
                     # print(f"File '{file['title']}' downloaded!")
 
+        # Makes the render workers decode the updated assets
+        renderer.restart()
+        profile_cache.clear()
+
         if ctx:
             return await ctx.send("**Download update is done!**", delete_after=5)
 
@@ -853,17 +774,7 @@ class SlothCurrency(*currency_cogs):
         <:vc:914947524178116649> - Joined VC Timestamp
         """
 
-        alts = await self.client.get_cog('Moderation').get_fake_accounts(member.id)
-        alts_list: List[int] = []
-        for alt in alts:
-            alts_list.append(alt[0])
-            alts_list.append(alt[1])
-
-        alts = list(set(alts_list))
-        try:
-            alts.remove(member.id)
-        except ValueError:
-            pass
+        alts = await self.client.get_cog('Moderation').get_alt_ids(member.id)
 
         vc_members: List[int] = len([m for m in vc.members  if m.id not in alts]) if vc else 0
         is_farming = True if vc and not mute and not deaf and not smute and not sdeaf and vc_members > 1 else False
@@ -11,11 +11,14 @@ from extra import utils
 from extra.view import ExchangeActivityView
 from extra.slothclasses.player import Player
 
-guild_ids = [int(os.getenv('SERVER_ID', 123))]
+server_id = int(os.getenv('SERVER_ID', 123))
+guild_ids = [server_id]
 
 commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 
 from extra.currency.membersscore import MembersScoreTable
+from extra.currency.activitybuffer import activity_buffer
+from extra.ranking import ranking
 
 currency_cogs: List[commands.Cog] = [
     MembersScoreTable
@@ -26,6 +29,7 @@ class SlothReputation(*currency_cogs):
 
     def __init__(self, client):
         self.client = client
+        activity_buffer.xp_callback = self.level_up_users
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -43,30 +47,41 @@ class SlothReputation(*currency_cogs):
             return
 
         currnet_ts = await utils.get_timestamp()
-        await self.update_data(message.author, currnet_ts)
-
-    async def update_data(self, user, current_ts):
-        the_member = await self.get_specific_user(user.id)
-        if the_member:
-            if current_ts - the_member[0][3] >= 3 or the_member[0][1] == 0:
-                await self.update_user_xp_time(user.id, current_ts)
-                await self.update_user_xp(user.id, 5)
-                return await self.level_up(user)
-        # else:
-        #     return await self.insert_user(user.id, 5, 1, current_ts, 0, time_xp - 36001)
-
-    async def level_up(self, user) -> discord.Message:
+        activity_buffer.add_xp(message.author.id, 5, currnet_ts)
+
+    async def level_up_users(self, user_ids: List[int]) -> None:
+        """ Checks whether the users whose XP were just flushed can level up.
+        :param user_ids: The IDs of the users to check. """
+
+        guild = self.client.get_guild(server_id)
+        if not guild or self.client.is_closed():
+            return
+
+        for the_user in await self.get_specific_users(user_ids):
+            # Their XP just changed, so their ranks are refreshed with the fresh rows
+            ranking.update('xp', the_user)
+            ranking.update('score', the_user)
+            if user := guild.get_member(the_user[0]):
+                await self.level_up(user, the_user)
+
+    async def level_up(self, user, the_user: Optional[List[int]] = None) -> discord.Message:
         """ Checks whether the user can level up.
-        :param user: The user to check. """
+        :param user: The user to check.
+        :param the_user: The user's MembersScore row, if already fetched. [Optional] """
 
-        the_user = await self.get_specific_user(user.id)
-        lvl_end = int(the_user[0][1] ** (1 / 5))
-        if the_user[0][2] < lvl_end:
-            await self.client.get_cog('SlothCurrency').update_user_money(user.id, (the_user[0][2] + 1) * 5)
+        if the_user is None:
+            if not (the_user := await self.get_specific_user(user.id)):
+                return
+            the_user = the_user[0]
+
+        lvl_end = int(the_user[1] ** (1 / 5))
+        if the_user[2] < lvl_end:
+            await self.client.get_cog('SlothCurrency').update_user_money(user.id, (the_user[2] + 1) * 5)
             await self.update_user_lvl(user.id)
             await self.update_user_score_points(user.id, 100)
+            ranking.update('xp', (the_user[0], the_user[1], the_user[2] + 1, *the_user[3:]))
             channel = discord.utils.get(user.guild.channels, id=commands_channel_id)
-            return await channel.send(f"**{user.mention} has leveled up to lvl {the_user[0][2] + 1}! <:zslothrich:701157794686042183> Here's {(the_user[0][2] + 1) * 5}łł! <:zslothrich:701157794686042183>**")
+            return await channel.send(f"**{user.mention} has leveled up to lvl {the_user[2] + 1}! <:zslothrich:701157794686042183> Here's {(the_user[2] + 1) * 5}łł! <:zslothrich:701157794686042183>**")
 
 
     async def get_progress_bar(self, xp: int, goal_xp, length_progress_bar: int = 17) -> str:
@@ -154,9 +169,7 @@ class SlothReputation(*currency_cogs):
                  await SlothClass.check_virus(ctx=ctx, target=member)
             return
 
-        all_users = await self.get_all_users_by_score_points()
-        position = [[i+1, u[4]] for i, u in enumerate(all_users) if u[0] == member.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('score', member.id) or ['??', 0]
 
         # Gets user Server Activity info, such as messages sent and time in voice channels
         user_info = await SlothCurrency.get_user_activity_info(member.id)
@@ -289,6 +302,21 @@ class SlothReputation(*currency_cogs):
         elif info_for == 'Coinflips':
             await self.coinflips_score(ctx)
 
+    def get_snapshot_age_text(self, name: str) -> str:
+        """ Gets a text telling how long ago a leaderboard was updated.
+        :param name: The name of the leaderboard. """
+
+        m, s = divmod(ranking.age(name), 60)
+        return f"Updated {m}m {s:02d}s ago" if m else f"Updated {s}s ago"
+
+    @commands.command(hidden=True)
+    @commands.has_permissions(administrator=True)
+    async def rebuild_leaderboards(self, ctx) -> None:
+        """ (ADM) Rebuilds all leaderboard snapshots from the database. """
+
+        await ranking.rebuild()
+        await ctx.send("**All leaderboards were rebuilt!**", delete_after=3)
+
     @commands.command(aliases=['leaderboard', 'lb', 'scoreboard'])
     @Player.poisoned()
     async def score(self, ctx):
@@ -303,15 +331,13 @@ class SlothReputation(*currency_cogs):
         if not await self.check_members_score_table_exists():
             return await answer("**This command may be on maintenance!**")
 
-        top_ten_users = await self.get_top_ten_users()
+        top_ten_users = await ranking.top('score')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await self.get_all_users_by_score_points()
-        position = [[i+1, u[4]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('score', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your score: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your score: {position[1]} | #{position[0]} • {self.get_snapshot_age_text('score')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -334,15 +360,13 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        top_ten_users = await self.get_top_ten_xp_users()
+        top_ten_users = await ranking.top('xp')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Level Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await self.get_all_users_by_xp()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('xp', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your XP: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your XP: {position[1]} | #{position[0]} • {self.get_snapshot_age_text('xp')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -365,18 +389,14 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        SlothCurrency = self.client.get_cog('SlothCurrency')
-
-        top_ten_users = await SlothCurrency.get_top_ten_leaves_users()
+        top_ten_users = await ranking.top('leaves')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🍃 __The Language Sloth's Leaf Ranking Leaderboard__ 🍃", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_all_leaves_users()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('leaves', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your leaves: {position[1]} 🍃| #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your leaves: {position[1]} 🍃| #{position[0]} • {self.get_snapshot_age_text('leaves')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -399,12 +419,11 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        SlothClass = self.client.get_cog('SlothClass')
-
-        top_ten_tribes = await SlothClass.get_top_ten_tribe_leaves()
+        top_ten_tribes = await ranking.top('tribe_leaves')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🍃 __The Language Sloth's Tribe Leaf Ranking Leaderboard__ 🍃", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
+        leaderboard.set_footer(text=self.get_snapshot_age_text('tribe_leaves'))
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -426,21 +445,17 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        SlothCurrency = self.client.get_cog('SlothCurrency')
-
-        top_ten_users = await SlothCurrency.get_top_ten_time_users()
+        top_ten_users = await ranking.top('time')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="⏰ __The Language Sloth's Time Ranking Leaderboard__ ⏰", color=discord.Color.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_all_time_users()
-        position = [[i+1, u[2]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('time', ctx.author.id) or ['??', 0]
 
         m, s = divmod(position[1], 60)
         h, m = divmod(m, 60)
 
-        leaderboard.set_footer(text=f"Your time: {h:d}h, {m:02d}m ⏰| #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your time: {h:d}h, {m:02d}m ⏰| #{position[0]} • {self.get_snapshot_age_text('time')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -465,18 +480,14 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        SlothCurrency = self.client.get_cog('SlothCurrency')
-
-        top_ten_users = await SlothCurrency.get_top_ten_item_counter_users()
+        top_ten_users = await ranking.top('items')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🐮 __The Language Sloth's Items Ranking Leaderboard__ 🐮", color=discord.Color.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_item_counter_users()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('items', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your time: {position[1]} items | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your time: {position[1]} items | #{position[0]} • {self.get_snapshot_age_text('items')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -498,17 +509,13 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        Games = self.client.get_cog("Games")
-
-        top_ten_users = await Games.get_top_ten_memory_users()
+        top_ten_users = await ranking.top('memory')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Memory Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_memory_users_by_level()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('memory', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your level: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your level: {position[1]} | #{position[0]} • {self.get_snapshot_age_text('memory')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -532,13 +539,12 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        CreateSmartRoom = self.client.get_cog("CreateSmartRoom")
-
-        get_all_galaxies = await CreateSmartRoom.get_galaxy_rooms_by_expiration_time()
+        get_all_galaxies = await ranking.top('galaxy_expiration', 20)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(
             title="__The Language Sloth's Galaxy Expiration Ranking Leaderboard__", 
             color=discord.Color.dark_green(), timestamp=current_time)
+        leaderboard.set_footer(text=self.get_snapshot_age_text('galaxy_expiration'))
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -567,16 +573,13 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        Games = self.client.get_cog("Games")
-        top_ten_users = await Games.get_top_ten_blackjack_members_by_wins()
+        top_ten_users = await ranking.top('blackjack')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Blackjack Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_blackjack_members_by_wins()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('blackjack', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]} • {self.get_snapshot_age_text('blackjack')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
@@ -598,16 +601,13 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        Games = self.client.get_cog("Games")
-        top_ten_users = await Games.get_top_ten_coinflip_members_by_wins()
+        top_ten_users = await ranking.top('coinflip')
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Coinflips Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_coinflip_members_by_wins()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await ranking.rank('coinflip', ctx.author.id) or ['??', 0]
 
-        leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
+        leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]} • {self.get_snapshot_age_text('coinflip')}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
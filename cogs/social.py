@@ -3,7 +3,6 @@ from discord import Option, slash_command
 from discord.utils import escape_mentions
 from discord.ext import commands
 from random import randint
-import aiohttp
 import os
 from typing import List, Optional
 
@@ -243,14 +242,13 @@ class Social(*social_cogs):
     async def randomcomic(self, ctx):
         """ Get a comic from xkcd. """
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'http://xkcd.com/info.0.json') as resp:
-                data = await resp.json()
-                currentcomic = data['num']
+        session = utils.get_session()
+        async with session.get(f'http://xkcd.com/info.0.json') as resp:
+            data = await resp.json()
+            currentcomic = data['num']
         rand = randint(0, currentcomic)  # max = current comic
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'http://xkcd.com/{rand}/info.0.json') as resp:
-                data = await resp.json()
+        async with session.get(f'http://xkcd.com/{rand}/info.0.json') as resp:
+            data = await resp.json()
         em = discord.Embed(color=discord.Color.green())
         em.title = f"XKCD Number {data['num']}- \"{data['title']}\""
         em.set_footer(text=f"Published on {data['month']}/{data['day']}/{data['year']}")
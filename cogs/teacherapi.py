@@ -3,7 +3,8 @@ import discord
 from discord.ext import commands, menus
 import os
 from datetime import datetime
-from PIL import Image, ImageFont, ImageDraw
+from PIL import Image, ImageDraw
+from extra.imaging.fonts import fonts
 from typing import Tuple
 import aiohttp
 from io import BytesIO
@@ -143,7 +144,7 @@ class TeacherAPI(commands.Cog):
         time = time.upper()
 
         # Image info
-        small = ImageFont.truetype('./media/fonts/Nougat-ExtraBlack.ttf', 28)
+        small = fonts.get('./media/fonts/Nougat-ExtraBlack.ttf', 28)
 
         # Opening images
         background = Image.open(path).resize((685, 485))
@@ -168,11 +169,11 @@ class TeacherAPI(commands.Cog):
         epoch = datetime.utcfromtimestamp(0)
         the_time = (datetime.utcnow() - epoch).total_seconds()
 
-        # Saving the image
-        saved_path = f'./media/temporary/card-{the_time}.png'
-        background.save(saved_path, 'png', quality=90)
-        await ctx.send(file=discord.File(saved_path))
-        os.remove(saved_path)
+        # Sending the image
+        with BytesIO() as fp:
+            background.save(fp, 'png', quality=90)
+            fp.seek(0)
+            await ctx.send(file=discord.File(fp, filename=f'card-{the_time}.png'))
 
     # @commands.command(aliases=['epfp'])
     # @commands.has_permissions(administrator=True)
@@ -3,9 +3,6 @@ import discord
 from discord import slash_command, message_command, user_command, Option, OptionChoice
 from discord.ext import commands, menus, tasks
 import asyncio
-from gtts import gTTS
-
-from googletrans import Translator
 import inspect
 import io
 import textwrap
@@ -19,7 +16,7 @@ import subprocess
 from datetime import datetime
 import pytz
 from pytz import timezone
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 
 from extra.slothclasses.player import Player
 from extra.menu import InroleLooping, InchannelLooping
@@ -31,6 +28,11 @@ from extra.view import SoundBoardView, BasicUserCheckView
 from extra.select import SoundBoardSelect
 
 from extra.tool.stealthstatus import StealthStatusTable
+from extra.lazyimport import lazy_import
+
+# Only loaded when the TTS and translation commands are used
+gtts = lazy_import('gtts')
+googletrans = lazy_import('googletrans')
 
 guild_ids = [int(os.getenv('SERVER_ID', 123))]
 
@@ -126,19 +128,10 @@ class Tools(*tool_cogs):
 		if not after.guild:
 			return
 
-		roles = before.roles
-		roles2 = after.roles
-		if len(roles2) < len(roles):
+		if len(after.roles) < len(before.roles):
 			return
 
-		new_role = None
-
-		for r2 in roles2:
-			if r2 not in roles:
-				new_role = r2
-				break
-
-		if new_role:
+		if set(after.roles) - set(before.roles):
 			role = after.get_role(in_a_vc_role_id)
 			if not role:
 				return
@@ -344,7 +337,7 @@ class Tools(*tool_cogs):
 		if voice.channel == voice_client.channel:
 			# Plays the song
 			if not voice_client.is_playing():
-				tts = gTTS(text=message, lang=language)
+				tts = gtts.gTTS(text=message, lang=language)
 				tts.save(f'tts/audio.mp3')
 				audio_source = discord.FFmpegPCMAudio('tts/audio.mp3')
 				voice_client.play(audio_source, after=lambda e: print('finished playing the tts!'))
@@ -390,7 +383,7 @@ class Tools(*tool_cogs):
 		else:
 			answer = ctx.respond
 
-		trans = Translator(service_urls=['translate.googleapis.com'])
+		trans = googletrans.Translator(service_urls=['translate.googleapis.com'])
 		current_time = await utils.get_time_now()
 		try:
 			translation = trans.translate(f'{message}', dest=f'{language}')
@@ -935,16 +928,7 @@ class Tools(*tool_cogs):
 	async def check_table_user_timezones(self) -> bool:
 		""" Checks if the UserTimezones table exists """
 
-		mycursor, db = await the_database()
-		await mycursor.execute("SHOW TABLE STATUS LIKE 'UserTimezones'")
-		table_info = await mycursor.fetchall()
-		await mycursor.close()
-
-		if len(table_info) == 0:
-			return False
-
-		else:
-			return True
+		return await table_exists('UserTimezones')
 
 
 	@commands.command(aliases=['show_tree', 'file_tree', 'showtree', 'filetree', 'sft'])
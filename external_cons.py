@@ -1,8 +1,11 @@
-import praw
 import os
-from pydrive.auth import GoogleAuth
-from pydrive.drive import GoogleDrive
 from typing import Any
+from extra.lazyimport import lazy_import
+
+# Only a few commands use them, so they're loaded the first time one of them connects
+praw = lazy_import('praw')
+pydrive_auth = lazy_import('pydrive.auth')
+pydrive_drive = lazy_import('pydrive.drive')
 
 async def the_reddit() -> Any:
     """ Gets the Reddit connection. """
@@ -18,7 +21,7 @@ async def the_reddit() -> Any:
 async def the_drive() -> Any:
     """ Gets the GoogleDrive connection. """
 
-    gauth = GoogleAuth()
+    gauth = pydrive_auth.GoogleAuth()
     # gauth.LocalWebserverAuth()
     gauth.LoadCredentialsFile("mycreds.txt")
     if gauth.credentials is None:
@@ -41,5 +44,5 @@ async def the_drive() -> Any:
     # Save the current credentials to a file
     gauth.SaveCredentialsFile("mycreds.txt")
 
-    drive = GoogleDrive(gauth)
+    drive = pydrive_drive.GoogleDrive(gauth)
     return drive
\ No newline at end of file
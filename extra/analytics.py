@@ -1,5 +1,5 @@
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 from extra import utils
 from datetime import datetime
@@ -181,14 +181,7 @@ class DataBumpsTable(commands.Cog):
     async def table_data_bumps_exists(self) -> bool:
         """ Checks whether the DataBumps table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'DataBumps'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('DataBumps')
 
     async def bump_data(self, 
         joined: int, left: int, messages: int, 
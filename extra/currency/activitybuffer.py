@@ -0,0 +1,183 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from discord.ext import tasks
+from mysqldb import the_database
+
+flush_interval = int(os.getenv('ACTIVITY_FLUSH_INTERVAL', 30))
+flush_max_events = int(os.getenv('ACTIVITY_FLUSH_MAX_EVENTS', 500))
+xp_cooldown = int(os.getenv('ACTIVITY_XP_COOLDOWN', 3))
+
+
+class ActivityBuffer:
+    """ Write-behind accumulator for the per-message activity counters.
+
+    Message counters, XP grants and analytics counts are coalesced per user in memory
+    and written every `flush_interval` seconds or `flush_max_events` events,
+    with one multi-row statement per table. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.messages: Dict[int, int] = {}
+        self.xp: Dict[int, Tuple[int, int]] = {}
+        self.analytics_messages: int = 0
+        self.events: int = 0
+        self.last_xp_grant: Dict[int, float] = {}
+        self.xp_callback: Optional[Callable[[List[int]], Awaitable[None]]] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """ Starts the periodic flush loop. """
+
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def stop(self) -> None:
+        """ Stops the periodic flush loop and flushes what's pending. """
+
+        self.flush_loop.cancel()
+        await self.flush()
+
+    @tasks.loop(seconds=flush_interval)
+    async def flush_loop(self) -> None:
+        """ Flushes the pending counters periodically. """
+
+        await self.flush()
+
+    # ===== ACCUMULATE =====
+
+    def add_messages(self, user_id: int, amount: int = 1) -> None:
+        """ Increments a user's message counter in the UserServerActivity table.
+        :param user_id: The ID of the user.
+        :param amount: The increment to apply. [Default=1] """
+
+        self.messages[user_id] = self.messages.get(user_id, 0) + amount
+        self._count_event()
+
+    def add_xp(self, user_id: int, xp: int, current_ts: float) -> bool:
+        """ Grants XP to a user in the MembersScore table, respecting the XP cooldown.
+        :param user_id: The ID of the user.
+        :param xp: The XP to grant.
+        :param current_ts: The current timestamp.
+        :returns: Whether the XP was granted. """
+
+        if current_ts - self.last_xp_grant.get(user_id, 0) < xp_cooldown:
+            return False
+
+        self.last_xp_grant[user_id] = current_ts
+        pending_xp, _ = self.xp.get(user_id, (0, 0))
+        self.xp[user_id] = (pending_xp + xp, int(current_ts))
+        self._count_event()
+        return True
+
+    def add_analytics_messages(self, amount: int = 1) -> None:
+        """ Increments the server's message counter in the SlothAnalytics table.
+        :param amount: The increment to apply. [Default=1] """
+
+        self.analytics_messages += amount
+        self._count_event()
+
+    def _count_event(self) -> None:
+        """ Counts an event and triggers a flush if the limit was reached. """
+
+        self.events += 1
+        if self.events >= flush_max_events and (not self._flush_task or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    # ===== FLUSH =====
+
+    async def flush(self) -> None:
+        """ Writes all pending counters into the database. """
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            messages, self.messages = self.messages, {}
+            xp, self.xp = self.xp, {}
+            analytics_messages, self.analytics_messages = self.analytics_messages, 0
+            self.events = 0
+
+            if not messages and not xp and not analytics_messages:
+                return
+
+            try:
+                await self._write(messages, xp, analytics_messages)
+            except Exception as e:
+                print('ActivityBuffer flush error', e)
+                self._restore(messages, xp, analytics_messages)
+                return
+
+            # Forgets cooldowns that already expired, so the dict doesn't grow forever
+            if self.last_xp_grant:
+                newest = max(self.last_xp_grant.values())
+                self.last_xp_grant = {
+                    uid: ts for uid, ts in self.last_xp_grant.items() if newest - ts < xp_cooldown}
+
+        if xp and self.xp_callback:
+            try:
+                await self.xp_callback(list(xp.keys()))
+            except Exception as e:
+                print('ActivityBuffer XP callback error', e)
+
+    def _restore(self, messages: Dict[int, int], xp: Dict[int, Tuple[int, int]], analytics_messages: int) -> None:
+        """ Puts back counters that couldn't be written, so they're retried on the next flush. """
+
+        for user_id, amount in messages.items():
+            self.messages[user_id] = self.messages.get(user_id, 0) + amount
+
+        for user_id, (amount, ts) in xp.items():
+            pending_xp, pending_ts = self.xp.get(user_id, (0, 0))
+            self.xp[user_id] = (pending_xp + amount, max(ts, pending_ts))
+
+        self.analytics_messages += analytics_messages
+
+    async def _write(self, messages: Dict[int, int], xp: Dict[int, Tuple[int, int]], analytics_messages: int) -> None:
+        """ Writes the given counters using one connection and one statement per table.
+        :param messages: The message increments, by user ID.
+        :param xp: The XP increments and latest XP timestamps, by user ID.
+        :param analytics_messages: The server's message increment. """
+
+        mycursor, db = await the_database()
+        try:
+            await db.begin()
+            if messages:
+                user_ids = list(messages.keys())
+                await mycursor.execute(
+                    f"SELECT user_id FROM UserServerActivity WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})", user_ids)
+                existing = {row[0] for row in await mycursor.fetchall()}
+
+                if new_users := [(uid, amount, 0, None) for uid, amount in messages.items() if uid not in existing]:
+                    await mycursor.executemany(
+                        "INSERT INTO UserServerActivity (user_id, user_messages, user_time, user_timestamp) VALUES (%s, %s, %s, %s)", new_users)
+
+                if updates := [(uid, amount) for uid, amount in messages.items() if uid in existing]:
+                    await mycursor.execute(f"""
+                        UPDATE UserServerActivity USA
+                        JOIN ({' UNION ALL '.join(['SELECT %s AS user_id, %s AS amount'] * len(updates))}) B
+                        ON B.user_id = USA.user_id
+                        SET USA.user_messages = USA.user_messages + B.amount""", [v for row in updates for v in row])
+
+            if xp:
+                await mycursor.execute(f"""
+                    UPDATE MembersScore MS
+                    JOIN ({' UNION ALL '.join(['SELECT %s AS user_id, %s AS amount, %s AS xp_time'] * len(xp))}) B
+                    ON B.user_id = MS.user_id
+                    SET MS.user_xp = MS.user_xp + B.amount, MS.user_xp_time = B.xp_time""",
+                    [v for uid, (amount, ts) in xp.items() for v in (uid, amount, ts)])
+
+            if analytics_messages:
+                await mycursor.execute("UPDATE SlothAnalytics SET messages_sent = messages_sent + %s", (analytics_messages,))
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await mycursor.close()
+
+
+activity_buffer = ActivityBuffer()
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
+from extra.ranking import ranking
 from typing import List, Union
 
 
@@ -69,14 +70,7 @@ class MembersScoreTable(commands.Cog):
     async def check_members_score_table_exists(self) -> bool:
         """ Checks whether the MembersScore table exists in the database. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'MembersScore'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('MembersScore')
 
     # ===== INSERT =====
     
@@ -92,6 +86,8 @@ class MembersScoreTable(commands.Cog):
         await mycursor.execute("INSERT INTO MembersScore VALUES (%s, %s, %s, %s, %s, %s)", (user_id, xp, lvl, xp_time, score_points, rep_time))
         await db.commit()
         await mycursor.close()
+        ranking.update('xp', (user_id, xp, lvl, xp_time, score_points, rep_time))
+        ranking.update('score', (user_id, xp, lvl, xp_time, score_points, rep_time))
 
     # ===== SELECT =====
 
@@ -105,6 +101,19 @@ class MembersScoreTable(commands.Cog):
         await mycursor.close()
         return member
 
+    async def get_specific_users(self, user_ids: List[int]) -> List[List[int]]:
+        """ Gets specific users from the MembersScore table.
+        :param user_ids: The IDs of the users to get. """
+
+        if not user_ids:
+            return []
+
+        mycursor, _ = await the_database()
+        await mycursor.execute(f"SELECT * FROM MembersScore WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})", user_ids)
+        members = await mycursor.fetchall()
+        await mycursor.close()
+        return members
+
     async def get_member_scores(self) -> List[List[int]]:
         """ Gets all users from the MembersScore table. """
 
@@ -159,6 +168,7 @@ class MembersScoreTable(commands.Cog):
         await mycursor.execute("UPDATE MembersScore SET user_xp = 0, user_lvl = 1 WHERE user_id = %s", (user_id,))
         await db.commit()
         await mycursor.close()
+        ranking.set_score('xp', user_id, 0)
 
     async def update_user_xp(self, user_id: int, xp: int) -> None:
         """ Updates the user Xp in the MembersScore table.
@@ -169,6 +179,7 @@ class MembersScoreTable(commands.Cog):
         await mycursor.execute("UPDATE MembersScore SET user_xp = user_xp + %s WHERE user_id = %s", (xp, user_id))
         await db.commit()
         await mycursor.close()
+        ranking.increment('xp', user_id, xp)
 
     async def update_user_lvl(self, user_id: int) -> None:
         """ Updates the user level in the MembersScore table.
@@ -198,6 +209,7 @@ class MembersScoreTable(commands.Cog):
         await mycursor.execute("UPDATE MembersScore SET score_points = score_points + %s WHERE user_id = %s", (score_points, user_id))
         await db.commit()
         await mycursor.close()
+        ranking.increment('score', user_id, score_points)
 
     async def update_user_rep_time(self, user_id: int, rep_time: int) -> None:
         """ Updates the user rep time.
@@ -219,4 +231,6 @@ class MembersScoreTable(commands.Cog):
         await mycursor.execute("DELETE FROM MembersScore WHERE user_id = %s", (user_id,))
         await db.commit()
         await mycursor.close()
+        ranking.remove('xp', user_id)
+        ranking.remove('score', user_id)
 
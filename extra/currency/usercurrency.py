@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 from mysqldb import the_database
+from extra.ranking import ranking
 from typing import List, Union
 
 
@@ -169,6 +170,7 @@ class UserCurrencyTable(commands.Cog):
         await mycursor.execute("UPDATE UserCurrency SET user_money = user_money + %s WHERE user_id = %s", (money, user_id))
         await db.commit()
         await mycursor.close()
+        ranking.increment('leaves', user_id, money)
 
     async def update_user_many_money(self, users: List[int]) -> None:
         """ Updates many the money of many users.
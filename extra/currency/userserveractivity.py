@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 from extra import utils
 import os
@@ -66,18 +66,7 @@ class UserVoiceSystem(commands.Cog):
 
         # Switch
         elif (ac and bc) and (bc.id != ac.id):
-            alts = await Moderation.get_fake_accounts(member.id)
-
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts]) + 1
             if people_in_vc < 2 or after.self_mute or after.mute or after.deaf or after.channel.id == afk_channel_id:
@@ -102,17 +91,7 @@ class UserVoiceSystem(commands.Cog):
             if not after.self_mute and not after.self_deaf and not after.mute and not after.deaf and after.channel.id != afk_channel_id:
                 return await self.update_user_server_timestamp(member.id, current_ts)
 
-            alts = await Moderation.get_fake_accounts(member.id)
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts])
             if people_in_vc < 2 and after.self_mute:
@@ -134,17 +113,7 @@ class UserVoiceSystem(commands.Cog):
             if not after.self_mute and not after.self_deaf and not after.mute and not after.deaf and after.channel.id != afk_channel_id:
                 return await self.update_user_server_timestamp(member.id, current_ts)
 
-            alts = await Moderation.get_fake_accounts(member.id)
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts])
             if people_in_vc < 2 and after.self_deaf:
@@ -166,17 +135,7 @@ class UserVoiceSystem(commands.Cog):
             if not after.self_mute and not after.self_deaf and not after.mute and not after.deaf and after.channel.id != afk_channel_id:
                 return await self.update_user_server_timestamp(member.id, current_ts)
 
-            alts = await Moderation.get_fake_accounts(member.id)
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts])
             if people_in_vc < 2 and after.mute:
@@ -198,17 +157,7 @@ class UserVoiceSystem(commands.Cog):
             if not after.self_mute and not after.self_deaf and not after.mute and not after.deaf and after.channel.id != afk_channel_id:
                 return await self.update_user_server_timestamp(member.id, current_ts)
 
-            alts = await Moderation.get_fake_accounts(member.id)
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts])
             if people_in_vc < 2 and after.deaf:
@@ -226,17 +175,7 @@ class UserVoiceSystem(commands.Cog):
         
         # Leave
         elif bc and not ac:
-            alts = await Moderation.get_fake_accounts(member.id)
-            alts_list: List[int] = []
-            for alt in alts:
-                alts_list.append(alt[0])
-                alts_list.append(alt[1])
-
-            alts = list(set(alts_list))
-            try:
-                alts.remove(member.id)
-            except ValueError:
-                pass
+            alts = await Moderation.get_alt_ids(member.id)
 
             
             people_in_vc: int = len([m for m in bc.members if not m.bot and m.id not in alts]) + 1
@@ -316,14 +255,7 @@ class UserServerActivityTable(commands.Cog):
     async def check_user_server_activity_table_exists(self) -> bool:
         """ Checks whether the UserServerActivity table exists. """
         
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserServerActivity'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('UserServerActivity')
 
     # ===== INSERT =====
     async def insert_user_server_activity(self, user_id: int, add_msg: int, new_ts: int = None) -> None:
@@ -1,49 +1,187 @@
-from PIL import Image
+from PIL import Image, ImageChops, ImageSequence, GifImagePlugin, PngImagePlugin
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
 import os
 import glob
-from typing import Tuple, Dict, Union, Any
+import re
+import sys
+from typing import Tuple, Dict, Union, Any, BinaryIO, Iterator, List, Optional
 from itertools import cycle
 
 
-def defragment_gif(path: str, output: str) -> None:
-    """ Defragments a gif into frames.
-    :param path:
-    :param output: """
+# Sprite sheets are saved next to the frames, as `{effect}.sheet.png`
+sprite_sheet_suffix = '.sheet.png'
 
-    imageObject = Image.open(path)  # .convert('RGBA')
+# Lookup tables of the background keying masks
+white_table = [255 if value == 255 else 0 for value in range(256)]
+bright_table = [255 if value > 150 else 0 for value in range(256)]
 
-    # Display individual frames from the loaded animated GIF file
-    for frame in range(0, imageObject.n_frames):
-        imageObject.seek(frame)
-        imageObject.convert('RGBA')
-        imageObject.save(f"{output}_{frame+1}.png", transparency=0)
 
+def frame_number(path: str) -> int:
+    """ Gets the number of a frame out of its file name, e.g. `star_12.png` -> 12.
+    :param path: The path of the frame. """
 
-def remove_background(path: str, output: str) -> None:
-    """ Removes the background of image frames.
-    :param path:
-    :param output: """
+    match = re.search(r'_(\d+)\.png$', path)
+    return int(match.group(1)) if match else 0
 
-    # Display individual frames from the loaded animated GIF file
-    for i in range(len(glob.glob('./media/effects/fidget_spinner/*.png'))):
-        im = Image.open(f'./media/effects/fidget_spinner/fidget_spinner_{i+1}.png').convert('RGBA')
-        datas = im.getdata()
 
-        newData = []
-        # print(datas)
-        # break
-        # print(f'====={i+1}=====')
-        for item in datas:
-            if item[0] == 255 and item[1] == 255 and item[2] == 255:
-                newData.append((255, 255, 255, 0))
-            else:
-                if item[0] > 150:
-                    newData.append((0, 0, 0, 255))
-                else:
-                    newData.append(item)
+def get_frame_paths(folder: str, name: Optional[str] = None) -> List[str]:
+    """ Gets the paths of the numbered frames in a folder, in order.
+    :param folder: The folder of the frames.
+    :param name: The name the frames start with. [Optional][Default = The folder's name] """
 
-        im.putdata(newData)
-        im.save(f"{output}_{i+1}.png")
+    name = name or os.path.basename(os.path.normpath(folder))
+    paths = [path for path in glob.glob(f"{folder}/{name}_*.png") if frame_number(path)]
+    return sorted(paths, key=frame_number)
+
+
+def key_background(image: Image.Image) -> Image.Image:
+    """ Makes the white pixels of a frame transparent and the bright ones black, with band masks.
+    :param image: The frame to key. """
+
+    image = image.convert('RGBA')
+    r, g, b, _ = image.split()
+
+    white = ImageChops.multiply(ImageChops.multiply(r.point(white_table), g.point(white_table)), b.point(white_table))
+    bright = ImageChops.subtract(r.point(bright_table), white)
+
+    image.paste((0, 0, 0, 255), mask=bright)
+    image.paste((255, 255, 255, 0), mask=white)
+    return image
+
+
+def _key_frame(task: Tuple[str, str]) -> None:
+    """ Keys the background of a frame file; runs in the worker processes.
+    :param task: The path of the frame and the path to save it to. """
+
+    path, output = task
+    key_background(Image.open(path)).save(output)
+
+
+def _save_frame(task: Tuple[Image.Image, str]) -> None:
+    """ Saves a frame; runs in the worker processes.
+    :param task: The frame and the path to save it to. """
+
+    image, output = task
+    image.save(output)
+
+
+def _load_frame(path: str) -> Tuple[Image.Image, Optional[Tuple[int, int, int, int]]]:
+    """ Decodes a frame; runs in the worker processes.
+    :param path: The path of the frame.
+    :returns: The frame and the box of its visible pixels. """
+
+    image = Image.open(path).convert('RGBA')
+    return image, image.getchannel('A').getbbox()
+
+
+def defragment_gif(path: str, output: str, workers: Optional[int] = None) -> None:
+    """ Defragments a gif into RGBA frames, `{output}_1.png` and so on.
+    :param path: The path of the gif.
+    :param output: The path prefix of the frames.
+    :param workers: The amount of worker processes encoding the frames. [Optional][Default = The CPU count] """
+
+    image_object = Image.open(path)
+
+    # The frames have to be decoded in order, but they're encoded in parallel
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = ((frame.convert('RGBA'), f"{output}_{i+1}.png") for i, frame in enumerate(ImageSequence.Iterator(image_object)))
+        list(executor.map(_save_frame, tasks, chunksize=4))
+
+
+def remove_background(path: str, output: str, workers: Optional[int] = None) -> None:
+    """ Removes the background of image frames, in parallel.
+    :param path: The glob pattern of the frames, e.g. `./media/effects/fidget_spinner/fidget_spinner_*.png`.
+    :param output: The path prefix of the keyed frames.
+    :param workers: The amount of worker processes. [Optional][Default = The CPU count] """
+
+    paths = sorted(glob.glob(path), key=frame_number)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_key_frame, [(frame_path, f"{output}_{i+1}.png") for i, frame_path in enumerate(paths)], chunksize=4))
+
+
+def pack_sprite_sheet(folder: str, name: Optional[str] = None, workers: Optional[int] = None) -> str:
+    """ Packs the frames of an effect into a sprite sheet, so they can be loaded with a single read.
+    :param folder: The folder of the frames.
+    :param name: The name the frames start with. [Optional][Default = The folder's name]
+    :param workers: The amount of worker processes decoding the frames. [Optional][Default = The CPU count]
+    :returns: The path of the sprite sheet.
+
+    PS: All frames are trimmed to the box that holds the visible pixels of any of them,
+    and the box's position is saved in the sheet, so the frames can be placed where they were. """
+
+    name = name or os.path.basename(os.path.normpath(folder))
+    paths = get_frame_paths(folder, name)
+    if not paths:
+        raise FileNotFoundError(f"No frames found for {name} in {folder}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        loaded = list(executor.map(_load_frame, paths, chunksize=4))
+
+    frame_width, frame_height = loaded[0][0].size
+    boxes = [box for _, box in loaded if box] or [(0, 0, 1, 1)]
+    left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+    right, bottom = max(box[2] for box in boxes), max(box[3] for box in boxes)
+    cell_width, cell_height = right - left, bottom - top
+
+    columns = math.ceil(math.sqrt(len(loaded)))
+    rows = math.ceil(len(loaded) / columns)
+    sheet = Image.new('RGBA', (cell_width * columns, cell_height * rows), (0, 0, 0, 0))
+    for i, (frame, _) in enumerate(loaded):
+        sheet.paste(frame.crop((left, top, right, bottom)), ((i % columns) * cell_width, (i // columns) * cell_height))
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text('sprite_sheet', json.dumps({
+        'count': len(loaded), 'columns': columns, 'cell': [cell_width, cell_height],
+        'offset': [left, top], 'frame': [frame_width, frame_height],
+    }))
+
+    sheet_path = f"{folder}/{name}{sprite_sheet_suffix}"
+    sheet.save(sheet_path, pnginfo=info)
+    return sheet_path
+
+
+def pack_effects(effects: Optional[List[str]] = None, effects_path: str = 'media/effects', workers: Optional[int] = None) -> List[str]:
+    """ Packs the sprite sheets of the effects.
+    :param effects: The names of the effects. [Optional][Default = All effects]
+    :param effects_path: The folder of the effects. [Default = media/effects]
+    :param workers: The amount of worker processes. [Optional][Default = The CPU count]
+    :returns: The paths of the sprite sheets. """
+
+    if not effects:
+        effects = sorted(os.path.basename(os.path.normpath(folder)) for folder in glob.glob(f"{effects_path}/*/"))
+
+    return [pack_sprite_sheet(f"{effects_path}/{effect}", effect, workers) for effect in effects]
+
+
+def read_sprite_sheet(path: str, size: Optional[Tuple[int, int]] = None) -> Tuple[List[Image.Image], Tuple[int, int]]:
+    """ Reads the frames out of a sprite sheet.
+    :param path: The path of the sprite sheet.
+    :param size: The size the original frames would be resized to. [Optional]
+    :returns: The trimmed RGBA frames and their position within the original frames. """
+
+    sheet = Image.open(path)
+    sheet.load()
+    meta = json.loads(sheet.text['sprite_sheet'])
+    sheet = sheet.convert('RGBA')
+
+    (cell_width, cell_height), (left, top) = meta['cell'], meta['offset']
+    frames = [
+        sheet.crop((
+            (i % meta['columns']) * cell_width, (i // meta['columns']) * cell_height,
+            (i % meta['columns'] + 1) * cell_width, (i // meta['columns'] + 1) * cell_height))
+        for i in range(meta['count'])
+    ]
+
+    if size:
+        # Scales the trimmed frames and their position as if the original frames were resized
+        scale_x, scale_y = size[0] / meta['frame'][0], size[1] / meta['frame'][1]
+        cell_size = (max(round(cell_width * scale_x), 1), max(round(cell_height * scale_y), 1))
+        frames = [frame.resize(cell_size) for frame in frames]
+        left, top = round(left * scale_x), round(top * scale_y)
+
+    return frames, (left, top)
 
 
 class GIF:
@@ -79,8 +217,156 @@ class GIF:
                    duration=self._frame_duration, transparency=0, loop=0, **kwargs)
 
 
+class GIFCompositor:
+    """ Streams a GIF of animated layers over a static background.
+
+    The frames are made lazily, one at a time, from the layers' pre-decoded frames,
+    and encoded straight into the output as they're made, so only one frame is in memory:
+    - all frames share a global palette, made from the background and a sample of the frames;
+    - only the area the layers cover is composited again for each frame;
+    - each frame after the first only encodes the box that changed from the previous one,
+    which is kept on screen (disposal 1).
+    A transparent pixel in a GIF frame keeps what's on screen, so it can't clear a pixel a layer drew before.
+    When the layers move over transparent background pixels, every frame is encoded whole instead,
+    and the screen is cleared before the next one (disposal 2). """
+
+    # Frames sampled to make the palette
+    palette_samples: int = 8
+
+    def __init__(self, background: Image.Image, frame_duration: int,
+        layers: List[Tuple[List[Image.Image], Tuple[int, int]]], max_frames: Optional[int] = None) -> None:
+        """ Class initializing method.
+        :param background: The static background of the GIF.
+        :param frame_duration: The duration of each frame.
+        :param layers: The frames of each animated layer and the position to paste them at.
+        PS: Layers with fewer frames are looped.
+        :param max_frames: The maximum amount of frames. [Optional] """
+
+        self._background = background.convert('RGBA')
+        self._frame_duration = frame_duration
+        self._layers = [(frames, cords) for frames, cords in layers if frames]
+
+        self.frame_count = max([len(frames) for frames, _ in self._layers], default=1)
+        if max_frames:
+            self.frame_count = min(self.frame_count, max_frames)
+
+        # The box all layers cover, clipped to the background
+        self._box = self._get_box()
+        self._background_box = self._background.crop(self._box)
+
+        # Background pixels that are mostly transparent stay transparent in every frame
+        self._transparency: Optional[int] = 255 if self._background.getextrema()[3][0] < 128 else None
+        self._alpha_table = [255 if alpha < 128 else 0 for alpha in range(256)]
+        self._full_frames = self._transparency is not None and self._background_box.getextrema()[3][0] < 128
+
+    def _get_box(self) -> Tuple[int, int, int, int]:
+        """ Gets the box that all layers cover, clipped to the background. """
+
+        width, height = self._background.size
+        if not self._layers:
+            return (0, 0, 1, 1)
+
+        left = max(min(cords[0] for _, cords in self._layers), 0)
+        top = max(min(cords[1] for _, cords in self._layers), 0)
+        right = min(max(cords[0] + frames[0].width for frames, cords in self._layers), width)
+        bottom = min(max(cords[1] + frames[0].height for frames, cords in self._layers), height)
+        if right <= left or bottom <= top:
+            return (0, 0, 1, 1)
+        return (left, top, right, bottom)
+
+    def _compose(self, index: int) -> Image.Image:
+        """ Composites the layers' frames of a frame over the background, within the layers' box.
+        :param index: The index of the frame. """
+
+        canvas = self._background_box.copy()
+        left, top = self._box[:2]
+        for frames, cords in self._layers:
+            frame = frames[index % len(frames)]
+            if frame.mode != 'RGBA':
+                frame = frame.convert('RGBA')
+            canvas.paste(frame, (cords[0] - left, cords[1] - top), frame)
+        return canvas
+
+    def _make_palette(self) -> Image.Image:
+        """ Makes the global palette out of the background and a sample of the composited frames. """
+
+        width, height = self._background.size
+        box_width, box_height = self._background_box.size
+        step = max(self.frame_count // self.palette_samples, 1)
+        samples = range(0, self.frame_count, step)
+
+        sample = Image.new('RGB', (max(width, box_width), height + box_height * len(samples)))
+        sample.paste(self._background.convert('RGB'), (0, 0))
+        for i, index in enumerate(samples):
+            sample.paste(self._compose(index).convert('RGB'), (0, height + box_height * i))
+
+        return sample.quantize(colors=255 if self._transparency is not None else 256)
+
+    def _quantize(self, image: Image.Image, palette: Image.Image) -> Image.Image:
+        """ Maps an RGBA image to the global palette, marking its transparent pixels.
+        :param image: The image to map.
+        :param palette: The palette image. """
+
+        quantized = image.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+        if self._transparency is not None:
+            quantized.paste(self._transparency, mask=image.getchannel('A').point(self._alpha_table))
+        return quantized
+
+    @staticmethod
+    def _indexes(image: Image.Image) -> Image.Image:
+        """ Gets the palette indexes of a quantized image, as a grayscale image. """
+
+        return Image.frombytes('L', image.size, image.tobytes())
+
+    def frames(self, palette: Image.Image) -> Iterator[Tuple[Image.Image, Tuple[int, int]]]:
+        """ Makes the frames lazily, with only the box that changed from the previous frame, unless they're encoded whole.
+        :param palette: The palette image.
+        :returns: The quantized frames and their offsets. """
+
+        first = self._background.copy()
+        first.paste(self._compose(0), self._box[:2])
+        yield self._quantize(first, palette), (0, 0)
+
+        if self._full_frames:
+            for index in range(1, self.frame_count):
+                frame = self._background.copy()
+                frame.paste(self._compose(index), self._box[:2])
+                yield self._quantize(frame, palette), (0, 0)
+            return
+
+        left, top = self._box[:2]
+        previous = self._quantize(self._compose(0), palette)
+        for index in range(1, self.frame_count):
+            current = self._quantize(self._compose(index), palette)
+            # Compares the palette indexes, so only the pixels that really changed count
+            changed = ImageChops.difference(self._indexes(previous), self._indexes(current)).getbbox() or (0, 0, 1, 1)
+            previous = current
+            yield current.crop(changed), (left + changed[0], top + changed[1])
+
+    def export(self, fp: BinaryIO) -> None:
+        """ Encodes the GIF into a file-like object, frame by frame.
+        :param fp: The file-like object to write into, such as a BytesIO. """
+
+        palette = self._make_palette()
+        params = {'duration': self._frame_duration, 'disposal': 2 if self._full_frames else 1}
+        if self._transparency is not None:
+            params['transparency'] = self._transparency
+
+        for i, (frame, offset) in enumerate(self.frames(palette)):
+            if i == 0:
+                header, _ = GifImagePlugin.getheader(frame, info={'loop': 0, 'duration': self._frame_duration})
+                fp.write(b''.join(header))
+            fp.write(b''.join(GifImagePlugin.getdata(frame, offset, **params)))
+
+        fp.write(b';')
+
+
 if __name__ == '__main__':
 
+    # Packs the sprite sheets of the given effects, or of all of them: python -m extra.gif_manager [effect ...]
+    for sheet_path in pack_effects(sys.argv[1:]):
+        print('Packed', sheet_path)
+
     # Puts a single effect onto an image #
 
     # profile = Image.open('../profile.png').convert('RGBA')
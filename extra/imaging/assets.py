@@ -0,0 +1,175 @@
+""" Memory-resident store of the decoded image assets used by the renders.
+
+Each render worker has its own store, which is warmed when the worker starts. """
+
+from PIL import Image
+from collections import OrderedDict
+import glob
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from extra.gif_manager import read_sprite_sheet, sprite_sheet_suffix
+
+asset_cache_max_mb = int(os.getenv('ASSET_CACHE_MAX_MB', 256))
+
+# Folders whose images are decoded up front, so renders don't decode them on demand
+warm_folders: List[str] = [
+    'sloth_custom_images/background', 'sloth_custom_images/sloth', 'sloth_custom_images/body',
+    'sloth_custom_images/hand', 'sloth_custom_images/foot', 'sloth_custom_images/head',
+    'sloth_custom_images/hud', 'sloth_custom_images/badge',
+]
+effects_path = 'media/effects'
+
+AssetKey = Tuple[str, Optional[Tuple[int, int]], Optional[str]]
+
+
+class AssetStore:
+    """ LRU store of decoded, converted and pre-resized images, keyed by (path, size, mode).
+
+    PS: The images are shared, so callers must copy them before drawing on them. """
+
+    def __init__(self, max_bytes: int = asset_cache_max_mb * 1024 * 1024) -> None:
+        """ Class init method. """
+
+        self.max_bytes = max_bytes
+        self.size_bytes: int = 0
+        self._images: 'OrderedDict[AssetKey, Image.Image]' = OrderedDict()
+        self._frame_counts: Dict[str, int] = {}
+        # The frame keys and position of the effects loaded from sprite sheets
+        self._layers: Dict[Tuple[str, Optional[Tuple[int, int]]], Tuple[List[AssetKey], Tuple[int, int]]] = {}
+        self._lock = threading.RLock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, path: str, size: Optional[Tuple[int, int]] = None, mode: Optional[str] = None) -> Image.Image:
+        """ Gets a decoded image, decoding it from disk if it's not in the store.
+        :param path: The path of the image.
+        :param size: The size to resize the image to. [Optional]
+        :param mode: The mode to convert the image to. [Optional] """
+
+        key = (os.path.normpath(path), tuple(size) if size else None, mode)
+        with self._lock:
+            if (image := self._images.get(key)) is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+            self.misses += 1
+            image = Image.open(path)
+            if size:
+                image = image.resize(size)
+            if mode and image.mode != mode:
+                image = image.convert(mode)
+            image.load()
+
+            self._images[key] = image
+            self.size_bytes += self._image_bytes(image)
+            self._evict()
+            return image
+
+    def effect_frames(self, effect: str, size: Optional[Tuple[int, int]] = None) -> List[Image.Image]:
+        """ Gets the frames of an animated effect.
+        :param effect: The name of the effect.
+        :param size: The size to resize the frames to. [Optional] """
+
+        full_path = f"{effects_path}/{effect}"
+        with self._lock:
+            if (frame_count := self._frame_counts.get(effect)) is None:
+                frame_count = len(glob.glob(f"{full_path}/{effect}_*.png")) if os.path.isdir(full_path) else 0
+                self._frame_counts[effect] = frame_count
+
+        # Frames are converted only when resized, just like they always were
+        return [
+            self.get(f"{full_path}/{effect}_{i+1}.png", size, 'RGBA' if size else None)
+            for i in range(frame_count)
+        ]
+
+    def effect_layer(self, effect: str, size: Optional[Tuple[int, int]] = None) -> Tuple[List[Image.Image], Tuple[int, int]]:
+        """ Gets the frames of an animated effect and their position within the effect's full frame.
+        :param effect: The name of the effect.
+        :param size: The size the effect's full frames would be resized to. [Optional]
+
+        PS: Effects packed into a sprite sheet are read with a single read, trimmed to their visible pixels.
+        The others are made of their full frames, placed at (0, 0). """
+
+        sheet_path = os.path.normpath(f"{effects_path}/{effect}/{effect}{sprite_sheet_suffix}")
+        if not os.path.isfile(sheet_path):
+            return self.effect_frames(effect, size), (0, 0)
+
+        layer_key = (sheet_path, tuple(size) if size else None)
+        with self._lock:
+            if (layer := self._layers.get(layer_key)) is not None:
+                keys, position = layer
+                frames = [self._images.get(key) for key in keys]
+                if all(frame is not None for frame in frames):
+                    for key in keys:
+                        self._images.move_to_end(key)
+                    self.hits += 1
+                    return frames, position
+
+            self.misses += 1
+            frames, position = read_sprite_sheet(sheet_path, size)
+            keys = [(f"{sheet_path}#{i}", layer_key[1], 'RGBA') for i in range(len(frames))]
+            for key, frame in zip(keys, frames):
+                if (old := self._images.pop(key, None)) is not None:
+                    self.size_bytes -= self._image_bytes(old)
+                self._images[key] = frame
+                self.size_bytes += self._image_bytes(frame)
+
+            self._layers[layer_key] = (keys, position)
+            self._evict()
+            return frames, position
+
+    def warm(self) -> None:
+        """ Decodes all the profile assets and effect frames up front. """
+
+        for folder in warm_folders:
+            for path in sorted(glob.glob(f"{folder}/*.png")):
+                self._warm_one(path)
+
+        for effect_folder in sorted(glob.glob(f"{effects_path}/*/")):
+            effect = os.path.basename(os.path.normpath(effect_folder))
+            try:
+                self.effect_layer(effect)
+            except Exception as e:
+                print('AssetStore warm error', effect, e)
+
+    def _warm_one(self, path: str) -> None:
+        """ Decodes a single asset, ignoring the broken ones. """
+
+        try:
+            self.get(path)
+        except Exception as e:
+            print('AssetStore warm error', path, e)
+
+    def clear(self) -> None:
+        """ Drops all the decoded images, e.g. after the assets were updated on disk. """
+
+        with self._lock:
+            self._images.clear()
+            self._frame_counts.clear()
+            self._layers.clear()
+            self.size_bytes = 0
+
+    def _evict(self) -> None:
+        """ Evicts the least recently used images until the store fits in its memory cap. """
+
+        while self.size_bytes > self.max_bytes and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self.size_bytes -= self._image_bytes(image)
+
+    @staticmethod
+    def _image_bytes(image: Image.Image) -> int:
+        """ Estimates the memory used by a decoded image. """
+
+        return image.width * image.height * len(image.getbands())
+
+
+assets = AssetStore()
+
+
+def warm_assets() -> None:
+    """ Warms the asset store; used as the render workers' initializer. """
+
+    assets.warm()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import aiohttp
+import discord
+from PIL import Image
+
+from extra.imaging.renderer import renderer
+from extra.imaging.renders import make_pfp_thumbnail
+
+avatar_cache_ttl = int(os.getenv('AVATAR_CACHE_TTL', 3600))
+avatar_cache_max_entries = int(os.getenv('AVATAR_CACHE_MAX_ENTRIES', 512))
+
+AvatarKey = Tuple[int, str, int]
+
+
+class AvatarCache:
+    """ TTL and LRU cache of the users' round avatar thumbnails.
+
+    Thumbnails are keyed by (user ID, avatar hash, width), so a new avatar makes a new key,
+    and concurrent requests for the same thumbnail share a single download. """
+
+    def __init__(self, ttl: int = avatar_cache_ttl, max_entries: int = avatar_cache_max_entries) -> None:
+        """ Class init method. """
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[AvatarKey, Tuple[float, Image.Image]]' = OrderedDict()
+        self._pending: Dict[AvatarKey, asyncio.Future] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    async def get(self, member: discord.abc.User, thumb_width: int, session: aiohttp.ClientSession) -> Image.Image:
+        """ Gets a user's avatar thumbnail, downloading it only if it's not cached.
+        :param member: The user from whom to get the avatar.
+        :param thumb_width: The width of the thumbnail.
+        :param session: The HTTP session to download the avatar with. """
+
+        avatar = member.display_avatar
+        key = (member.id, avatar.key, thumb_width)
+
+        if (entry := self._entries.get(key)) and time.monotonic() - entry[0] <= self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        # Waits for the download that's already in progress, if there's one
+        if (pending := self._pending.get(key)) is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            async with session.get(str(avatar)) as response:
+                image_bytes = await response.content.read()
+
+            thumbnail = await renderer.render(make_pfp_thumbnail, image_bytes, thumb_width)
+        except Exception as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved, in case no one else was waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(thumbnail)
+            self._set(key, thumbnail)
+            return thumbnail
+        finally:
+            # Releases the waiters if the download itself was cancelled
+            if not future.done():
+                future.cancel()
+            self._pending.pop(key, None)
+
+    def _set(self, key: AvatarKey, thumbnail: Image.Image) -> None:
+        """ Caches a thumbnail, evicting the least recently used ones if needed. """
+
+        self._entries[key] = (time.monotonic(), thumbnail)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """ Drops all cached thumbnails. """
+
+        self._entries.clear()
+
+
+avatar_cache = AvatarCache()
@@ -0,0 +1,81 @@
+""" Memory-resident registry of the loaded fonts used by the renders.
+
+Each render worker has its own registry, just like the asset store. """
+
+from PIL import ImageFont
+from collections import OrderedDict
+import os
+import threading
+from typing import Tuple
+
+font_cache_size = int(os.getenv('FONT_CACHE_SIZE', 256))
+
+FontKey = Tuple[str, int]
+
+
+class FontRegistry:
+    """ LRU registry of loaded fonts, keyed by (path, size).
+
+    PS: The fonts are shared, so callers must not change them. """
+
+    def __init__(self, max_fonts: int = font_cache_size) -> None:
+        """ Class init method. """
+
+        self.max_fonts = max_fonts
+        self._fonts: 'OrderedDict[FontKey, ImageFont.FreeTypeFont]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        """ Gets a font, loading it from disk if it's not in the registry.
+        :param path: The path of the font file.
+        :param size: The size of the font. """
+
+        key = (os.path.normpath(path), size)
+        with self._lock:
+            if (font := self._fonts.get(key)) is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+
+            self.misses += 1
+            font = ImageFont.truetype(path, size)
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+            return font
+
+    def fit(self, path: str, text: str, max_width: float, max_size: int = 1024) -> ImageFont.FreeTypeFont:
+        """ Gets the biggest font whose text width is still under a given width.
+        :param path: The path of the font file.
+        :param text: The text to fit.
+        :param max_width: The width the text must stay under.
+        :param max_size: The biggest font size to consider. [Default = 1024]
+
+        PS: The size is found with a binary search on the measured text width,
+        so it only takes a logarithmic amount of font loads, which stay cached. """
+
+        # Doubles the size until the text is too wide, so the fitting size is between the two
+        low, high = 1, 2
+        while high < max_size and self.get(path, high).getlength(text) < max_width:
+            low, high = high, min(high * 2, max_size)
+
+        # The biggest size whose text width is still under the limit
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.get(path, middle).getlength(text) < max_width:
+                low = middle
+            else:
+                high = middle
+
+        return self.get(path, low)
+
+    def clear(self) -> None:
+        """ Drops all the loaded fonts, e.g. after the fonts were updated on disk. """
+
+        with self._lock:
+            self._fonts.clear()
+
+
+fonts = FontRegistry()
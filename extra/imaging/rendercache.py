@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+render_cache_max_mb = int(os.getenv('RENDER_CACHE_MAX_MB', 64))
+
+
+class RenderCache:
+    """ Content-addressed cache of rendered images.
+
+    Renders are keyed by a hash of everything they depend on, so a changed input
+    simply makes a new key, and stale renders age out of the byte-size-bounded LRU. """
+
+    def __init__(self, max_bytes: int = render_cache_max_mb * 1024 * 1024) -> None:
+        """ Class init method. """
+
+        self.max_bytes = max_bytes
+        self.size_bytes: int = 0
+        self._entries: 'OrderedDict[str, Tuple[bytes, str]]' = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def make_key(*inputs: Any) -> str:
+        """ Makes a cache key out of the render's inputs.
+        :param inputs: JSON-serializable inputs of the render. """
+
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """ Gets a cached render.
+        :param key: The render's key.
+        :returns: The encoded image and its file extension, if cached. """
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, image_bytes: bytes, extension: str) -> None:
+        """ Caches a render.
+        :param key: The render's key.
+        :param image_bytes: The encoded image.
+        :param extension: The image's file extension. """
+
+        if len(image_bytes) > self.max_bytes:
+            return
+
+        if (old := self._entries.pop(key, None)) is not None:
+            self.size_bytes -= len(old[0])
+
+        self._entries[key] = (image_bytes, extension)
+        self.size_bytes += len(image_bytes)
+
+        while self.size_bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """ Drops all cached renders. """
+
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """ Gets the current usage statistics of the cache. """
+
+        return {
+            'entries': len(self._entries),
+            'size_mb': self.size_bytes / (1024 * 1024),
+            'max_mb': self.max_bytes / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+profile_cache = RenderCache()
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+from extra.imaging.assets import assets, warm_assets
+
+render_workers = int(os.getenv('RENDER_WORKERS', 2))
+render_max_concurrency = int(os.getenv('RENDER_MAX_CONCURRENCY', render_workers * 2 or 2))
+
+T = TypeVar('T')
+
+
+class ImageRenderer:
+    """ Runs the image rendering functions off the event loop, in a pool of worker processes.
+
+    The functions must be top-level (picklable) and take and return plain data,
+    such as the ones in `extra.imaging.renders`. With `RENDER_WORKERS=0`, a thread pool is used instead. """
+
+    def __init__(self, workers: int = render_workers, max_concurrency: int = render_max_concurrency) -> None:
+        """ Class init method. """
+
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # The renders submitted to the pool that haven't finished yet
+        self._futures: Set[Future] = set()
+        self.queued: int = 0
+        self.running: int = 0
+        self.max_queued: int = 0
+        self.renders: int = 0
+        self.failures: int = 0
+        self._total_time: float = 0
+        self._max_time: float = 0
+
+    def _get_executor(self) -> Executor:
+        """ Gets the executor, creating it if needed. """
+
+        if self._executor is None:
+            # Each worker decodes the image assets once, when it starts
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_assets)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix='render', initializer=warm_assets)
+
+        return self._executor
+
+    def start(self) -> None:
+        """ Starts the workers up front, so their assets are warmed before the first render. """
+
+        executor = self._get_executor()
+        for _ in range(self.workers or 1):
+            executor.submit(int)
+
+    def restart(self) -> None:
+        """ Replaces the workers with fresh ones, e.g. after the image assets were updated on disk. """
+
+        self.shutdown()
+        # Thread workers share this process' store, which outlives them
+        assets.clear()
+        self.start()
+
+    async def render(self, func: Callable[..., T], *args: Any) -> T:
+        """ Runs a render function in the pool, waiting for a free slot first.
+        :param func: The render function.
+        :param args: The arguments of the render function. """
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            try:
+                future = self._get_executor().submit(func, *args)
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed), so the pool is recreated for the next renders
+                self._executor = None
+                raise
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.running -= 1
+            self.renders += 1
+            self._total_time += elapsed
+            self._max_time = max(self._max_time, elapsed)
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        """ Shuts the pool down, cancelling the pending renders. """
+
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Cancels the renders that haven't started (`cancel_futures` needs Python 3.9)
+            for future in list(self._futures):
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """ Gets the current usage statistics of the renderer. """
+
+        return {
+            'workers': self.workers,
+            'max_concurrency': self.max_concurrency,
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'running': self.running,
+            'renders': self.renders,
+            'failures': self.failures,
+            'avg_time_ms': (self._total_time / self.renders) * 1000 if self.renders else 0,
+            'max_time_ms': self._max_time * 1000,
+        }
+
+
+renderer = ImageRenderer()
@@ -0,0 +1,356 @@
+""" Pure image rendering functions.
+
+They run inside the renderer's worker processes, so they only take
+picklable arguments (plain data and PIL images) and return bytes or images. """
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+from io import BytesIO
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from extra.gif_manager import GIFCompositor
+from extra.imaging.assets import assets
+from extra.imaging.fonts import fonts
+
+
+def image_to_bytes(image: Image.Image, format: str = 'png') -> bytes:
+    """ Encodes an image into bytes.
+    :param image: The image to encode.
+    :param format: The format to encode the image in. [Default = png] """
+
+    with BytesIO() as buffer:
+        image.save(buffer, format=format)
+        return buffer.getvalue()
+
+
+# ===== Profile =====
+
+def render_profile(spec: Dict[str, Any]) -> Tuple[bytes, str]:
+    """ Renders a user's profile card.
+    :param spec: The render spec, made by `SlothCurrency.get_profile_render_spec`.
+    :returns: The encoded image and its file extension (png or gif). """
+
+    small = fonts.get(spec['font_path'], 45)
+    background = assets.get(spec['background']).copy()
+
+    # Pastes the sloth and all equipped item images
+    for layer_path in spec['layers']:
+        layer = assets.get(layer_path)
+        background.paste(layer, (0, 0), layer)
+
+    # Pastes the flag badges that the user has
+    for file_path, position in spec['flag_badges']:
+        if os.path.isfile(file_path):
+            flag_image = assets.get(file_path, (50, 50), 'RGBA')
+            background.paste(flag_image, position, flag_image)
+
+    # Pastes the highest level badge available
+    for file_path, position in spec['level_badges']:
+        if os.path.isfile(file_path):
+            level_badge = assets.get(file_path)
+            background.paste(level_badge, position, level_badge)
+            break
+
+    # Tries to print the user's profile picture
+    if pfp := spec.get('pfp'):
+        try:
+            background.paste(pfp, (201, 2), pfp)
+        except Exception:
+            pass
+
+    draw = ImageDraw.Draw(background)
+    draw.text((310, 5), spec['name'], (255, 255, 255), font=small)
+    draw.text((80, 525), spec['money'], (255, 255, 255), font=small)
+
+    if spec['effects']:
+        return make_gif_image(background.convert('RGBA'), spec['effects']), 'gif'
+
+    return image_to_bytes(background), 'png'
+
+
+def make_gif_image(profile: Image.Image, all_effects: Dict[str, Dict[str, Any]]) -> bytes:
+    """ Makes a gif image out of a profile image.
+    :param profile: The rendered profile image.
+    :param all_effects: All animated effects that the user currently has, with their cords and resize values. """
+
+    # Gets all frames of each effect, resized properly, from the asset store
+    layers = []
+    for effect, values in all_effects.items():
+        frames, (left, top) = assets.effect_layer(effect, values['resize'])
+        layers.append((frames, (values['cords'][0] + left, values['cords'][1] + top)))
+
+    # Loops through the frames based on the amount of frames of the longest effect.
+    gif = GIFCompositor(background=profile, frame_duration=40, layers=layers, max_frames=401)
+
+    with BytesIO() as buffer:
+        gif.export(buffer)
+        return buffer.getvalue()
+
+
+def render_text_card(background_path: str, text: str, position: Tuple[int, int],
+    fill: Tuple[int, int, int], font_path: str, font_size: int) -> bytes:
+    """ Renders a card made of a background image and a text, such as the hacked and frogged cards.
+    :param background_path: The path of the background image.
+    :param text: The text to write.
+    :param position: The position of the text.
+    :param fill: The color of the text.
+    :param font_path: The path of the font.
+    :param font_size: The size of the font. """
+
+    big = fonts.get(font_path, font_size)
+    background = assets.get(background_path, mode='RGBA').copy()
+    draw = ImageDraw.Draw(background)
+    draw.text(position, text, font=big, fill=fill)
+    return image_to_bytes(background)
+
+
+def make_pfp_thumbnail(image_bytes: bytes, thumb_width: int) -> Image.Image:
+    """ Makes a round thumbnail out of a profile picture.
+    :param image_bytes: The encoded profile picture.
+    :param thumb_width: The width of the thumbnail. """
+
+    with BytesIO(image_bytes) as pfp:
+        image = Image.open(pfp)
+        im = image.convert('RGBA')
+
+    def crop_center(pil_img, crop_width, crop_height):
+        img_width, img_height = pil_img.size
+        return pil_img.crop(((img_width - crop_width) // 2,
+                                (img_height - crop_height) // 2,
+                                (img_width + crop_width) // 2,
+                                (img_height + crop_height) // 2))
+
+    def crop_max_square(pil_img):
+        return crop_center(pil_img, min(pil_img.size), min(pil_img.size))
+
+    def mask_circle_transparent(pil_img, blur_radius, offset=0):
+        offset = blur_radius * 2 + offset
+        mask = Image.new("L", pil_img.size, 0)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((offset, offset, pil_img.size[0] - offset, pil_img.size[1] - offset), fill=255)
+
+        result = pil_img.copy()
+        result.putalpha(mask)
+
+        return result
+
+    im_square = crop_max_square(im).resize((thumb_width, thumb_width), Image.LANCZOS)
+    return mask_circle_transparent(im_square, 4)
+
+
+# ===== SmartRoom =====
+
+def overwrite_image(image: Image.Image, text: str, coords: Tuple[int, int], color: Tuple[int, int, int]) -> Image.Image:
+    """ Writes a text on a SmartRoom's image preview.
+    :param image: The image to write on.
+    :param text: The text that's gonna be written.
+    :param coords: The coordinates for the text.
+    :param color: The color of the text. """
+
+    small = fonts.get("./images/smart_vc/uni-sans-regular.ttf", 40)
+    draw = ImageDraw.Draw(image)
+    draw.text(coords, text, color, font=small)
+    return image
+
+
+def overwrite_image_with_image(image: Image.Image, coords: Tuple[int, int], size: str) -> Image.Image:
+    """ Pastes a voice channel image on top of a SmartRoom's image preview.
+    :param image: The image to paste on.
+    :param coords: The coordinates for the image that's gonna be pasted on top of it.
+    :param size: The path of the voice channel size image. """
+
+    size_image = assets.get(size).resize((78, 44), Image.LANCZOS)
+    image.paste(size_image, coords, size_image)
+    return image
+
+
+def render_smartroom_preview(template: str, texts: List[Tuple[str, Tuple[int, int]]],
+    color: Tuple[int, int, int], size_image: Optional[Tuple[str, Tuple[int, int]]] = None) -> bytes:
+    """ Renders a SmartRoom's creation preview.
+    :param template: The path of the preview template.
+    :param texts: The texts to write on the template, with their coordinates.
+    :param color: The color of the texts.
+    :param size_image: The path of the voice channel size image and its coordinates. [Optional] """
+
+    preview = assets.get(template).copy()
+    for text, coords in texts:
+        overwrite_image(preview, text, coords, color)
+
+    if size_image:
+        overwrite_image_with_image(preview, size_image[1], size_image[0])
+
+    return image_to_bytes(preview)
+
+
+# ===== Image manipulation =====
+
+def get_brightness_tables(action: str, percentage: int, r: bool = True, g: bool = True, b: bool = True) -> List[List[int]]:
+    """ Gets the lookup tables that lighten or darken the color channels of an image.
+    :param action: Whether to lighten or darken the image.
+    :param percentage: The percentage to lighten or darken the image.
+    :param r: Whether to change the red channel. [Default = True]
+    :param g: Whether to change the green channel. [Default = True]
+    :param b: Whether to change the blue channel. [Default = True]
+    :returns: A table of 256 values for each of the red, green and blue channels. """
+
+    brightness_multiplier = 1.0
+
+    if action == 'lighten':
+        brightness_multiplier += (percentage/100)
+    else:
+        brightness_multiplier -= (percentage/100)
+
+    table = [min(max(int(value * brightness_multiplier), 0), 255) for value in range(256)]
+    identity = list(range(256))
+    return [table if enabled else identity for enabled in (r, g, b)]
+
+
+def apply_channel_tables(image: Image.Image, tables: List[List[int]]) -> Image.Image:
+    """ Maps the color channels of an image through lookup tables in a single pass, keeping its transparency.
+    :param image: The image to map.
+    :param tables: The lookup tables of the red, green and blue channels. """
+
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    lut = [value for table in tables for value in table]
+    if has_alpha:
+        lut.extend(range(256))
+
+    return image.point(lut)
+
+
+def change_image_brightness(original_image: Image.Image, action: str, percentage: int,
+    r: bool = True, g: bool = True, b: bool = True) -> Image.Image:
+    """ Changes the brightness level of each pixel of the image.
+    :param original_image: The image to execute the task on.
+    :param action: Whether to lighten or darken the image.
+    :param percentage: The percentage to ligthen or darken the image. """
+
+    return apply_channel_tables(original_image, get_brightness_tables(action, percentage, r, g, b))
+
+
+class WaveDeformer:
+    """ Deformer that waves an image. """
+
+    def transform(self, x, y):
+        y = y + 10*math.sin(x/20)
+        return x, y
+
+    def transform_rectangle(self, x0, y0, x1, y1):
+        return (*self.transform(x0, y0),
+                *self.transform(x0, y1),
+                *self.transform(x1, y1),
+                *self.transform(x1, y0),
+                )
+
+    def getmesh(self, img):
+        self.w, self.h = img.size
+        gridspace = 20
+
+        target_grid = []
+        for x in range(0, self.w, gridspace):
+            for y in range(0, self.h, gridspace):
+                target_grid.append((x, y, x + gridspace, y + gridspace))
+
+        source_grid = [self.transform_rectangle(*rect) for rect in target_grid]
+
+        return [t for t in zip(target_grid, source_grid)]
+
+
+def get_font(image: Image.Image, text: str, font_name: Optional[str] = None) -> ImageFont.FreeTypeFont:
+    """ Gets the font sized proportionally to the image size.
+    :param image: The image to proportion the font to.
+    :param text: The base text.
+    :param font_name: The name of the font file. [Optional][Default = built titling sb.ttf] """
+
+    if not font_name:
+        font_name = 'built titling sb.ttf'
+    font_path: str = f'media/fonts/{font_name}'
+
+    # Portion of image width you want text width to be
+    img_fraction = 0.50
+
+    # The biggest size whose text is still narrower than the criteria
+    return fonts.fit(font_path, text, img_fraction*image.size[0])
+
+
+def caption_image(image: Image.Image, text: str) -> Image.Image:
+    """ Puts a caption in the middle of an image.
+    :param image: The image to put the caption on.
+    :param text: The caption text. """
+
+    font = get_font(image, text)
+    W, H = image.size
+    draw = ImageDraw.Draw(image)
+    w, h = draw.textsize(text, font=font)
+    draw.text(((W-w)/2,(H-h)/2), text, fill="white", font=font)
+    return image
+
+
+def filter_image(image: Image.Image, filter_name: str, options: Dict[str, Any]) -> Image.Image:
+    """ Applies a filter to an image.
+    :param image: The image to apply the filter to.
+    :param filter_name: The name of the filter.
+    :param options: The filter's options. """
+
+    if filter_name == 'flip':
+        image = ImageOps.flip(image)
+    elif filter_name == 'mirror':
+        image = ImageOps.mirror(image)
+    elif filter_name == 'rain':
+        image = ImageOps.posterize(image, 2)
+    elif filter_name == 'rotate':
+        image = image.rotate(int(options['scale']))
+    elif filter_name == 'brightness':
+        image = change_image_brightness(image, **options)
+    elif filter_name == 'gray':
+        image = ImageOps.grayscale(image)
+    elif filter_name == 'wave':
+        image = ImageOps.deform(image, WaveDeformer())
+    elif filter_name == 'invert':
+        image = ImageOps.invert(image.convert('RGB'))
+    elif filter_name == 'caption':
+        image = caption_image(image, options['text'])
+    elif filter_name != 'none':
+        raise ValueError(f"Unknown image filter: {filter_name}")
+
+    return image
+
+
+def apply_image_filters(image: Image.Image, filters: List[Tuple[str, Dict[str, Any]]]) -> Tuple[Image.Image, bytes]:
+    """ Applies a chain of filters to an image.
+    :param image: The image to apply the filters to.
+    :param filters: The names and options of the filters, in order.
+    :returns: The new image and its PNG encoding.
+
+    PS: Consecutive brightness filters are composed into a single set of lookup tables,
+    so they're applied in one pass over the image. """
+
+    tables: Optional[List[List[int]]] = None
+    for filter_name, options in filters:
+        if filter_name == 'brightness':
+            new_tables = get_brightness_tables(**options)
+            tables = new_tables if tables is None else [
+                [new_table[value] for value in table] for table, new_table in zip(tables, new_tables)]
+            continue
+
+        if tables is not None:
+            image, tables = apply_channel_tables(image, tables), None
+        image = filter_image(image, filter_name, options)
+
+    if tables is not None:
+        image = apply_channel_tables(image, tables)
+
+    return image, image_to_bytes(image)
+
+
+def apply_image_filter(image: Image.Image, filter_name: str, options: Dict[str, Any]) -> Tuple[Image.Image, bytes]:
+    """ Applies a filter to an image.
+    :param image: The image to apply the filter to.
+    :param filter_name: The name of the filter.
+    :param options: The filter's options.
+    :returns: The new image and its PNG encoding. """
+
+    return apply_image_filters(image, [(filter_name, options)])
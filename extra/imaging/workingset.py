@@ -0,0 +1,108 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+working_image_ttl = int(os.getenv('WORKING_IMAGE_TTL', 600))
+working_image_max_mb = int(os.getenv('WORKING_IMAGE_MAX_MB', 64))
+
+WorkingKey = Tuple[int, int]
+
+
+class WorkingImageStore:
+    """ Store of the images each user is working on in each channel, for chaining image commands.
+
+    Entries expire `ttl` seconds after they were last used, and the least recently used ones
+    are evicted when the decoded images go over the memory cap. Since every use renews an
+    entry, the LRU order is also the expiration order. """
+
+    def __init__(self, ttl: int = working_image_ttl, max_bytes: int = working_image_max_mb * 1024 * 1024) -> None:
+        """ Class init method. """
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size_bytes: int = 0
+        # Either a decoded image or an asset that wasn't downloaded yet, and when it was last used
+        self._entries: 'OrderedDict[WorkingKey, Tuple[Any, float]]' = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, user_id: int, channel_id: int) -> Optional[Any]:
+        """ Gets the image a user is working on in a channel.
+        :param user_id: The ID of the user.
+        :param channel_id: The ID of the channel.
+        :returns: The decoded image or the asset, if there's any. """
+
+        self._expire()
+        key = (user_id, channel_id)
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries[key] = (entry[0], time.monotonic())
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, user_id: int, channel_id: int, image: Any) -> None:
+        """ Sets the image a user is working on in a channel.
+        :param user_id: The ID of the user.
+        :param channel_id: The ID of the channel.
+        :param image: The decoded image, or an asset to download when it's used. """
+
+        key = (user_id, channel_id)
+        if (old := self._entries.pop(key, None)) is not None:
+            self.size_bytes -= self._image_bytes(old[0])
+
+        if (size := self._image_bytes(image)) > self.max_bytes:
+            return
+
+        self._entries[key] = (image, time.monotonic())
+        self.size_bytes += size
+
+        self._expire()
+        while self.size_bytes > self.max_bytes:
+            self._pop_oldest()
+
+    def _expire(self) -> None:
+        """ Drops the entries that weren't used for longer than the TTL. """
+
+        deadline = time.monotonic() - self.ttl
+        while self._entries and next(iter(self._entries.values()))[1] < deadline:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        """ Drops the least recently used entry. """
+
+        _, (image, _) = self._entries.popitem(last=False)
+        self.size_bytes -= self._image_bytes(image)
+
+    def clear(self) -> None:
+        """ Drops all working images. """
+
+        self._entries.clear()
+        self.size_bytes = 0
+
+    @staticmethod
+    def _image_bytes(image: Any) -> int:
+        """ Estimates the memory used by a decoded image; assets don't count. """
+
+        if not isinstance(image, Image.Image):
+            return 0
+        return image.width * image.height * len(image.getbands())
+
+    def stats(self) -> Dict[str, Any]:
+        """ Gets the current usage statistics of the store. """
+
+        return {
+            'entries': len(self._entries),
+            'size_mb': self.size_bytes / (1024 * 1024),
+            'max_mb': self.max_bytes / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+working_images = WorkingImageStore()
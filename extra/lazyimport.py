@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """ Imports a module lazily, so it's only loaded the first time one of its attributes is used.
+    :param name: The name of the module.
+
+    PS: It's meant for heavy libraries that only a few commands use, so they don't slow down the bot's startup. """
+
+    if module := sys.modules.get(name):
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
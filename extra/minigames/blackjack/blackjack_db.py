@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 
@@ -65,14 +65,7 @@ class BlackJackDB(commands.Cog):
     async def check_blackjack_exists(self) -> bool:
         """ Checks whether the Blackjack table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Blackjack'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('Blackjack')
 
     async def insert_user_database(self, user_id) -> None:
         mycursor, db = await the_database()
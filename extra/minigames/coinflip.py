@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class CoinflipMemberTable(commands.Cog):
@@ -72,14 +72,7 @@ class CoinflipMemberTable(commands.Cog):
     async def check_coinflip_member_table_exists(self) -> bool:
         """ Checks whether the CoinflipMember table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'CoinflipMember'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('CoinflipMember')
 
     async def insert_coinflip_member(self, user_id: int, current_ts: int, wins: int = 0, losses: int = 0) -> None:
         """ Inserts a member into the MemoryTable.
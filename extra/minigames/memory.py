@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Tuple
 from extra.customerrors import StillInRehabError
 from extra import utils
@@ -73,14 +73,7 @@ class MemoryTable(commands.Cog):
     async def check_memory_member_table_exists(self) -> bool:
         """ Checks whether the MemoryMember table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'MemoryMember'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('MemoryMember')
 
     async def insert_memory_member(self, user_id: int, level: int, current_ts: int) -> None:
         """ Inserts a member into the MemoryTable.
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Tuple
 from extra.customerrors import StillInRehabError
 from extra import utils
@@ -95,14 +95,7 @@ class RehabMembersTable(commands.Cog):
     async def check_rehab_members_exists(self) -> bool:
         """ Checks whether the RehabMembers table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'RehabMembers'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('RehabMembers')
 
     async def insert_rehab_member(self, user_id: int, rehab_ts: int) -> None:
         """ Inserts a member into the rehab.
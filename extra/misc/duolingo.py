@@ -1,5 +1,5 @@
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 
 class DuolingoProfileTable(commands.Cog):
@@ -74,14 +74,7 @@ class DuolingoProfileTable(commands.Cog):
     async def check_duolingo_profile_exists(self) -> bool:
         """ Checks whether the DuolingoProfile table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'DuolingoProfile'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('DuolingoProfile')
 
     async def insert_duo_profile(self, user_id: int, duo_name: str) -> None:
         """ Inserts a Duolingo Profile.
@@ -1,8 +1,9 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Optional
 from random import choice
+from extra.scheduler import scheduler
 
 class GiveawaysTable(commands.Cog):
     """ Class for managing the Giveaways table in the database. """
@@ -80,14 +81,7 @@ class GiveawaysTable(commands.Cog):
     async def check_giveaways_exists(self) -> bool:
         """ Checks whether the Giveaways table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Giveaways'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('Giveaways')
 
     async def insert_giveaway(
         self, message_id: int, channel_id: int, user_id: int, 
@@ -107,6 +101,7 @@ class GiveawaysTable(commands.Cog):
                 message_id, channel_id, prize, winners, deadline_ts, role_id, user_id))
         await db.commit()
         await mycursor.close()
+        scheduler.schedule('due_giveaways', deadline_ts)
 
     async def get_giveaways(self) -> List[List[Union[str, int]]]:
         """ Gets all active giveaways. """
@@ -147,6 +142,24 @@ class GiveawaysTable(commands.Cog):
         await mycursor.close()
         return giveaways
 
+    async def get_next_giveaway_deadline(self) -> Optional[int]:
+        """ Gets the deadline timestamp of the earliest giveaway that's still running, if any. """
+
+        mycursor, _ = await the_database()
+        await mycursor.execute("SELECT MIN(deadline_ts) FROM Giveaways WHERE notified = 0")
+        deadline = await mycursor.fetchone()
+        await mycursor.close()
+        return deadline[0] if deadline else None
+
+    async def get_next_old_giveaway_deadline(self) -> Optional[int]:
+        """ Gets the timestamp at which the earliest ended giveaway becomes old, if any. """
+
+        mycursor, _ = await the_database()
+        await mycursor.execute("SELECT MIN(deadline_ts) + 172800 FROM Giveaways WHERE notified = 1")
+        deadline = await mycursor.fetchone()
+        await mycursor.close()
+        return deadline[0] if deadline else None
+
     async def update_giveaway(self, message_id: int, notified: Optional[int] = 1) -> None:
         """ Updates the giveaway's notified status.
         :param message_id: The ID of the message of the giveaway.
@@ -156,6 +169,8 @@ class GiveawaysTable(commands.Cog):
         await mycursor.execute("UPDATE Giveaways SET notified = %s WHERE message_id = %s", (notified, message_id))
         await db.commit()
         await mycursor.close()
+        if notified:
+            await scheduler.reload('old_giveaways')
 
     async def update_giveaway_deadline(self, message_id: int, current_ts: int) -> None:
         """ Updates the giveaway's deadline timestamp..
@@ -166,6 +181,7 @@ class GiveawaysTable(commands.Cog):
         await mycursor.execute("UPDATE Giveaways SET deadline_ts = %s WHERE message_id = %s", (current_ts, message_id))
         await db.commit()
         await mycursor.close()
+        await scheduler.reload('old_giveaways')
 
     async def delete_giveaway(self, message_id: int) -> None:
         """ Deletes a giveaway.
@@ -257,14 +273,7 @@ class GiveawayEntriesTable(commands.Cog):
     async def check_giveaway_entries_exists(self) -> bool:
         """ Checks whether the GiveawayEntries table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'GiveawayEntries'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('GiveawayEntries')
 
     async def insert_giveaway_entry(self, user_id: int, message_id: int) -> None:
         """ Inserts an entry for an active giveaway.
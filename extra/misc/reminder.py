@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
-from typing import List, Union
+from mysqldb import the_database, table_exists
+from extra.scheduler import scheduler
+from typing import List, Optional, Union
 
 class MemberReminderTable(commands.Cog):
     """ Class for managing the MemberReminder table in the database. """
@@ -69,15 +70,7 @@ class MemberReminderTable(commands.Cog):
     async def check_table_member_reminder(self) -> bool:
         """ Checks if the MemberReminder table exists """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'MemberReminder'")
-        table_info = await mycursor.fetchone()
-        await mycursor.close()
-
-        if table_info:
-            return True
-        else:
-            return False
+        return await table_exists('MemberReminder')
 
     async def insert_member_reminder(self, user_id: int, text: str, reminder_timestamp: int, remind_in: int) -> None:
         """ Inserts an entry concerning the user's last seen datetime.
@@ -92,6 +85,7 @@ class MemberReminderTable(commands.Cog):
         VALUES (%s, %s, %s, %s)""", (user_id, text, reminder_timestamp, remind_in))
         await db.commit()
         await mycursor.close()
+        scheduler.schedule('reminders', reminder_timestamp + remind_in)
 
     async def get_member_reminders(self, user_id: int) -> List[List[Union[str, int]]]:
         """ Gets the user's reminders.
@@ -123,6 +117,15 @@ class MemberReminderTable(commands.Cog):
         await mycursor.close()
         return reminders
 
+    async def get_next_reminder_deadline(self) -> Optional[int]:
+        """ Gets the timestamp of the earliest pending reminder, if any. """
+
+        mycursor, _ = await the_database()
+        await mycursor.execute("SELECT MIN(reminder_timestamp + remind_in) FROM MemberReminder")
+        deadline = await mycursor.fetchone()
+        await mycursor.close()
+        return deadline[0] if deadline else None
+
     async def delete_member_reminder(self, reminder_id: int) -> None:
         """ Updates the user's last seen datetime.
         :param reminder_id: The ID of the reminder to delete. """
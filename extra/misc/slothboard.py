@@ -1,5 +1,5 @@
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class SlothboardTable(commands.Cog):
@@ -60,14 +60,7 @@ class SlothboardTable(commands.Cog):
     async def table_slothboard_exists(self) -> bool:
         """ Checks whether the Slothboard table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Slothboard'")
-        table_info = await mycursor.fetchone()
-        await mycursor.close()
-        if table_info:
-            return True
-        else:
-            return False
+        return await table_exists('Slothboard')
 
     async def insert_slothboard_message(self, message_id: int, channel_id: int) -> None:
         """ Inserts a Slothboard message.
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Any
 from extra import utils
 
@@ -61,14 +61,7 @@ class AspirantsTable(commands.Cog):
     async def check_aspirant_activity_exists(self) -> bool:
         """ Checks whether the AspirantActivity table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'AspirantActivity'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('AspirantActivity')
 
     async def insert_aspirant(self, user_id: int, old_ts: int) -> None:
         """ Inserts an aspirant to the database.
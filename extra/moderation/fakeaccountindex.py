@@ -0,0 +1,125 @@
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from mysqldb import the_database
+
+Edge = Tuple[int, int]
+
+
+class FakeAccountIndex:
+    """ Disjoint-set index of the FakeAccounts associations.
+
+    Each cluster of linked accounts is a set with its own member and association lists,
+    so getting all the accounts linked to a user costs a `find()` instead of a graph walk in the database. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.loaded: bool = False
+        self._parent: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._edges: Dict[int, Set[Edge]] = {}
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """ Builds the index from the FakeAccounts table. """
+
+        async with self._lock:
+            mycursor, _ = await the_database()
+            try:
+                await mycursor.execute("SELECT user_id, fake_user_id FROM FakeAccounts")
+                edges = await mycursor.fetchall()
+            finally:
+                await mycursor.close()
+
+            self._parent.clear()
+            self._members.clear()
+            self._edges.clear()
+            for user_id, fake_user_id in edges:
+                self.link(user_id, fake_user_id)
+            self.loaded = True
+
+    async def ensure_loaded(self) -> None:
+        """ Builds the index if it wasn't built yet. """
+
+        if not self.loaded:
+            await self.load()
+
+    def find(self, account_id: int) -> Optional[int]:
+        """ Gets the root of an account's cluster, if the account is linked to any other.
+        :param account_id: The ID of the account. """
+
+        if account_id not in self._parent:
+            return None
+
+        root = account_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+
+        # Path compression
+        while self._parent[account_id] != root:
+            self._parent[account_id], account_id = root, self._parent[account_id]
+
+        return root
+
+    def link(self, user_id: int, fake_user_id: int) -> None:
+        """ Adds an association between two accounts, merging their clusters.
+        :param user_id: The ID of the main account.
+        :param fake_user_id: The ID of the fake account. """
+
+        for account_id in (user_id, fake_user_id):
+            if account_id not in self._parent:
+                self._parent[account_id] = account_id
+                self._members[account_id] = {account_id}
+                self._edges[account_id] = set()
+
+        root, other = self.find(user_id), self.find(fake_user_id)
+        if root != other:
+            # Union by size, merging the smaller cluster into the bigger one
+            if len(self._members[root]) < len(self._members[other]):
+                root, other = other, root
+
+            self._parent[other] = root
+            self._members[root] |= self._members.pop(other)
+            self._edges[root] |= self._edges.pop(other)
+
+        self._edges[root].add((user_id, fake_user_id))
+
+    def unlink(self, account_id: int, only_as_fake: bool = False) -> None:
+        """ Removes the associations of an account, splitting its cluster if needed.
+        :param account_id: The ID of the account.
+        :param only_as_fake: Whether to only remove the associations in which it's the fake account. [Default = False] """
+
+        if (root := self.find(account_id)) is None:
+            return
+
+        members = self._members.pop(root)
+        edges = {
+            edge for edge in self._edges.pop(root)
+            if not (edge[1] == account_id or (not only_as_fake and edge[0] == account_id))
+        }
+
+        # Disjoint sets can't be split, so the cluster is rebuilt from its remaining associations
+        for member_id in members:
+            del self._parent[member_id]
+        for user_id, fake_user_id in edges:
+            self.link(user_id, fake_user_id)
+
+    def get_edges(self, account_id: int) -> List[Edge]:
+        """ Gets all associations in an account's cluster.
+        :param account_id: The ID of the account. """
+
+        if (root := self.find(account_id)) is None:
+            return []
+        return list(self._edges[root])
+
+    def get_accounts(self, account_id: int) -> Set[int]:
+        """ Gets all accounts in an account's cluster, except for the account itself.
+        :param account_id: The ID of the account. """
+
+        if (root := self.find(account_id)) is None:
+            return set()
+        return self._members[root] - {account_id}
+
+
+fake_account_index = FakeAccountIndex()
@@ -1,10 +1,11 @@
 
 import discord
 from discord.ext import commands
-from mysqldb import the_database
-from typing import List, Union
+from mysqldb import the_database, table_exists
+from typing import List, Set, Tuple, Union
 from extra import utils
 from extra.prompt.menu import Confirm
+from extra.moderation.fakeaccountindex import fake_account_index
 import os
 
 allowed_roles = [int(os.getenv('OWNER_ROLE_ID', 123)), int(os.getenv('ADMIN_ROLE_ID', 123)), int(os.getenv('MOD_ROLE_ID', 123))]
@@ -150,22 +151,14 @@ class ModerationFakeAccountsTable(commands.Cog):
         await mycursor.execute("DELETE FROM FakeAccounts")
         await db.commit()
         await mycursor.close()
+        await fake_account_index.load()
 
         return await ctx.send("**Table __FakeAccounts__ reset!**", delete_after=3)
 
     async def check_table_fake_accounts_exists(self) -> bool:
         """ Checks if the FakeAccounts table exists """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'FakeAccounts'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('FakeAccounts')
 
     
 
@@ -184,37 +177,19 @@ class ModerationFakeAccountsTable(commands.Cog):
         await mycursor.close()
         return fake_account
 
-    async def get_fake_accounts(self, account_id: int) -> List[List[int]]:
-        """ Gets all fake account associations with a user account.
+    async def get_fake_accounts(self, account_id: int) -> List[Tuple[int, int]]:
+        """ Gets all fake account associations with a user account, direct or not.
         :param account_id: The ID of the account to get the associations from. """
 
-        all_fake_accounts = []
-
-        mycursor, _ = await the_database()
-        sql = "SELECT * FROM FakeAccounts WHERE user_id = %s OR fake_user_id = %s"
-        await mycursor.execute(sql, (account_id, account_id))
-        origin = await mycursor.fetchall()
-        all_fake_accounts.extend(origin)
-
-        for fake_account in all_fake_accounts:
-            accounts = []
-
-            # First combination
-            await mycursor.execute(sql, (fake_account[0], fake_account[0]))
-            first = await mycursor.fetchall()
-            accounts.extend(first)
+        await fake_account_index.ensure_loaded()
+        return fake_account_index.get_edges(account_id)
 
-            # Second combination
-            await mycursor.execute(sql, (fake_account[1], fake_account[1]))
-            second = await mycursor.fetchall()
-            accounts.extend(second)
+    async def get_alt_ids(self, account_id: int) -> Set[int]:
+        """ Gets the IDs of all accounts associated with a user account, direct or not.
+        :param account_id: The ID of the account to get the associated accounts from. """
 
-            for account in list(set(accounts)):
-                if account not in all_fake_accounts:
-                    all_fake_accounts.append(account)
-
-        await mycursor.close()
-        return list(set(all_fake_accounts))
+        await fake_account_index.ensure_loaded()
+        return fake_account_index.get_accounts(account_id)
 
     
     async def insert_fake_account(self, user_id: int, fake_account_id: int) -> None:
@@ -226,6 +201,7 @@ class ModerationFakeAccountsTable(commands.Cog):
         await mycursor.execute("INSERT INTO FakeAccounts (user_id, fake_user_id) VALUES (%s, %s)", (user_id, fake_account_id))
         await db.commit()
         await mycursor.close()
+        fake_account_index.link(user_id, fake_account_id)
 
     async def delete_fake_account(self, fake_account_id: int) -> None:
         """ Deletes associations with a fake account.
@@ -235,6 +211,7 @@ class ModerationFakeAccountsTable(commands.Cog):
         await mycursor.execute("DELETE FROM FakeAccounts WHERE fake_user_id = %s", (fake_account_id,))
         await db.commit()
         await mycursor.close()
+        fake_account_index.unlink(fake_account_id, only_as_fake=True)
 
     async def delete_fake_accounts(self, user_id: int) -> None:
         """ Deletes associations with all fake accounts.
@@ -244,3 +221,4 @@ class ModerationFakeAccountsTable(commands.Cog):
         await mycursor.execute("DELETE FROM FakeAccounts WHERE user_id = %s OR fake_user_id = %s", (user_id, user_id))
         await db.commit()
         await mycursor.close()
+        fake_account_index.unlink(user_id)
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class BypassFirewallTable(commands.Cog):
@@ -68,16 +68,7 @@ class BypassFirewallTable(commands.Cog):
     async def check_table_bypass_firewall_exists(self) -> bool:
         """ Checks if the BypassFirewall table exists """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'BypassFirewall'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('BypassFirewall')
 
     # ===== INSERT =====
     async def insert_bypass_firewall_user(self, user_id: int) -> None:
@@ -179,16 +170,7 @@ class ModerationFirewallTable(commands.Cog):
     async def check_table_firewall_exists(self) -> bool:
         """ Checks if the Firewall table exists """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Firewall'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('Firewall')
 
     async def set_firewall_state(self, state: int) -> None:
         """ Sets the firewall state to either true or false. 
@@ -0,0 +1,158 @@
+import importlib
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from extra import useful_variables
+
+# Substrings that make a message an invite to a server
+invite_roots: Tuple[str, ...] = ('discord.gg/', 'discord.com/invite/')
+
+
+class AhoCorasick:
+    """ Automaton that finds all occurrences of a set of patterns in a text in a single pass. """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """ Class init method.
+        :param patterns: The patterns to look for. """
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        """ Adds a pattern to the trie. """
+
+        state = 0
+        for char in pattern:
+            if (next_state := self._goto[state].get(char)) is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern)
+
+    def _build(self) -> None:
+        """ Links every state to the longest proper suffix of it that's also in the trie. """
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """ Finds all occurrences of the patterns in a text.
+        :param text: The text to search in.
+        :returns: The start index and the pattern of each occurrence. """
+
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._output[state]:
+                yield i - len(pattern) + 1, pattern
+
+
+class LinkScanResult(NamedTuple):
+    """ What the link scanner found in a message. """
+
+    banned_link: Optional[str] = None
+    invite_root: Optional[str] = None
+    invite_index: int = -1
+
+
+def normalize_link(link: str) -> str:
+    """ Normalizes a link for comparison, dropping its scheme, `www.`, query string and fragment.
+    :param link: The link to normalize. """
+
+    link = link.strip().strip('<>').lower()
+    link = link.split('#', 1)[0].split('?', 1)[0]
+    for prefix in ('https://', 'http://', 'www.'):
+        if link.startswith(prefix):
+            link = link[len(prefix):]
+    return link.rstrip('/')
+
+
+class LinkScanner:
+    """ Compiled matcher of banned links and server invites.
+
+    Attachments are looked up in a set of normalized links, and a message's content is scanned
+    once by an Aho-Corasick automaton built from the banned links and the invite roots. """
+
+    def __init__(self, banned_links: Iterable[str] = ()) -> None:
+        """ Class init method.
+        :param banned_links: The banned links. [Optional] """
+
+        self.banned_links: Set[str] = set()
+        self._automaton = AhoCorasick(invite_roots)
+        self.load(banned_links)
+
+    def load(self, banned_links: Iterable[str]) -> None:
+        """ (Re)builds the matcher from a list of banned links.
+        :param banned_links: The banned links. """
+
+        normalized = {link for link in map(normalize_link, banned_links) if link}
+        self._automaton = AhoCorasick([*normalized, *invite_roots])
+        self.banned_links = normalized
+
+    @staticmethod
+    def _is_whole_link(text: str, start: int, end: int) -> bool:
+        """ Checks whether a match is a whole link, not part of a longer one, e.g. `evil-example.com/x` for `example.com/x`.
+        It must start a word or come right after a scheme, subdomain or path (`/` or `.`),
+        and it can't be followed by more of a name.
+        :param text: The text the match was found in.
+        :param start: The start index of the match.
+        :param end: The end index of the match. """
+
+        if start > 0 and not (text[start - 1].isspace() or text[start - 1] in '/.<'):
+            return False
+        return end == len(text) or not (text[end].isalnum() or text[end] in '-_')
+
+    def scan(self, content: str, attachment_urls: Iterable[str] = ()) -> Optional[LinkScanResult]:
+        """ Scans a message for banned links and invites.
+        :param content: The message's content.
+        :param attachment_urls: The URLs of the message's attachments to check. [Optional]
+        :returns: What was found, or None if the message is clean. """
+
+        banned_link = next((url for url in attachment_urls if normalize_link(url) in self.banned_links), None)
+        invite_root, invite_index = None, -1
+
+        text = content.lower()
+        for start, pattern in self._automaton.finditer(text):
+            if pattern in invite_roots:
+                if invite_root is None:
+                    invite_root, invite_index = pattern, start
+            elif banned_link is None and self._is_whole_link(text, start, start + len(pattern)):
+                banned_link = pattern
+
+            if banned_link and invite_root:
+                break
+
+        if banned_link is None and invite_root is None:
+            return None
+
+        return LinkScanResult(banned_link, invite_root, invite_index)
+
+
+link_scanner = LinkScanner(useful_variables.banned_links)
+
+
+def reload_link_scanner() -> int:
+    """ Reloads the banned links from `extra.useful_variables` and rebuilds the scanner.
+    :returns: The amount of banned links. """
+
+    importlib.reload(useful_variables)
+    link_scanner.load(useful_variables.banned_links)
+    return len(link_scanner.banned_links)
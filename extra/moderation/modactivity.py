@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 
 from typing import Optional, List
 from extra import utils
@@ -70,14 +70,7 @@ class ModActivityTable(commands.Cog):
     async def check_mod_activity_table_exists(self) -> bool:
         """ Checks whether the ModActivity table exists in the database. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'ModActivity'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('ModActivity')
     
     async def insert_moderator(self, mod_id: int, old_ts: Optional[int] = None, messages: Optional[int] = 0) -> None:
         """ Inserts a moderator.
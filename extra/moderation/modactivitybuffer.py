@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from discord.ext import tasks
+from mysqldb import the_database
+
+mod_activity_flush_interval = int(os.getenv('MOD_ACTIVITY_FLUSH_INTERVAL', 60))
+
+
+class ModActivityBuffer:
+    """ In-memory staging of the moderators' activity for the ModActivity table.
+
+    Message counts and voice sessions are kept in memory, and a checkpoint every
+    `mod_activity_flush_interval` seconds writes the pending counts, together with the time
+    the open sessions have run so far, in a single statement. A crash loses one interval at most. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.messages: Dict[int, int] = {}
+        self.time: Dict[int, int] = {}
+        # The timestamps from which the open voice sessions haven't been counted yet
+        self.sessions: Dict[int, int] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    def start(self) -> None:
+        """ Starts the periodic checkpoint loop. """
+
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def stop(self) -> None:
+        """ Stops the periodic checkpoint loop and flushes what's pending. """
+
+        self.flush_loop.cancel()
+        await self.flush()
+
+    @tasks.loop(seconds=mod_activity_flush_interval)
+    async def flush_loop(self) -> None:
+        """ Checkpoints the moderators' activity periodically. """
+
+        await self.flush()
+
+    # ===== ACCUMULATE =====
+
+    def add_message(self, mod_id: int) -> None:
+        """ Counts a message of a moderator.
+        :param mod_id: The ID of the moderator. """
+
+        self.messages[mod_id] = self.messages.get(mod_id, 0) + 1
+
+    def join_voice(self, mod_id: int, current_ts: Optional[int] = None) -> None:
+        """ Starts a moderator's voice session.
+        :param mod_id: The ID of the moderator.
+        :param current_ts: The current timestamp. [Optional] """
+
+        self.sessions[mod_id] = int(current_ts or time.time())
+
+    def leave_voice(self, mod_id: int, current_ts: Optional[int] = None) -> None:
+        """ Ends a moderator's voice session, counting its time.
+        :param mod_id: The ID of the moderator.
+        :param current_ts: The current timestamp. [Optional] """
+
+        if (started_at := self.sessions.pop(mod_id, None)) is None:
+            return
+
+        self.time[mod_id] = self.time.get(mod_id, 0) + max(int(current_ts or time.time()) - started_at, 0)
+
+    def reset(self) -> None:
+        """ Drops the pending counts and restarts the open sessions from now, e.g. after the table was reset. """
+
+        current_ts = int(time.time())
+        self.messages.clear()
+        self.time.clear()
+        self.sessions = {mod_id: current_ts for mod_id in self.sessions}
+
+    # ===== FLUSH =====
+
+    async def flush(self) -> None:
+        """ Writes the pending counts and the time of the open sessions into the database. """
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            current_ts = int(time.time())
+
+            # Counts the open sessions up to now
+            for mod_id, started_at in self.sessions.items():
+                self.time[mod_id] = self.time.get(mod_id, 0) + max(current_ts - started_at, 0)
+                self.sessions[mod_id] = current_ts
+
+            messages, self.messages = self.messages, {}
+            mod_time, self.time = self.time, {}
+            if not messages and not mod_time:
+                return
+
+            rows = [
+                (mod_id, mod_time.get(mod_id, 0), current_ts if mod_id in self.sessions else None, messages.get(mod_id, 0))
+                for mod_id in messages.keys() | mod_time.keys()
+            ]
+            try:
+                await self._write(rows)
+            except Exception as e:
+                print('ModActivityBuffer flush error', e)
+                # Puts the counts back, so they're retried on the next checkpoint
+                for mod_id, amount in messages.items():
+                    self.messages[mod_id] = self.messages.get(mod_id, 0) + amount
+                for mod_id, amount in mod_time.items():
+                    self.time[mod_id] = self.time.get(mod_id, 0) + amount
+
+    async def _write(self, rows: List[Tuple[int, int, Optional[int], int]]) -> None:
+        """ Upserts the given increments with a single statement.
+        :param rows: The (mod ID, time, session timestamp, messages) increments. """
+
+        mycursor, db = await the_database()
+        try:
+            await mycursor.executemany("""
+                INSERT INTO ModActivity (mod_id, time, timestamp, messages) VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    time = time + VALUES(time),
+                    timestamp = COALESCE(VALUES(timestamp), timestamp),
+                    messages = messages + VALUES(messages)
+                """, rows)
+            await db.commit()
+        finally:
+            await mycursor.close()
+
+
+mod_activity_buffer = ModActivityBuffer()
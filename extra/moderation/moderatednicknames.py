@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 
 
@@ -68,14 +68,7 @@ class ModeratedNicknamesTable(commands.Cog):
     async def check_moderated_nicknames_table_exists(self) -> bool:
         """ Checks whether the ModeratedNicknames table exists in the database. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'ModeratedNicknames'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('ModeratedNicknames')
 
     async def insert_moderated_nickname(self, user_id: int, nickname: str) -> None:
         """ Inserts a user into the ModeratedNicknames table.
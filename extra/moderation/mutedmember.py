@@ -1,8 +1,9 @@
 from datetime import time
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Optional, Tuple
+from extra.scheduler import scheduler
 
 class ModerationMutedMemberTable(commands.Cog):
     
@@ -66,16 +67,7 @@ class ModerationMutedMemberTable(commands.Cog):
         '''
         Checks if the MutedMember table exists
         '''
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'mutedmember'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('mutedmember')
 
     async def get_expired_tempmutes(self, current_ts: int) -> List[int]:
         """ Gets expired tempmutes.
@@ -87,6 +79,15 @@ class ModerationMutedMemberTable(commands.Cog):
         await mycursor.close()
         return tempmutes
 
+    async def get_next_tempmute_deadline(self) -> Optional[int]:
+        """ Gets the timestamp at which the earliest tempmute expires, if any. """
+
+        mycursor, _ = await the_database()
+        await mycursor.execute("SELECT MIN(mute_ts + muted_for_seconds) FROM mutedmember WHERE muted_for_seconds IS NOT NULL")
+        deadline = await mycursor.fetchone()
+        await mycursor.close()
+        return deadline[0] if deadline else None
+
     async def get_muted_members(self, current_ts: int, days_ago: Optional[int] = 0) -> List[int]:
         """ Gets muted members from the past X days.
         :param current_ts: The current timestamp.
@@ -109,6 +110,9 @@ class ModerationMutedMemberTable(commands.Cog):
             )
         await db.commit()
         await mycursor.close()
+        for _, _, mute_ts, muted_for_seconds in user_role_ids:
+            if muted_for_seconds is not None:
+                scheduler.schedule('tempmutes', mute_ts + muted_for_seconds)
 
     async def get_muted_roles(self, user_id: int):
         mycursor, db = await the_database()
@@ -137,6 +141,7 @@ class ModerationMutedMemberTable(commands.Cog):
         await mycursor.execute("UPDATE mutedmember SET mute_ts = %s, muted_for_seconds = %s WHERE user_id = %s", (current_time, time, user_id))
         await db.commit()
         await mycursor.close()
+        scheduler.schedule('tempmutes', current_time + time)
 
     async def get_mute_time(self, user_id: int):
         mycursor, db = await the_database()
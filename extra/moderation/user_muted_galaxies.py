@@ -1,7 +1,7 @@
 from datetime import time
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Optional, Tuple
 
 class UserMutedGalaxiesTable(commands.Cog):
@@ -71,15 +71,7 @@ class UserMutedGalaxiesTable(commands.Cog):
     async def check_table_user_muted_galaxies_exists(self) -> bool:
         """ Checks whether the UserMutedGalaxies table exists """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserMutedGalaxies'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('UserMutedGalaxies')
 
     async def insert_user_muted_galaxies(self, muted_galaxies: List[Tuple[int, int]]) -> None:
         """ Inserts rows for a user in the UserMutedGalaxies table.
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 
 class ModerationUserInfractionsTable(commands.Cog):
@@ -66,16 +66,7 @@ class ModerationUserInfractionsTable(commands.Cog):
     async def check_table_user_infractions(self) -> bool:
         """ Checks if the UserInfractions table exists """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserInfractions'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('UserInfractions')
 
 
     async def insert_user_infraction(self, user_id: int, infr_type: str, reason: str, timestamp: int, perpetrator: int) -> None:
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 import os
 from extra import utils
@@ -240,16 +240,7 @@ class ModerationWatchlistTable(commands.Cog):
     async def check_table_watchlist_exists(self) -> bool:
         """ Checks if the Watchlist table exists """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Watchlist'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-
-        else:
-            return True
+        return await table_exists('Watchlist')
 
 
     async def get_user_watchlist(self, user_id: int) -> List[int]:
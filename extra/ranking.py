@@ -0,0 +1,283 @@
+import asyncio
+import os
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from discord.ext import tasks
+from mysqldb import the_database
+
+leaderboard_snapshot_interval = int(os.getenv('LEADERBOARD_SNAPSHOT_INTERVAL', 300))
+
+Row = Tuple[Any, ...]
+
+
+class RankIndex:
+    """ Order-statistics index of a leaderboard metric.
+
+    Users are kept in an array sorted by (-score, user_id), so the top N
+    and the position of a user are both found by bisection. """
+
+    def __init__(self, name: str, query: str, score_index: int) -> None:
+        """ Class init method.
+        :param name: The name of the metric.
+        :param query: The query that loads all rows of the metric.
+        :param score_index: The index of the score column in the rows. """
+
+        self.name = name
+        self.query = query
+        self.score_index = score_index
+        self.loaded: bool = False
+        self.built_at: float = 0
+        self._keys: List[Tuple[int, int]] = []
+        self._rows: Dict[int, Row] = {}
+
+    def load(self, rows: List[Row]) -> None:
+        """ Replaces the index's content with the given rows.
+        :param rows: All rows of the metric, the user ID being the first column. """
+
+        self._rows = {row[0]: tuple(row) for row in rows}
+        self._keys = sorted((-(row[self.score_index] or 0), user_id) for user_id, row in self._rows.items())
+        self.loaded = True
+        self.built_at = time.time()
+
+    def update(self, row: Row) -> None:
+        """ Inserts or replaces a user's row.
+        :param row: The user's row, the user ID being the first column. """
+
+        user_id = row[0]
+        self.remove(user_id)
+        self._rows[user_id] = tuple(row)
+        insort(self._keys, (-(row[self.score_index] or 0), user_id))
+
+    def increment(self, user_id: int, amount: int) -> None:
+        """ Increments a user's score, if the user is in the index.
+        :param user_id: The ID of the user.
+        :param amount: The increment to apply. (It can be negative) """
+
+        if (row := self._rows.get(user_id)) is None:
+            return
+
+        row = list(row)
+        row[self.score_index] = (row[self.score_index] or 0) + amount
+        self.update(tuple(row))
+
+    def set_score(self, user_id: int, score: int) -> None:
+        """ Sets a user's score, if the user is in the index.
+        :param user_id: The ID of the user.
+        :param score: The new score. """
+
+        if (row := self._rows.get(user_id)) is None:
+            return
+
+        row = list(row)
+        row[self.score_index] = score
+        self.update(tuple(row))
+
+    def remove(self, user_id: int) -> None:
+        """ Removes a user from the index.
+        :param user_id: The ID of the user. """
+
+        if (row := self._rows.pop(user_id, None)) is None:
+            return
+
+        key = (-(row[self.score_index] or 0), user_id)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, Any]]:
+        """ Gets a user's position and score.
+        :param user_id: The ID of the user. """
+
+        if (row := self._rows.get(user_id)) is None:
+            return None
+
+        score = row[self.score_index] or 0
+        return bisect_left(self._keys, (-score, user_id)) + 1, row[self.score_index]
+
+    def top(self, amount: int = 10) -> List[Row]:
+        """ Gets the rows of the top users.
+        :param amount: The amount of users. [Default = 10] """
+
+        return [self._rows[user_id] for _, user_id in self._keys[:amount]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class LeaderboardSnapshot:
+    """ Materialized rows of a leaderboard that isn't ranked by user, such as the tribes'. """
+
+    def __init__(self, name: str, query: str) -> None:
+        """ Class init method.
+        :param name: The name of the leaderboard.
+        :param query: The query that loads the leaderboard's rows, already ordered. """
+
+        self.name = name
+        self.query = query
+        self.loaded: bool = False
+        self.built_at: float = 0
+        self._rows: List[Row] = []
+
+    def load(self, rows: List[Row]) -> None:
+        """ Replaces the snapshot's rows. """
+
+        self._rows = [tuple(row) for row in rows]
+        self.loaded = True
+        self.built_at = time.time()
+
+    def top(self, amount: int = 10) -> List[Row]:
+        """ Gets the first rows of the leaderboard.
+        :param amount: The amount of rows. [Default = 10] """
+
+        return self._rows[:amount]
+
+
+class RankingService:
+    """ Serves all leaderboards from in-memory snapshots, without touching the database.
+
+    Every leaderboard is materialized every `leaderboard_snapshot_interval` seconds;
+    between rebuilds, the rank indexes are kept up to date from the write paths. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.indexes: Dict[str, RankIndex] = {}
+        self.snapshots: Dict[str, LeaderboardSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def register(self, name: str, query: str, score_index: int) -> RankIndex:
+        """ Registers a leaderboard metric.
+        :param name: The name of the metric.
+        :param query: The query that loads all rows of the metric.
+        :param score_index: The index of the score column in the rows. """
+
+        self.indexes[name] = RankIndex(name, query, score_index)
+        return self.indexes[name]
+
+    def register_snapshot(self, name: str, query: str) -> LeaderboardSnapshot:
+        """ Registers a leaderboard that isn't ranked by user.
+        :param name: The name of the leaderboard.
+        :param query: The query that loads the leaderboard's rows, already ordered. """
+
+        self.snapshots[name] = LeaderboardSnapshot(name, query)
+        return self.snapshots[name]
+
+    def _get(self, name: str) -> Union[RankIndex, LeaderboardSnapshot]:
+        """ Gets a leaderboard by its name. """
+
+        return self.indexes[name] if name in self.indexes else self.snapshots[name]
+
+    def start(self) -> None:
+        """ Starts the periodic refresh loop. """
+
+        if not self.refresh_loop.is_running():
+            self.refresh_loop.start()
+
+    @tasks.loop(seconds=leaderboard_snapshot_interval)
+    async def refresh_loop(self) -> None:
+        """ Rebuilds all leaderboards periodically. """
+
+        await self.rebuild()
+
+    async def rebuild(self) -> None:
+        """ Rebuilds all leaderboards from the database. """
+
+        for name in [*self.indexes, *self.snapshots]:
+            await self.refresh(name)
+
+    async def refresh(self, name: str) -> Union[RankIndex, LeaderboardSnapshot]:
+        """ Reloads a leaderboard from the database.
+        :param name: The name of the leaderboard. """
+
+        index = self._get(name)
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            mycursor, _ = await the_database()
+            try:
+                await mycursor.execute(index.query)
+                index.load(await mycursor.fetchall())
+            except Exception as e:
+                print('RankingService refresh error', name, e)
+            finally:
+                await mycursor.close()
+
+        return index
+
+    async def get_index(self, name: str) -> Union[RankIndex, LeaderboardSnapshot]:
+        """ Gets a leaderboard, loading it if it wasn't loaded yet.
+        :param name: The name of the leaderboard. """
+
+        index = self._get(name)
+        if not index.loaded:
+            await self.refresh(name)
+        return index
+
+    async def top(self, name: str, amount: int = 10) -> List[Row]:
+        """ Gets the top rows of a leaderboard.
+        :param name: The name of the leaderboard.
+        :param amount: The amount of rows. [Default = 10] """
+
+        return (await self.get_index(name)).top(amount)
+
+    async def rank(self, name: str, user_id: int) -> Optional[Tuple[int, Any]]:
+        """ Gets a user's position and score in a leaderboard.
+        :param name: The name of the metric.
+        :param user_id: The ID of the user. """
+
+        return (await self.get_index(name)).rank(user_id)
+
+    def age(self, name: str) -> int:
+        """ Gets how many seconds ago a leaderboard was last rebuilt.
+        :param name: The name of the leaderboard. """
+
+        index = self._get(name)
+        return int(time.time() - index.built_at) if index.loaded else 0
+
+    # ===== WRITE PATH =====
+
+    def update(self, name: str, row: Row) -> None:
+        """ Inserts or replaces a user's row, if the index is loaded. """
+
+        if (index := self.indexes[name]).loaded:
+            index.update(row)
+
+    def increment(self, name: str, user_id: int, amount: int) -> None:
+        """ Increments a user's score, if the index is loaded. """
+
+        if (index := self.indexes[name]).loaded:
+            index.increment(user_id, amount)
+
+    def set_score(self, name: str, user_id: int, score: int) -> None:
+        """ Sets a user's score, if the index is loaded. """
+
+        if (index := self.indexes[name]).loaded:
+            index.set_score(user_id, score)
+
+    def remove(self, name: str, user_id: int) -> None:
+        """ Removes a user from an index, if it's loaded. """
+
+        if (index := self.indexes[name]).loaded:
+            index.remove(user_id)
+
+
+ranking = RankingService()
+ranking.register('score', "SELECT * FROM MembersScore", 4)
+ranking.register('xp', "SELECT * FROM MembersScore", 1)
+ranking.register('leaves', "SELECT * FROM UserCurrency", 1)
+ranking.register('time', "SELECT * FROM UserServerActivity", 2)
+ranking.register('items', "SELECT user_id, COUNT(*) FROM UserItems GROUP BY user_id", 1)
+ranking.register('memory', "SELECT * FROM MemoryMember", 1)
+ranking.register('blackjack', "SELECT * FROM Blackjack", 1)
+ranking.register('coinflip', "SELECT * FROM CoinflipMember", 1)
+ranking.register_snapshot('tribe_leaves', """
+    SELECT SP.tribe, SUM(UC.user_money) AS tm
+    FROM UserCurrency AS UC
+    INNER JOIN
+        SlothProfile AS SP
+    ON UC.user_id = SP.user_id
+    GROUP BY tribe
+    ORDER BY tm DESC
+    LIMIT 10""")
+ranking.register_snapshot('galaxy_expiration', "SELECT user_id, user_ts FROM GalaxyVc ORDER BY user_ts ASC")
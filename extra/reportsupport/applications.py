@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import Any, List, Dict, Union
 from extra import utils
 import os
@@ -241,12 +241,4 @@ class ApplicationsTable(commands.Cog):
     async def table_applications_exists(self) -> bool:
         """ Checks whether the Applications table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Applications'")
-        exists = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(exists):
-            return True
-        else:
-            return False
+        return await table_exists('Applications')
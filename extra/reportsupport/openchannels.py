@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class OpenChannels(commands.Cog):
@@ -66,14 +66,7 @@ class OpenChannels(commands.Cog):
     async def table_case_counter_exists(self) -> bool:
         """ Checks whether the CaseCounter table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'CaseCounter'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('CaseCounter')
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -123,15 +116,7 @@ class OpenChannels(commands.Cog):
     async def table_open_channels_exists(self) -> bool:
         """ Checks whether the OpenChannels table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute(f"SHOW TABLE STATUS LIKE 'OpenChannels'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('OpenChannels')
 
     async def get_case_number(self) -> List[int]:
         """ Gets the current case counting number. """
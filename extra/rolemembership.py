@@ -0,0 +1,87 @@
+import os
+from typing import Dict, Iterable, Set
+
+import discord
+
+from extra.useful_variables import patreon_roles
+
+# Roles whose members are indexed, since they're checked on hot paths (messages, voice states, commands),
+# and the patreon roles, whose new members get a welcome message
+tracked_role_ids: Set[int] = {
+    int(os.getenv(name, 123)) for name in (
+        'OWNER_ROLE_ID', 'ADMIN_ROLE_ID', 'MOD_ROLE_ID', 'SENIOR_MOD_ROLE_ID', 'BOOSTER_ROLE_ID',
+        'TEACHER_ROLE_ID', 'SLOTH_LOVERS_ROLE_ID',
+    )
+} | set(patreon_roles.keys())
+
+
+class RoleMembershipIndex:
+    """ Index of the tracked roles to the IDs of the members who have them.
+
+    It's built from the guild's member cache when the bot gets ready, and kept up to date
+    from the member events, so checking whether a member has a tracked role is a set lookup. """
+
+    def __init__(self, role_ids: Iterable[int] = tracked_role_ids) -> None:
+        """ Class init method.
+        :param role_ids: The IDs of the roles to index. """
+
+        self.role_ids: Set[int] = set(role_ids)
+        self._members: Dict[int, Set[int]] = {}
+
+    def build(self, guild: discord.Guild) -> None:
+        """ Builds the index from the guild's members.
+        :param guild: The guild to index. """
+
+        members: Dict[int, Set[int]] = {}
+        for role_id in self.role_ids:
+            if role := guild.get_role(role_id):
+                members[role_id] = {member.id for member in role.members}
+        self._members = members
+
+    def update_member(self, before: discord.Member, after: discord.Member) -> Set[int]:
+        """ Updates a member's tracked roles.
+        :param before: The member before the update.
+        :param after: The member after the update.
+        :returns: The IDs of the tracked roles the member just got. """
+
+        before_ids = {role.id for role in before.roles} & self.role_ids
+        after_ids = {role.id for role in after.roles} & self.role_ids
+
+        for role_id in before_ids - after_ids:
+            if (holders := self._members.get(role_id)) is not None:
+                holders.discard(after.id)
+
+        added = after_ids - before_ids
+        for role_id in added:
+            if (holders := self._members.get(role_id)) is not None:
+                holders.add(after.id)
+
+        return added
+
+    def remove_member(self, member: discord.Member) -> None:
+        """ Removes a member who left the guild from the index.
+        :param member: The member who left. """
+
+        for holders in self._members.values():
+            holders.discard(member.id)
+
+    def has_role(self, member: discord.abc.User, role_id: int) -> bool:
+        """ Checks whether a member has a role.
+        :param member: The member to check.
+        :param role_id: The ID of the role. """
+
+        if (holders := self._members.get(role_id)) is not None:
+            return member.id in holders
+
+        # Untracked roles, or the index isn't built yet
+        return isinstance(member, discord.Member) and member.get_role(role_id) is not None
+
+    def has_any_role(self, member: discord.abc.User, role_ids: Iterable[int]) -> bool:
+        """ Checks whether a member has any of the given roles.
+        :param member: The member to check.
+        :param role_ids: The IDs of the roles. """
+
+        return any(self.has_role(member, role_id) for role_id in role_ids)
+
+
+role_index = RoleMembershipIndex()
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 
 
@@ -75,14 +75,7 @@ class RoleSelectionDatabaseCommands(commands.Cog):
     async def check_table_selection_menu_exists(self) -> bool:
         """ Checks whether the SelectionMenu table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'SelectionMenu'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('SelectionMenu')
 
     # ===== Database Methods =====
     @staticmethod
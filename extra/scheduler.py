@@ -0,0 +1,150 @@
+import asyncio
+import heapq
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+scheduler_resync_interval = int(os.getenv('SCHEDULER_RESYNC_INTERVAL', 3600))
+scheduler_retry_interval = int(os.getenv('SCHEDULER_RETRY_INTERVAL', 60))
+
+Sweep = Callable[[], Awaitable[None]]
+NextDeadline = Callable[[], Awaitable[Optional[float]]]
+
+
+class DeadlineScheduler:
+    """ Runs the bot's time-based jobs from a single task that sleeps until the next deadline.
+
+    Each job has a sweep, which handles everything that's due, and a loader, which gets
+    the job's earliest pending deadline (a timestamp) from the database. Code that creates
+    something with a deadline calls `schedule()`, so the job is woken up right on time. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self._jobs: Dict[str, Tuple[Sweep, NextDeadline]] = {}
+        # The earliest deadline of each job; heap entries that don't match it are stale
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._synced_at: float = 0
+
+    async def register(self, name: str, sweep: Sweep, next_deadline: NextDeadline) -> None:
+        """ Registers a job and schedules its first deadline.
+        :param name: The name of the job.
+        :param sweep: The coroutine function that handles everything that's due.
+        :param next_deadline: The coroutine function that gets the job's earliest pending deadline, if any. """
+
+        self._jobs[name] = (sweep, next_deadline)
+        self.start()
+        await self._load(name)
+
+    def schedule(self, name: str, when: float) -> None:
+        """ Tells the scheduler that a job has something due at the given time.
+        :param name: The name of the job.
+        :param when: The timestamp of the deadline.
+
+        PS: Deadlines of jobs that aren't registered yet are picked up by their loader when they are. """
+
+        if name not in self._jobs:
+            return
+
+        if (current := self._deadlines.get(name)) is not None and current <= when:
+            return
+
+        self._deadlines[name] = when
+        heapq.heappush(self._heap, (when, name))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """ Starts the scheduler's task. """
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._synced_at = time.time()
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """ Stops the scheduler's task. """
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        """ Sleeps until the next deadline, then runs the sweeps of the jobs that are due. """
+
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+
+            due: List[str] = []
+            while self._heap and self._heap[0][0] <= now:
+                when, name = heapq.heappop(self._heap)
+                if self._deadlines.get(name) == when:
+                    del self._deadlines[name]
+                    due.append(name)
+
+            if due:
+                await asyncio.gather(*(self._fire(name) for name in due))
+                continue
+
+            # Reloads all deadlines once in a while, in case something was created outside the bot
+            if now - self._synced_at >= scheduler_resync_interval:
+                self._synced_at = now
+                await asyncio.gather(*(self._load(name) for name in self._jobs))
+                continue
+
+            timeout = self._synced_at + scheduler_resync_interval - now
+            if self._heap:
+                timeout = min(timeout, self._heap[0][0] - now)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, name: str) -> None:
+        """ Runs a job's sweep and schedules its next deadline.
+        :param name: The name of the job. """
+
+        sweep, _ = self._jobs[name]
+        try:
+            await sweep()
+        except Exception as e:
+            print('DeadlineScheduler sweep error', name, e)
+
+        await self._load(name, after_sweep=True)
+
+    async def reload(self, name: str) -> None:
+        """ Reloads a job's earliest pending deadline, e.g. after a deadline was moved.
+        :param name: The name of the job. """
+
+        if name in self._jobs:
+            await self._load(name)
+
+    async def _load(self, name: str, after_sweep: bool = False) -> None:
+        """ Loads a job's earliest pending deadline from the database and schedules it.
+        :param name: The name of the job.
+        :param after_sweep: Whether the job's sweep has just run. [Default = False] """
+
+        _, next_deadline = self._jobs[name]
+        try:
+            when = await next_deadline()
+        except Exception as e:
+            print('DeadlineScheduler load error', name, e)
+            when = time.time() + scheduler_retry_interval
+
+        if when is None:
+            return
+
+        when = float(when)
+        # Whatever is still due right after a sweep (e.g. it failed) is retried a bit later, not right away
+        if after_sweep and when <= time.time():
+            when = time.time() + scheduler_retry_interval
+
+        self.schedule(name, when)
+
+
+scheduler = DeadlineScheduler()
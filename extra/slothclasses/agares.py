@@ -5,7 +5,7 @@ from .player import Player, Skill
 from extra.menu import ConfirmSkill
 from extra import utils
 from mysqldb import the_database
-from typing import Union, Any
+from typing import List, Optional, Union, Any
 
 import os
 from datetime import datetime
@@ -369,20 +369,24 @@ class Agares(Player):
 
         return reflected_attack_embed
 
-    async def check_reflects(self) -> None:
-        """ Check on-going Reflect Aura and their expiration time. """
+    async def check_reflects(self, reflects: Optional[List[List[Union[str, int]]]] = None) -> int:
+        """ Check on-going Reflect Aura and their expiration time.
+        :param reflects: The expired Reflect Aura skill actions, if they were already fetched. [Optional] """
 
-        reflects = await self.get_expired_reflects()
+        if reflects is None:
+            reflects = await self.get_expired_reflects()
         for rf in reflects:
             await self.delete_skill_action_by_target_id_and_skill_type(rf[3], 'reflect')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{rf[0]}>, <@{rf[3]}>",
                 embed=discord.Embed(
                     description=f"**<@{rf[3]}>'s `Reflect Aura` from <@{rf[0]}> just expired!**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(reflects)
 
 
     async def get_expired_reflects(self) -> None:
@@ -6,6 +6,7 @@ from extra.menu import ConfirmSkill
 from extra import utils
 import os
 from datetime import datetime
+from typing import List, Optional, Union
 
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 
@@ -172,37 +173,45 @@ class Cybersloth(Player):
             if 'reflect' in target_fx:
                 await self.reflect_attack(ctx, attacker, target, 'wire')
 
-    async def check_hacks(self) -> None:
+    async def check_hacks(self, hacks: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        """ Check on-going hacks and their expiration time. """
+        """ Check on-going hacks and their expiration time.
+        :param hacks: The expired hack skill actions, if they were already fetched. [Optional] """
 
-        hacks = await self.get_expired_hacks()
+        if hacks is None:
+            hacks = await self.get_expired_hacks()
         for h in hacks:
             await self.delete_skill_action_by_target_id_and_skill_type(h[3], 'hack')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{h[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{h[3]}> updated his firewall so <@{h[0]}>'s hacking has no effect anymore! 💻**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
 
-    async def check_wires(self) -> None:
+        return len(hacks)
 
-        """ Check on-going wires and their expiration time. """
+    async def check_wires(self, wires: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        wires = await self.get_expired_wires()
+        """ Check on-going wires and their expiration time.
+        :param wires: The expired wire skill actions, if they were already fetched. [Optional] """
+
+        if wires is None:
+            wires = await self.get_expired_wires()
         for w in wires:
             await self.delete_skill_action_by_target_id_and_skill_type(w[3], 'wire')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{w[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{w[0]}> lost connection with <@{w[3]}> and the wire doesn't seem to work anymore! 🔌**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(wires)
 
     async def get_hack_embed(self, channel: discord.TextChannel, perpetrator_id: int, target_id: int,) -> discord.Embed:
         """ Makes an embedded message for a hacking skill action.
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
+from .effect_cache import effect_cache
 
 class SlothClassDatabaseCommands(commands.Cog):
     """ A class for organizing the bot's table creation/drop/delete/check commands. """
@@ -55,19 +56,13 @@ class SlothClassDatabaseCommands(commands.Cog):
         await mycursor.execute("DELETE FROM SlothSkills")
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
         await ctx.send("**Reset `SlothSkills` table!**")
 
     async def table_sloth_skills_exists(self) -> bool:
         """ Checks whether the SlothSkills table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'SlothSkills'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('SlothSkills')
 
     # ======== SkillsCooldown =========
     @commands.command(hidden=True)
@@ -132,14 +127,7 @@ class SlothClassDatabaseCommands(commands.Cog):
     async def table_skills_cooldown_exists(self) -> bool:
         """ Checks whether the SkillsCooldown table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'SkillsCooldown'")
-        exists = await mycursor.fetchall()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('SkillsCooldown')
 
     # ======== UserTribe =========
     @commands.command(hidden=True)
@@ -195,14 +183,7 @@ class SlothClassDatabaseCommands(commands.Cog):
     async def table_user_tribe_exists(self) -> bool:
         """ Checks whether the UserTribe table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserTribe'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('UserTribe')
 
     # ======== TribeMember =========
     @commands.command(hidden=True)
@@ -259,14 +240,7 @@ class SlothClassDatabaseCommands(commands.Cog):
     async def table_tribe_member_exists(self) -> bool:
         """ Checks whether the TribeMember table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'TribeMember'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('TribeMember')
 
     # ======== TribeRole =========
     @commands.command(hidden=True)
@@ -322,14 +296,7 @@ class SlothClassDatabaseCommands(commands.Cog):
     async def table_tribe_role_exists(self) -> bool:
         """ Checks whether the TribeRole table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'TribeRole'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if len(table_info) == 0:
-            return False
-        else:
-            return True
+        return await table_exists('TribeRole')
 
 
     # ======== SlothProfile =========
@@ -401,14 +368,7 @@ class SlothClassDatabaseCommands(commands.Cog):
     async def table_sloth_profile_exists(self) -> bool:
         """ Checks whether the SlothProfile table exists. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'SlothProfile'")
-        exists = await mycursor.fetchall()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('SlothProfile')
 
     async def update_sloth_profile_class(self, user_id: int, sloth_class: str) -> None:
         """ Updates the user's Sloth Profile's class.
@@ -0,0 +1,73 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+effect_cache_ttl = int(os.getenv('EFFECT_CACHE_TTL', 300))
+
+
+class EffectCache:
+    """ In-process cache of the users' active effect skill actions, grouped by skill type.
+
+    Entries live for `effect_cache_ttl` seconds, and are invalidated whenever
+    a skill action targeting the user is inserted, deleted or changed. """
+
+    def __init__(self, ttl: int = effect_cache_ttl) -> None:
+        """ Class init method. """
+
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, Dict[str, List[Union[int, str]]]]] = {}
+        self._prune_threshold: int = 1000
+        # Bumped on every invalidation, so results of queries that raced with one aren't cached
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, target_id: int) -> Optional[Dict[str, List[Union[int, str]]]]:
+        """ Gets the cached skill actions of a user, if they're still fresh.
+        :param target_id: The ID of the user. """
+
+        entry = self._entries.get(target_id)
+        if not entry or time.monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def set(self, target_id: int, skill_actions: Dict[str, List[Union[int, str]]], generation: int) -> None:
+        """ Caches the skill actions of a user.
+        :param target_id: The ID of the user.
+        :param skill_actions: The user's skill actions, grouped by skill type.
+        :param generation: The cache generation from before the skill actions were queried. """
+
+        if generation != self.generation:
+            return
+
+        self._entries[target_id] = (time.monotonic(), skill_actions)
+        if len(self._entries) > self._prune_threshold:
+            self.prune()
+            self._prune_threshold = max(1000, len(self._entries) * 2)
+
+    def invalidate(self, *target_ids: Optional[int]) -> None:
+        """ Invalidates the cached skill actions of the given users.
+        :param target_ids: The IDs of the users. """
+
+        self.generation += 1
+        for target_id in target_ids:
+            self._entries.pop(target_id, None)
+
+    def clear(self) -> None:
+        """ Invalidates the whole cache, for changes whose targets aren't known. """
+
+        self.generation += 1
+        self._entries.clear()
+
+    def prune(self) -> None:
+        """ Drops the expired entries. """
+
+        now = time.monotonic()
+        self._entries = {
+            target_id: entry for target_id, entry in self._entries.items() if now - entry[0] <= self.ttl}
+
+
+effect_cache = EffectCache()
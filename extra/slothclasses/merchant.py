@@ -11,10 +11,12 @@ from extra.prompt.menu import Confirm, ConfirmButton
 from .player import Player, Skill
 
 import os
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Tuple, Union, Optional
 from datetime import datetime
 import random
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
+from extra.imaging.fonts import fonts
+from io import BytesIO
 
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 
@@ -451,53 +453,65 @@ class Merchant(Player):
         else:
             await ctx.send(f"**{merchant.mention}, you had a `35%` chance of getting something from the Dark Sloth Web, it happened that today wasn't your day!**")
 
-    async def check_shop_potion_items(self) -> None:
+    async def check_shop_potion_items(self, transmutations: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        """ Check on-going changing-Sloth-class potion items and their expiration time. """
+        """ Check on-going changing-Sloth-class potion items and their expiration time.
+        :param transmutations: The expired potion items, if they were already fetched. [Optional] """
 
-        transmutations = await self.get_expired_potion_items()
+        if transmutations is None:
+            transmutations = await self.get_expired_potion_items()
         for tm in transmutations:
             await self.delete_skill_action_by_target_id_and_skill_type(tm[3], 'potion')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{tm[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{tm[3]}>'s `changing-Sloth-class potion` has just expired! Then it's been removed from the `Sloth class shop`! 🍯**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
 
-    async def check_shop_ring_items(self) -> None:
+        return len(transmutations)
 
-        """ Check on-going Wedding Ring items and their expiration time. """
+    async def check_shop_ring_items(self, transmutations: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        transmutations = await self.get_expired_ring_items()
+        """ Check on-going Wedding Ring items and their expiration time.
+        :param transmutations: The expired Wedding Ring items, if they were already fetched. [Optional] """
+
+        if transmutations is None:
+            transmutations = await self.get_expired_ring_items()
         for tm in transmutations:
             await self.delete_skill_action_by_target_id_and_skill_type(tm[3], 'ring')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{tm[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{tm[3]}>'s `Wedding Ring` has just expired! Then it's been removed from the `Sloth class shop`! 🍯**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(transmutations)
 
-    async def check_shop_egg_items(self) -> None:
+    async def check_shop_egg_items(self, transmutations: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        """ Check on-going Pet Egg items and their expiration time. """
+        """ Check on-going Pet Egg items and their expiration time.
+        :param transmutations: The expired Pet Egg items, if they were already fetched. [Optional] """
 
-        transmutations = await self.get_expired_pet_egg_items()
+        if transmutations is None:
+            transmutations = await self.get_expired_pet_egg_items()
         for tm in transmutations:
             await self.delete_skill_action_by_target_id_and_skill_type(tm[3], 'pet_egg')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{tm[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{tm[3]}>'s `Pet Egg` has just expired! Then it's been removed from the `Sloth class shop`! 🥚**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(transmutations)
 
     # ========== Update ===========
 
@@ -739,15 +753,14 @@ class Merchant(Player):
             await self.insert_skill_action(
                 user_id=member.id, skill_type='marriage', skill_timestamp=current_ts,
                 target_id=suitor.id)
-            filename, filepath = await self.make_marriage_image(member, suitor)
+            filename, image_bytes = await self.make_marriage_image(member, suitor)
         except Exception as e:
             print(e)
             await ctx.send(f"**Something went wrong with this, {member.mention}!**")
         else:
             marriage_embed = await self.get_marriage_embed(ctx.channel, member, suitor, filename)
-            await ctx.send(embed=marriage_embed, file=discord.File(filepath, filename=filename))
-        finally:
-            os.remove(filepath)
+            with BytesIO(image_bytes) as fp:
+                await ctx.send(embed=marriage_embed, file=discord.File(fp, filename=filename))
 
     @commands.command()
     @Player.poisoned()
@@ -830,11 +843,11 @@ class Merchant(Player):
         return marriage
 
 
-    async def make_marriage_image(self, p1: discord.Member, p2: discord.Member) -> List[str]:
+    async def make_marriage_image(self, p1: discord.Member, p2: discord.Member) -> Tuple[str, bytes]:
 
         filename = f"marriage_{p1.id}_{p2.id}.png"
 
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = fonts.get("built titling sb.ttf", 60)
         SlothCurrency = self.client.get_cog('SlothCurrency')
         background = Image.open(await SlothCurrency.get_user_specific_type_item(p1.id, 'background'))
 
@@ -857,9 +870,9 @@ class Merchant(Player):
         draw.text(((W-w1)/2, 50), str(p1), fill="black", font=medium)
         draw.text(((W-w2)/2, 500), str(p2), fill="black", font=medium)
 
-        filepath = f'media/temporary/{filename}'
-        background.save(filepath, 'png', quality=90)
-        return filename, filepath
+        with BytesIO() as fp:
+            background.save(fp, 'png', quality=90)
+            return filename, fp.getvalue()
 
     async def get_marriage_embed(self, channel, perpetrator: discord.Member, suitor: discord.Member, filename: str) -> discord.Embed:
         """ Makes an embedded message for a marriage action.
@@ -1107,7 +1120,7 @@ class Merchant(Player):
 
         # Makes the Pet's Image
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
+        small = fonts.get("built titling sb.ttf", 45)
         background = Image.open(f"./sloth_custom_images/background/base_pet_background.png")
         hud = Image.open(f"./sloth_custom_images/hud/base_pet_hud.png")
         breed = Image.open(f"./sloth_custom_images/pet/{user_pet[2].lower()}.png")
@@ -1120,14 +1133,14 @@ class Merchant(Player):
         draw.text((5, 70), f"LP: {user_pet[3]}", fill="red", font=small)
         draw.text((5, 120), f"Food: {user_pet[4]}", fill="brown", font=small)
         draw.text((5, 550), f"Auto Feed: {auto_feed}", fill="black", font=small)
-        file_path = f"media/temporary/user_pet-{member.id}.png"
-        background.save(file_path)
 
         # Sends the Pet's Image
-        await ctx.send(file=discord.File(file_path))
-        return os.remove(file_path)
+        with BytesIO() as fp:
+            background.save(fp, 'png')
+            fp.seek(0)
+            await ctx.send(file=discord.File(fp, filename=f"user_pet-{member.id}.png"))
 
-    async def check_pet_food(self) -> None:
+    async def check_pet_food(self) -> int:
         """ Checks pet food statuses. """
 
         current_time = await utils.get_time_now()
@@ -1166,7 +1179,7 @@ class Merchant(Player):
                             )
 
                             member = self.client.get_user(pet[0])
-                            await member.send(embed=embed)
+                            await self.sweep_call(member.send(embed=embed))
                             continue
 
                     # Checks whether pet has lp
@@ -1183,20 +1196,22 @@ class Merchant(Player):
                             description=f"**Sadly, your pet `{pet[2]}` named `{pet[1]}` starved to death because you didn't feed it for a while. My deepest feelings...**",
                             color=discord.Color.red())
 
-                        file_path = await self.make_pet_death_image(pet)
+                        image_bytes = await self.make_pet_death_image(pet)
                         embed.set_image(url="attachment://user_pet_death.png")
                         # Sends the Pet's Image
-                        await channel.send(content=f"<@{pet[0]}>", embed=embed, file=discord.File(file_path, filename="user_pet_death.png"))
-                        os.remove(file_path)
+                        with BytesIO(image_bytes) as fp:
+                            await self.sweep_call(channel.send(content=f"<@{pet[0]}>", embed=embed, file=discord.File(fp, filename="user_pet_death.png")))
             except Exception as e:
                 print('Pet death error', e)
                 pass
 
-    async def make_pet_death_image(self, pet: List[Union[int, str]]) -> str:
+        return len(pets)
+
+    async def make_pet_death_image(self, pet: List[Union[int, str]]) -> bytes:
         """ Makes an embed for the pet's death.
         :param pet: The data from the dead pet. """
     
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = fonts.get("built titling sb.ttf", 60)
         background = Image.open(f"./sloth_custom_images/background/base_pet_background.png")
         breed = Image.open(f"./sloth_custom_images/pet/{pet[2].lower()}.png")
 
@@ -1204,13 +1219,12 @@ class Merchant(Player):
         draw = ImageDraw.Draw(background)
         draw.text((320, 260), "R.I.P.", font=medium)
         draw.text((320, 310), str(pet[1]), font=medium)
-        file_path = f"media/temporary/user_pet_death-{pet[0]}.png"
         # Makes the image gray
         background = ImageOps.grayscale(background)
-        # Saves image
-        background.save(file_path)
-
-        return file_path
+        # Encodes the image
+        with BytesIO() as fp:
+            background.save(fp, 'png')
+            return fp.getvalue()
 
     @pet.command(name="feed", aliases=["give_food", "f"])
     @commands.cooldown(1, 5, commands.BucketType.user)
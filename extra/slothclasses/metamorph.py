@@ -68,42 +68,50 @@ class Metamorph(Player):
         transmutation_embed = await self.get_transmutation_embed(channel=ctx.channel, perpetrator_id=member.id)
         await ctx.send(embed=transmutation_embed)
 
-    async def check_transmutations(self) -> None:
+    async def check_transmutations(self, transmutations: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        """ Check on-going transmutations and their expiration time. """
+        """ Check on-going transmutations and their expiration time.
+        :param transmutations: The expired transmutation skill actions, if they were already fetched. [Optional] """
 
-        transmutations = await self.get_expired_transmutations()
+        if transmutations is None:
+            transmutations = await self.get_expired_transmutations()
         for tm in transmutations:
             # print(tm)
             await self.delete_skill_action_by_target_id_and_skill_type(tm[3], 'transmutation')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{tm[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{tm[3]}>'s `Transmutation` has just expired! 🐩→💥→🦥**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
 
-    async def check_frogs(self) -> None:
+        return len(transmutations)
 
-        """ Check on-going frogs and their expiration time. """
+    async def check_frogs(self, frogs: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        frogs = await self.get_expired_frogs()
+        """ Check on-going frogs and their expiration time.
+        :param frogs: The expired frog skill actions, if they were already fetched. [Optional] """
+
+        if frogs is None:
+            frogs = await self.get_expired_frogs()
         for f in frogs:
             try:
                 await self.delete_skill_action_by_target_id_and_skill_type(f[3], 'frog')
 
                 channel = self.bots_txt
 
-                await channel.send(
+                await self.sweep_call(channel.send(
                     content=f"<@{f[0]}>",
                     embed=discord.Embed(
                         description=f"**<@{f[3]}>'s `Frog` has just expired! 🐸→💥→🦥**",
-                        color=discord.Color.red()))
+                        color=discord.Color.red())))
             except:
                 pass
 
+        return len(frogs)
+
     @commands.command(aliases=['frogify'])
     @Player.poisoned()
     @Player.skills_used(requirement=5)
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands, menus, tasks
 from mysqldb import the_database, the_django_database
+from .effect_cache import effect_cache
 
 from .player import Player, Skill
 from .enums import QuestEnum
@@ -725,10 +726,12 @@ class Munk(Player):
             if nick != dname:
                 await member.edit(nick=nick)
 
-    async def check_tribe_creations(self) -> None:
-        """ Check on-going steals and their expiration time. """
+    async def check_tribe_creations(self, creations: Optional[List[List[Union[str, int]]]] = None) -> int:
+        """ Check on-going steals and their expiration time.
+        :param creations: The expired tribe creation skill actions, if they were already fetched. [Optional] """
 
-        creations = await self.get_skill_actions_by_skill_type('tribe_creation')
+        if creations is None:
+            creations = await self.get_skill_actions_by_skill_type('tribe_creation')
         guild = self.client.get_guild(int(os.getenv('SERVER_ID', 123)))
         for creation in creations:
             try:
@@ -736,12 +739,14 @@ class Munk(Player):
                 await self.delete_skill_action_by_target_id_and_skill_type(target_id=creation[0], skill_type='tribe_creation')
                 member = discord.utils.get(guild.members, id=creation[0])
                 try:
-                    await self.update_tribe_name(member=member, two_emojis=creation[6], joining=True)
+                    await self.sweep_call(self.update_tribe_name(member=member, two_emojis=creation[6], joining=True))
                 except:
                     pass
             except:
                 pass
 
+        return len(creations)
+
     @commands.command()
     @Player.poisoned()
     @Player.skills_used(requirement=5)
@@ -1556,6 +1561,7 @@ class Munk(Player):
             WHERE user_id = %s AND skill_type = %s""", (target_id, current_ts, user_id, skill_type))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     async def update_sloth_skill_user_and_target_id(self, user_id: int, target_id: int, current_ts: int, skill_type: str) -> None:
         """ Updates the skill's user and target id.
@@ -1570,6 +1576,7 @@ class Munk(Player):
             WHERE user_id = %s AND skill_type = %s""", (target_id, target_id, current_ts, user_id, skill_type))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     async def update_sloth_skill_user_and_target_id_and_int_content(self, user_id: int, target_id: int, int_content: int, current_ts: int, skill_type: str) -> None:
         """ Updates the skill's user and target id.
@@ -1585,6 +1592,7 @@ class Munk(Player):
             WHERE user_id = %s AND skill_type = %s""", (target_id, target_id, int_content, current_ts, user_id, skill_type))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     @tribe.command(aliases=["transferquest", "tq"])
     @commands.cooldown(1, 5, commands.BucketType.user)
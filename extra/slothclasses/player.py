@@ -10,15 +10,18 @@ from extra.customerrors import (
 from extra import utils
 
 from mysqldb import the_database, the_django_database
-from typing import Union, List, Tuple, Dict, Any
+from typing import Union, List, Tuple, Dict, Any, Optional, Awaitable
 from datetime import datetime
 from random import random, choice
 import os
+import asyncio
 from pytz import timezone
 
 from enum import Enum
 from .userpets import UserPetsTable
 from .userbabies import UserBabiesTable
+from .effect_cache import effect_cache
+from extra.scheduler import scheduler
 
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 additional_cogs: List[commands.Cog] = [
@@ -34,6 +37,37 @@ class Skill(Enum):
     FIVE = 'skill_five_ts'
 
 
+# Skill type, effect name, fixed cooldown text (None for the general cooldown), whether it's a debuff and whether it has a GIF
+effect_skill_types: List[Tuple[str, str, Optional[str], bool, bool]] = [
+    ('divine_protection', 'protected', None, False, True),
+    ('transmutation', 'transmutated', None, False, True),
+    ('hack', 'hacked', None, True, False),
+    ('wire', 'wired', None, True, False),
+    ('hit', 'knocked_out', None, True, False),
+    ('frog', 'frogged', None, True, False),
+    ('munk', 'munk', "Endless", True, False),
+    ('reflect', 'reflect', None, False, False),
+    ('sabotage', 'sabotaged', None, True, False),
+    ('lock', 'locked', "Ends when completing a Quest", True, False),
+    ('poison', 'poisoned', None, True, False),
+    ('kidnap', 'kidnapped', "Ends when rescue is paid", True, False),
+]
+effect_skill_type_names: List[str] = [skill_type for skill_type, *_ in effect_skill_types if skill_type != 'munk']
+
+# Skill types that the skill action sweeps expire, and how many seconds they last
+skill_action_durations: Dict[str, int] = {
+    'reflect': 86400, 'steal': 2400, 'divine_protection': 86400, 'transmutation': 86400,
+    'potion': 86400, 'ring': 36000, 'pet_egg': 432000, 'hack': 86400, 'hit': 86400,
+    'wire': 86400, 'tribe_creation': 0, 'frog': 86400, 'sabotage': 86400, 'poison': 86400,
+}
+skill_action_duration_case: str = 'CASE skill_type ' + ' '.join(
+    f"WHEN '{skill_type}' THEN {duration}" for skill_type, duration in skill_action_durations.items()) + ' END'
+# Pets and babies get hungry this many seconds after they last ate
+food_interval: int = 7200
+# How long a skill action sweep waits on a single Discord call
+skill_sweep_timeout = int(os.getenv('SKILL_SWEEP_TIMEOUT', 60))
+
+
 class Player(*additional_cogs):
 
     def __init__(self, client) -> None:
@@ -43,6 +77,12 @@ class Player(*additional_cogs):
     async def on_ready(self) -> None:
         self.bots_txt = await self.client.fetch_channel(bots_and_commands_channel_id)
 
+    async def sweep_call(self, call: Awaitable) -> Any:
+        """ Awaits a Discord call made by a skill action sweep, giving up on it after the sweep timeout.
+        :param call: The Discord call to await. """
+
+        return await asyncio.wait_for(call, timeout=skill_sweep_timeout)
+
     # Check user class
     def user_is_class(command_class):
         """ Checks whether the user has the required Sloth Class to run the command.
@@ -155,8 +195,8 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            poisoned = await Player.get_skill_action_by_target_id_and_skill_type(Player, target_id=ctx.author.id, skill_type='poison')
-            if not poisoned:
+            skill_actions = await Player.get_skill_actions_by_target_ids(Player, target_ids=[ctx.author.id])
+            if 'poison' not in skill_actions.get(ctx.author.id, {}):
                 return True
 
             # 65% chance of messing with the user when they're poisoned
@@ -206,8 +246,8 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            kidnapped = await Player.get_skill_action_by_target_id_and_skill_type(Player, target_id=ctx.author.id, skill_type='kidnap')
-            if not kidnapped:
+            skill_actions = await Player.get_skill_actions_by_target_ids(Player, target_ids=[ctx.author.id])
+            if 'kidnap' not in skill_actions.get(ctx.author.id, {}):
                 return True
 
             raise KidnappedCommandError()
@@ -223,119 +263,47 @@ class Player(*additional_cogs):
 
     # Is user EFFECT
 
-    async def get_user_effects(self, member: Union[discord.User, discord.Member]) -> List[str]:
-        """ Gets the effects that the user is under. """
+    async def get_user_effects(self, member: Union[discord.User, discord.Member]) -> Dict[str, Dict[str, Any]]:
+        """ Gets the effects that the user is under.
+        :param member: The member to get the effects from. """
+
+        skill_actions = await self.get_skill_actions_by_target_ids(target_ids=[member.id])
+        return self.build_user_effects(member, skill_actions.get(member.id, {}))
+
+    async def get_users_effects(self, members: List[Union[discord.User, discord.Member]]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """ Gets the effects that many users are under, with a single query.
+        :param members: The members to get the effects from. """
+
+        skill_actions = await self.get_skill_actions_by_target_ids(target_ids=[m.id for m in members])
+        return {m.id: self.build_user_effects(m, skill_actions.get(m.id, {})) for m in members}
 
-        # effects = []
+    @staticmethod
+    def build_user_effects(member: Union[discord.User, discord.Member], skill_actions: Dict[str, List[Union[int, str]]]) -> Dict[str, Dict[str, Any]]:
+        """ Builds the user's effects out of their active skill actions.
+        :param member: The member to whom the effects belong.
+        :param skill_actions: The member's skill actions, grouped by skill type. """
 
         effects = {}
         general_cooldown = 86400 # Worth a day in seconds
-        
 
+        for skill_type, effect, fixed_cooldown, debuff, has_gif in effect_skill_types:
+            if skill_type == 'munk':
+                # Munks aren't a skill action, they're flagged in their names
+                if 'Munk' not in member.display_name:
+                    continue
+            elif not (then := skill_actions.get(skill_type)):
+                continue
+            else:
+                fixed_cooldown = fixed_cooldown or f"Ends <t:{int(then[2]) + general_cooldown}:R>"
 
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='divine_protection'):
-            effects['protected'] = {}
-    
-            effects['protected']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['protected']['frames'] = []
-            effects['protected']['cords'] = (0, 0)
-            effects['protected']['resize'] = None
-            effects['protected']['has_gif'] = True
-            effects['protected']['debuff'] = False
-
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='transmutation'):
-            effects['transmutated'] = {}
-            effects['transmutated']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['transmutated']['frames'] = []
-            effects['transmutated']['cords'] = (0, 0)
-            effects['transmutated']['resize'] = None
-            effects['transmutated']['has_gif'] = True
-            effects['transmutated']['debuff'] = False
-
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='hack'):
-            effects['hacked'] = {}
-            effects['hacked']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['hacked']['frames'] = []
-            effects['hacked']['cords'] = (0, 0)
-            effects['hacked']['resize'] = None
-            effects['hacked']['debuff'] = True
-
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='wire'):
-            effects['wired'] = {}
-            effects['wired']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['wired']['frames'] = []
-            effects['wired']['cords'] = (0, 0)
-            effects['wired']['resize'] = None
-            effects['wired']['debuff'] = True
-
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='hit'):
-            effects['knocked_out'] = {}
-            effects['knocked_out']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['knocked_out']['frames'] = []
-            effects['knocked_out']['cords'] = (0, 0)
-            effects['knocked_out']['resize'] = None
-            effects['knocked_out']['debuff'] = True
-
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='frog'):
-            effects['frogged'] = {}
-            effects['frogged']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['frogged']['frames'] = []
-            effects['frogged']['cords'] = (0, 0)
-            effects['frogged']['resize'] = None
-            effects['frogged']['debuff'] = True
-
-        if 'Munk' in member.display_name:
-            effects['munk'] = {}
-            effects['munk']['cooldown'] = "Endless"
-            effects['munk']['frames'] = []
-            effects['munk']['cords'] = (0, 0)
-            effects['munk']['resize'] = None
-            effects['munk']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='reflect'):
-            effects['reflect'] = {}
-            effects['reflect']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['reflect']['frames'] = []
-            effects['reflect']['cords'] = (0, 0)
-            effects['reflect']['resize'] = None
-            effects['reflect']['debuff'] = False
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='sabotage'):
-            effects['sabotaged'] = {}
-            effects['sabotaged']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['sabotaged']['frames'] = []
-            effects['sabotaged']['cords'] = (0, 0)
-            effects['sabotaged']['resize'] = None
-            effects['sabotaged']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='lock'):
-            effects['locked'] = {}
-            effects['locked']['cooldown'] = "Ends when completing a Quest"
-            effects['locked']['frames'] = []
-            effects['locked']['cords'] = (0, 0)
-            effects['locked']['resize'] = None
-            effects['locked']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='poison'):
-            effects['poisoned'] = {}
-            effects['poisoned']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['poisoned']['frames'] = []
-            effects['poisoned']['cords'] = (0, 0)
-            effects['poisoned']['resize'] = None
-            effects['poisoned']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='kidnap'):
-            effects['kidnapped'] = {}
-            effects['kidnapped']['cooldown'] = f"Ends when rescue is paid"
-            effects['kidnapped']['frames'] = []
-            effects['kidnapped']['cords'] = (0, 0)
-            effects['kidnapped']['resize'] = None
-            effects['kidnapped']['debuff'] = True
+            effects[effect] = {}
+            effects[effect]['cooldown'] = fixed_cooldown
+            effects[effect]['frames'] = []
+            effects[effect]['cords'] = (0, 0)
+            effects[effect]['resize'] = None
+            if has_gif:
+                effects[effect]['has_gif'] = True
+            effects[effect]['debuff'] = debuff
 
         return effects
 
@@ -373,6 +341,9 @@ class Player(*additional_cogs):
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""", (user_id, skill_type, skill_timestamp, target_id, message_id, channel_id, emoji, price, content))
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(target_id)
+        if (duration := skill_action_durations.get(skill_type)) is not None:
+            scheduler.schedule('skill_actions', skill_timestamp + duration)
 
     # ========== GET ========== #
 
@@ -438,6 +409,45 @@ class Player(*additional_cogs):
         await mycursor.close()
         return skill_action
 
+    async def get_skill_actions_by_target_ids(self, target_ids: List[int], skill_types: Optional[List[str]] = None
+    ) -> Dict[int, Dict[str, List[Union[int, str]]]]:
+        """ Gets the skill actions of many targets at once, grouped by target ID and skill type.
+        :param target_ids: The IDs of the targets.
+        :param skill_types: The skill types to get. [Optional][Default=Effect skill types] """
+
+        if not target_ids:
+            return {}
+
+        grouped_skill_actions: Dict[int, Dict[str, List[Union[int, str]]]] = {}
+
+        # Effect skill actions are served from the cache when possible
+        use_cache = skill_types is None
+        if use_cache:
+            skill_types = effect_skill_type_names
+            for target_id in target_ids:
+                if (cached := effect_cache.get(target_id)) is not None:
+                    grouped_skill_actions[target_id] = cached
+
+            target_ids = [target_id for target_id in target_ids if target_id not in grouped_skill_actions]
+            if not target_ids:
+                return grouped_skill_actions
+            generation = effect_cache.generation
+
+        mycursor, _ = await the_database()
+        await mycursor.execute(
+            "SELECT * FROM SlothSkills WHERE target_id IN %s AND skill_type IN %s", (tuple(target_ids), tuple(skill_types)))
+        skill_actions = await mycursor.fetchall()
+        await mycursor.close()
+
+        for skill_action in skill_actions:
+            grouped_skill_actions.setdefault(skill_action[3], {})[skill_action[1]] = skill_action
+
+        if use_cache:
+            for target_id in target_ids:
+                effect_cache.set(target_id, grouped_skill_actions.setdefault(target_id, {}), generation)
+
+        return grouped_skill_actions
+
     async def get_skill_action_by_user_id_and_skill_type(self, user_id: int, skill_type: str, multiple: bool = False
     ) -> Union[List[List[Union[int, str]]], List[Union[int, str]], bool]:
         """ Gets a skill action by user ID and skill type.
@@ -502,6 +512,41 @@ class Player(*additional_cogs):
         the_time = datetime.now(tzone).timestamp()
         return the_time
 
+    async def get_next_skill_action_deadline(self) -> Optional[int]:
+        """ Gets the timestamp of the earliest skill action expiration or pet/baby meal, if any. """
+
+        mycursor, _ = await the_database()
+        await mycursor.execute(f"""
+            SELECT MIN(deadline) FROM (
+                SELECT MIN(skill_timestamp + {skill_action_duration_case}) AS deadline
+                FROM SlothSkills WHERE skill_type IN %s
+                UNION ALL
+                SELECT MIN(food_ts) + %s FROM UserPets WHERE LOWER(pet_breed) != 'egg'
+                UNION ALL
+                SELECT MIN(food_ts) + %s FROM UserBabies WHERE LOWER(baby_class) != 'embryo'
+            ) AS deadlines
+            """, (tuple(skill_action_durations), food_interval, food_interval))
+        deadline = await mycursor.fetchone()
+        await mycursor.close()
+        return deadline[0] if deadline else None
+
+    async def get_expired_skill_actions(self) -> Dict[str, List[List[Union[str, int]]]]:
+        """ Gets the expired skill actions of all skill types at once, grouped by skill type. """
+
+        the_time = await utils.get_timestamp()
+        mycursor, _ = await the_database()
+        await mycursor.execute(f"""
+            SELECT * FROM SlothSkills
+            WHERE skill_type IN %s AND (%s - skill_timestamp) >= {skill_action_duration_case}
+            """, (tuple(skill_action_durations), the_time))
+        skill_actions = await mycursor.fetchall()
+        await mycursor.close()
+
+        expired: Dict[str, List[List[Union[str, int]]]] = {skill_type: [] for skill_type in skill_action_durations}
+        for skill_action in skill_actions:
+            expired[skill_action[1]].append(skill_action)
+        return expired
+
     async def get_expired_transmutations(self) -> None:
         """ Gets expired transmutation skill actions. """
 
@@ -683,6 +728,7 @@ class Player(*additional_cogs):
         await mycursor.execute("DELETE FROM SlothSkills WHERE message_id = %s", (message_id,))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     async def delete_skill_action_by_target_id(self, target_id: int) -> None:
         """ Deletes a skill action by target ID.
@@ -692,6 +738,7 @@ class Player(*additional_cogs):
         await mycursor.execute("DELETE FROM SlothSkills WHERE target_id = %s", (target_id,))
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(target_id)
 
     async def delete_debuff_skill_action_by_target_id(self, target_id: int) -> None:
         """ Deletes debuff skill actions by target ID.
@@ -703,6 +750,7 @@ class Player(*additional_cogs):
         """, (target_id,))
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(target_id)
 
     async def delete_skill_action_by_target_id_and_skill_type(self, target_id: int, skill_type: str, multiple: bool = False) -> None:
         """ Deletes a skill action by target ID.
@@ -714,6 +762,7 @@ class Player(*additional_cogs):
         await mycursor.execute(sql, (target_id, skill_type))
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(target_id)
 
     async def delete_skill_action_by_user_id_and_skill_type(self, user_id: int, skill_type: str, multiple: bool = False) -> None:
         """ Deletes a skill action by user ID.
@@ -725,6 +774,7 @@ class Player(*additional_cogs):
         await mycursor.execute(sql, (user_id, skill_type))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     async def delete_skill_actions_by_target_id_and_skill_type(self, users: List[Tuple[int, str]]) -> None:
         """ Deletes a skill action by user ID.
@@ -736,6 +786,7 @@ class Player(*additional_cogs):
         await mycursor.executemany(sql, users)
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(*[target_id for target_id, _ in users])
 
     async def delete_skill_action_by_user_id_or_target_id_and_skill_type_and_price(self, user_id: int, skill_type: str, price: str, multiple: bool = False) -> None:
         """ Deletes a skill action by user_id or target ID and skill type and price.
@@ -749,6 +800,7 @@ class Player(*additional_cogs):
         await mycursor.execute(sql, (user_id, user_id, skill_type, price))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     # ========== UPDATE ========== #
     async def update_user_skills_used(self, user_id: int, addition: int = 1) -> None:
@@ -6,7 +6,7 @@ from extra.prompt.menu import Confirm
 from extra import utils
 import os
 from datetime import datetime
-from typing import List, Union
+from typing import List, Optional, Union
 import random
 import asyncio
 
@@ -203,21 +203,24 @@ class Prawler(Player):
 				channel=ctx.channel, perpetrator_id=perpetrator.id, stack=stack+1)
 			await ctx.send(embed=sharpen_embed)
 
-	async def check_steals(self) -> None:
-		""" Check on-going steals and their expiration time. """
+	async def check_steals(self, steals: Optional[List[List[Union[str, int]]]] = None) -> int:
+		""" Check on-going steals and their expiration time.
+		:param steals: The expired steal skill actions, if they were already fetched. [Optional] """
 
-		steals = await self.get_expired_steals()
+		if steals is None:
+			steals = await self.get_expired_steals()
 		for steal in steals:
 			channel = self.bots_txt
+			# Removes skill action from the database before anything else, so it's never handled twice
+			await self.delete_skill_action_by_message_id(steal[4])
 			try:
-				message = await channel.fetch_message(steal[4])
+				message = await self.sweep_call(channel.fetch_message(steal[4]))
 				if message:
 					message_embed = message.embeds[0]
 					message_embed.color = discord.Color.red()
 					message_embed.description = f"**Too late, <@{steal[3]}>! You were robbed by <@{steal[0]}>!**"
-					await message.edit(embed=message_embed)
-					await message.remove_reaction('🛡️', self.client.user)
-				# Removes skill action from the database
+					await self.sweep_call(message.edit(embed=message_embed))
+					await self.sweep_call(message.remove_reaction('🛡️', self.client.user))
 				# Gives money to the attacker
 				user_currency = await self.get_user_currency(steal[3])
 				if user_currency and user_currency[1] >= 5:
@@ -225,20 +228,21 @@ class Prawler(Player):
 					await self.client.get_cog('SlothCurrency').update_user_money(steal[3], -5)
 					steal_embed = await self.get_steal_embed(
 						channel=channel, attacker_id=steal[0], target_id=steal[3], attack_succeeded=True)
-					await channel.send(content=f"<@{steal[0]}>", embed=steal_embed)
+					await self.sweep_call(channel.send(content=f"<@{steal[0]}>", embed=steal_embed))
 				else:
 					steal_embed = await self.get_steal_embed(
 						channel=channel, attacker_id=steal[0], target_id=steal[3])
-					await channel.send(content=f"<@{steal[0]}>", embed=steal_embed)
+					await self.sweep_call(channel.send(content=f"<@{steal[0]}>", embed=steal_embed))
 
 			except Exception as e:
-				await self.delete_skill_action_by_message_id(steal[4])
+				pass
 			else:
-				await self.delete_skill_action_by_message_id(steal[4])
 				sloth_profile = await self.get_sloth_profile(steal[0])
 				stack = sloth_profile[6]
 				if stack:
-					return await self.double_steal(channel=channel, attacker_id=steal[0], target_id=steal[3], stack=stack)
+					await self.double_steal(channel=channel, attacker_id=steal[0], target_id=steal[3], stack=stack)
+
+		return len(steals)
 
 	async def double_steal(self, channel: discord.TextChannel, attacker_id: int, target_id: int, stack: int, loop: int = 1, init_rob_money: int = 5) -> None:
 		""" Tries to double the steal based on the attacker's knife sharpness stack.
@@ -258,21 +262,21 @@ class Prawler(Player):
 					await self.client.get_cog('SlothCurrency').update_user_money(attacker_id, rob_money)
 					await self.client.get_cog('SlothCurrency').update_user_money(target_id, -rob_money)
 				else:
-					return await channel.send(f"**<@{target_id}> doesn't have more `{rob_money}łł`, otherwise you would steal it, <@{attacker_id}>!**")
+					return await self.sweep_call(channel.send(f"**<@{target_id}> doesn't have more `{rob_money}łł`, otherwise you would steal it, <@{attacker_id}>!**"))
 			except Exception as e:
-				await channel.send(f"**For some reason I couldn't double your stealing, <@{attacker_id}>!**")
+				await self.sweep_call(channel.send(f"**For some reason I couldn't double your stealing, <@{attacker_id}>!**"))
 
 			else:
 				rob_doubled_embed = await self.get_rob_doubled_embed(channel=channel, attacker_id=attacker_id, double_amount=rob_money, rob_stack=loop)
-				await channel.send(embed=rob_doubled_embed)
+				await self.sweep_call(channel.send(embed=rob_doubled_embed))
 				# Checks whether user achieved its maximum rob stack recursion
 				if loop < stack:
 					await asyncio.sleep(3)
 					return await self.double_steal(channel=channel, attacker_id=attacker_id, target_id=target_id, stack=stack, loop=loop+1, init_rob_money=rob_money)
 
 		else:
-			await channel.send(
-				f"**<@{attacker_id}>, you had a `50%` chance of doubling the previous amount and getting more `{rob_money}łł`, but you missed it!**")
+			await self.sweep_call(channel.send(
+				f"**<@{attacker_id}>, you had a `50%` chance of doubling the previous amount and getting more `{rob_money}łł`, but you missed it!**"))
 
 	async def increments_user_sharpness_stack(self, user_id: int, increment: int) -> None:
 		""" Increments the user knife sharpness stack.
@@ -478,20 +482,24 @@ class Prawler(Player):
 		return sabotage_embed
 
 	
-	async def check_sabotages(self) -> None:
-		""" Check on-going sabotages and their expiration time. """
+	async def check_sabotages(self, sabotages: Optional[List[List[Union[str, int]]]] = None) -> int:
+		""" Check on-going sabotages and their expiration time.
+		:param sabotages: The expired sabotage skill actions, if they were already fetched. [Optional] """
 
-		sabotages = await self.get_expired_sabotages()
+		if sabotages is None:
+			sabotages = await self.get_expired_sabotages()
 		for st in sabotages:
 			await self.delete_skill_action_by_target_id_and_skill_type(st[3], 'sabotage')
 
 			channel = self.bots_txt
 
-			await channel.send(
+			await self.sweep_call(channel.send(
 				content=f"<@{st[0]}>, <@{st[3]}>",
 				embed=discord.Embed(
 					description=f"**<@{st[3]}>'s `Sabotage` from <@{st[0]}> just expired!**",
-					color=discord.Color.red()))
+					color=discord.Color.red())))
+
+		return len(sabotages)
 
 	async def get_expired_sabotages(self) -> List[Union[str, int]]:
 		""" Gets expired sabotage skill actions. """
@@ -506,20 +514,24 @@ class Prawler(Player):
 		await mycursor.close()
 		return sabotages
 
-	async def check_poisons(self) -> None:
-		""" Check on-going poisons and their expiration time. """
+	async def check_poisons(self, poisons: Optional[List[List[Union[str, int]]]] = None) -> int:
+		""" Check on-going poisons and their expiration time.
+		:param poisons: The expired poison skill actions, if they were already fetched. [Optional] """
 
-		poisons = await self.get_expired_poisons()
+		if poisons is None:
+			poisons = await self.get_expired_poisons()
 		for ps in poisons:
 			await self.delete_skill_action_by_target_id_and_skill_type(ps[3], 'poison')
 
 			channel = self.bots_txt
 
-			await channel.send(
+			await self.sweep_call(channel.send(
 				content=f"<@{ps[0]}>, <@{ps[3]}>",
 				embed=discord.Embed(
 					description=f"**<@{ps[3]}>'s `Poison` from <@{ps[0]}> just expired!**",
-					color=discord.Color.red()))
+					color=discord.Color.red())))
+
+		return len(poisons)
 
 	async def get_expired_poisons(self) -> List[Union[str, int]]:
 		""" Gets expired sabotage skill actions. """
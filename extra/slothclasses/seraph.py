@@ -2,13 +2,16 @@ import discord
 from discord.ext import commands
 from .player import Player, Skill
 from mysqldb import the_database
+from .effect_cache import effect_cache
 from extra.prompt.menu import Confirm, ConfirmButton
 from extra import utils
 import os
 from datetime import datetime
 import random
 from typing import List, Optional, Union
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
+from extra.imaging.fonts import fonts
+from io import BytesIO
 
 from extra.view import UserBabyView
 
@@ -188,20 +191,24 @@ class Seraph(Player):
             else:
                 await ctx.send(f"**You had a `45%` chance of getting a Divine Protection shield for yourself, but you missed it, {perpetrator.mention}!**")
 
-    async def check_protections(self) -> None:
-        """ Check on-going protections and their expiration time. """
+    async def check_protections(self, divine_protections: Optional[List[List[Union[str, int]]]] = None) -> int:
+        """ Check on-going protections and their expiration time.
+        :param divine_protections: The expired divine protection skill actions, if they were already fetched. [Optional] """
 
-        divine_protections = await self.get_expired_protections()
+        if divine_protections is None:
+            divine_protections = await self.get_expired_protections()
         for dp in divine_protections:
             await self.delete_skill_action_by_target_id_and_skill_type(dp[3], 'divine_protection')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{dp[0]}>, <@{dp[3]}>",
                 embed=discord.Embed(
                     description=f"**<@{dp[3]}>'s `Divine Protection` from <@{dp[0]}> just expired!**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(divine_protections)
 
     async def reinforce_shields(self, perpetrator_id: int, increment: Optional[int] = 86400) -> None:
         """ Reinforces all active Divine Protection shields.
@@ -214,6 +221,7 @@ class Seraph(Player):
             AND skill_type = 'divine_protection'""", (increment, perpetrator_id))
         await db.commit()
         await mycursor.close()
+        effect_cache.clear()
 
     async def reinforce_shield(self, user_id: int, increment: Optional[int] = 86400) -> None:
         """ Reinforces a specific active Divine Protection shield.
@@ -226,6 +234,7 @@ class Seraph(Player):
         AND skill_type = 'divine_protection'""", (increment, user_id))
         await db.commit()
         await mycursor.close()
+        effect_cache.invalidate(user_id)
 
     async def get_expired_protections(self) -> None:
         """ Gets expired divine protection skill actions. """
@@ -680,7 +689,7 @@ class Seraph(Player):
 
         # Makes the Baby's Image
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
+        small = fonts.get("built titling sb.ttf", 45)
         background = Image.open(f"./sloth_custom_images/background/base_baby_background.png")
         hud = Image.open(f"./sloth_custom_images/hud/base_baby_hud.png")
         baby_class = Image.open(f"./sloth_custom_images/sloth/{user_baby[3].title()}.png").resize((470, 350))
@@ -694,14 +703,14 @@ class Seraph(Player):
         draw.text((320, 5), str(user_baby[2]), fill="white", font=small)
         draw.text((5, 70), f"LP: {user_baby[4]}", fill="red", font=small)
         draw.text((5, 120), f"Food: {user_baby[5]}", fill="brown", font=small)
-        file_path = f"media/temporary/user_baby-{member.id}.png"
-        background.save(file_path)
 
         # Sends the Baby's Image
-        await ctx.send(file=discord.File(file_path))
-        return os.remove(file_path)
+        with BytesIO() as fp:
+            background.save(fp, 'png')
+            fp.seek(0)
+            await ctx.send(file=discord.File(fp, filename=f"user_baby-{member.id}.png"))
 
-    async def check_baby_food(self) -> None:
+    async def check_baby_food(self) -> int:
         """ Checks baby food statuses. """
 
         current_ts = await utils.get_timestamp()
@@ -734,20 +743,22 @@ class Seraph(Player):
                             description=f"**Sadly, your baby `{baby[3]}` named `{baby[2]}` starved to death because you didn't feed it for a while. My deepest feelings...**",
                             color=discord.Color.red())
 
-                        file_path = await self.make_baby_death_image(baby)
+                        image_bytes = await self.make_baby_death_image(baby)
                         embed.set_image(url="attachment://user_baby_death.png")
                         # Sends the Baby's Image
-                        await channel.send(content=f"<@{baby[0]}>, <@{baby[1]}>", embed=embed, file=discord.File(file_path, filename="user_baby_death.png"))
-                        os.remove(file_path)
+                        with BytesIO(image_bytes) as fp:
+                            await self.sweep_call(channel.send(content=f"<@{baby[0]}>, <@{baby[1]}>", embed=embed, file=discord.File(fp, filename="user_baby_death.png")))
             except Exception as e:
                 print('Baby death error', e)
                 pass
 
-    async def make_baby_death_image(self, baby: List[Union[int, str]]) -> str:
+        return len(babies)
+
+    async def make_baby_death_image(self, baby: List[Union[int, str]]) -> bytes:
         """ Makes an embed for the baby's death.
         :param baby: The data from the dead baby. """
     
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = fonts.get("built titling sb.ttf", 60)
         background = Image.open(f"./sloth_custom_images/background/base_baby_background.png")
         baby_class = Image.open(f"./sloth_custom_images/sloth/{baby[3].lower()}.png").resize((470, 350))
 
@@ -755,13 +766,12 @@ class Seraph(Player):
         draw = ImageDraw.Draw(background)
         draw.text((320, 180), "R.I.P.", fill="black", font=medium)
         draw.text((320, 230), str(baby[2]), fill="black", font=medium)
-        file_path = f"media/temporary/user_baby_death-{baby[0]}.png"
         # Makes the image gray
         background = ImageOps.grayscale(background)
-        # Saves image
-        background.save(file_path)
-
-        return file_path
+        # Encodes the image
+        with BytesIO() as fp:
+            background.save(fp, 'png')
+            return fp.getvalue()
 
     @baby.command(name="feed", aliases=["give_food", "f"])
     @commands.cooldown(1, 5, commands.BucketType.user)
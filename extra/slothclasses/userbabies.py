@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Optional
 from extra import utils
 
@@ -75,14 +75,7 @@ class UserBabiesTable(commands.Cog):
     async def check_user_babies_table_exists(self) -> bool:
         """ Checks whether the UserBabies table exists in the database. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserBabies'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('UserBabies')
 
     async def insert_user_baby(self, 
         parent_one: int, parent_two: int, 
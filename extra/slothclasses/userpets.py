@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Optional
 from extra import utils
 
@@ -76,14 +76,7 @@ class UserPetsTable(commands.Cog):
     async def check_user_pets_table_exists(self) -> bool:
         """ Checks whether the UserPets table exists in the database. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserPets'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('UserPets')
 
     async def insert_user_pet(self, user_id: int, pet_name: Optional[str] = None, pet_breed: Optional[str] = None) -> None:
         """ Inserts a User Pet.
@@ -10,7 +10,7 @@ from extra import utils
 import os
 from datetime import datetime
 import random
-from typing import List, Union
+from typing import List, Optional, Union
 
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 
@@ -183,21 +183,25 @@ class Warrior(Player):
         else:
             await ctx.send(f"**You had a `50%` chance of smashing {target.mention}'s Divine Protection shield, but you missed it, {attacker.mention}!**")
 
-    async def check_knock_outs(self) -> None:
+    async def check_knock_outs(self, knock_outs: Optional[List[List[Union[str, int]]]] = None) -> int:
 
-        """ Check on-going knock-outs and their expiration time. """
+        """ Check on-going knock-outs and their expiration time.
+        :param knock_outs: The expired knock-out skill actions, if they were already fetched. [Optional] """
 
-        knock_outs = await self.get_expired_knock_outs()
+        if knock_outs is None:
+            knock_outs = await self.get_expired_knock_outs()
         for ko in knock_outs:
             await self.delete_skill_action_by_target_id_and_skill_type(ko[3], 'hit')
 
             channel = self.bots_txt
 
-            await channel.send(
+            await self.sweep_call(channel.send(
                 content=f"<@{ko[0]}>",
                 embed=discord.Embed(
                     description=f"**<@{ko[3]}> got better from <@{ko[0]}>'s knock-out! 🤕**",
-                    color=discord.Color.red()))
+                    color=discord.Color.red())))
+
+        return len(knock_outs)
 
     async def get_hit_embed(self, channel, perpetrator_id: int, target_id: int) -> discord.Embed:
         """ Makes an embedded message for a knock-out action.
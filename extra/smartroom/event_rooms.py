@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class EventRoomsTable(commands.Cog):
@@ -60,14 +60,7 @@ class EventRoomsTable(commands.Cog):
     async def table_event_rooms_exists(self) -> bool:
         """ Checks whether the EventRooms table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'EventRooms'")
-        table_info = await mycursor.fetchall()
-        await mycursor.close()
-        if table_info:
-            return True
-        else:
-            return False
+        return await table_exists('EventRooms')
 
     async def insert_event_room(self, user_id: int, vc_id: int = None, txt_id: int = None) -> None:
         """ Inserts an Event Room by VC ID.
@@ -1,5 +1,5 @@
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Optional
 
 class PremiumVcTable(commands.Cog):
@@ -57,16 +57,7 @@ class PremiumVcTable(commands.Cog):
 	async def table_premium_vc_exists(self) -> bool:
 		""" Checks whether the PremiumVc table exists. """
 
-		mycursor, db = await the_database()
-		await mycursor.execute("SHOW TABLE STATUS LIKE 'PremiumVc'")
-		table_info = await mycursor.fetchall()
-		await mycursor.close()
-
-		if len(table_info) == 0:
-			return False
-
-		else:
-			return True
+		return await table_exists('PremiumVc')
 
 	async def insert_premium_vc(self, user_id: int, user_vc: int, user_txt: int) -> None:
 		""" Inserts a Premium Room.
@@ -189,16 +180,7 @@ class GalaxyVcTable(commands.Cog):
 	async def table_galaxy_vc_exists(self) -> bool:
 		""" Checks whether the GalaxyVc table exists. """
 
-		mycursor, db = await the_database()
-		await mycursor.execute("SHOW TABLE STATUS LIKE 'GalaxyVc'")
-		table_info = await mycursor.fetchall()
-		await mycursor.close()
-
-		if len(table_info) == 0:
-			return False
-
-		else:
-			return True
+		return await table_exists('GalaxyVc')
 
 	async def insert_galaxy_vc(self, user_id: int, user_cat: int, user_vc: int, user_txt1: int, user_ts: int) -> None:
 		""" Inserts a Galaxy Room.
@@ -468,15 +450,7 @@ class UserVcStampTable(commands.Cog):
 	async def table_user_vc_ts_exists(self) -> bool:
 		""" Checks whether the UserVCstamp table exists. """
 
-		mycursor, _ = await the_database()
-		await mycursor.execute("SHOW TABLE STATUS LIKE 'UserVCstamp'")
-		exists = await mycursor.fetchone()
-		await mycursor.close()
-
-		if exists:
-			return True
-		else:
-			return False
+		return await table_exists('UserVCstamp')
 
 	async def insert_user_vc(self, user_id: int, the_time: int) -> None:
 		""" Inserts a user into the UserVCstamp table.
@@ -1,5 +1,5 @@
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Tuple
 
 class QueuesTable(commands.Cog):
@@ -75,14 +75,7 @@ class QueuesTable(commands.Cog):
     async def check_table_queues_exists(self) -> bool:
         """ Checks whether the Queues table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'Queues'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('Queues')
 
     async def insert_queue_users(self, users: List[int]) -> None:
         """ Insert users into a Queue.
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union
 
 class ScheduledEventsTable(commands.Cog):
@@ -70,14 +70,7 @@ class ScheduledEventsTable(commands.Cog):
     async def check_scheduled_events_exists(self) -> bool:
         """ Checks whether the ScheduledEvents table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'ScheduledEvents'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('ScheduledEvents')
 
     async def insert_advertising_event(self, event_label: str, current_ts: int) -> None:
         """ Inserts an advertising event.
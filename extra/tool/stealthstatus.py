@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List
 
 class StealthStatusTable(commands.Cog):
@@ -67,15 +67,7 @@ class StealthStatusTable(commands.Cog):
     async def check_table_stealth_status_exists(self) -> bool:
         """ Checks whether the StealthStatus table exists """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'StealthStatus'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('StealthStatus')
 
     async def insert_stealth_status(self, user_id: int, state: int = 1) -> None:
         """ Inserts a stealth status for a user.
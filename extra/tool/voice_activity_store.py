@@ -0,0 +1,217 @@
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+voice_activity_limit_hours = int(os.getenv('VOICE_ACTIVITY_LIMIT_HOURS', 6))
+
+# (minute of the day, channel ID, member ID)
+Record = Tuple[int, int, int]
+
+
+class HourBucket:
+    """ Columns of the voice channel records of one hour of the day, sorted by minute. """
+
+    __slots__ = ('hour', 'minutes', 'channels', 'members')
+
+    def __init__(self, hour: int) -> None:
+        """ Class init method.
+        :param hour: The hour of the day. """
+
+        self.hour = hour
+        self.minutes = array('H')
+        # Interned indexes of the channels and members
+        self.channels = array('I')
+        self.members = array('I')
+
+    def append(self, minute: int, channel: int, member: int) -> None:
+        """ Appends a record to the bucket.
+        :param minute: The minute of the day.
+        :param channel: The interned index of the channel.
+        :param member: The interned index of the member. """
+
+        if not self.minutes or self.minutes[-1] <= minute:
+            self.minutes.append(minute)
+            self.channels.append(channel)
+            self.members.append(member)
+            return
+
+        # Out of order (e.g. the clock went back), so it's inserted where it belongs
+        position = bisect_right(self.minutes, minute)
+        self.minutes.insert(position, minute)
+        self.channels.insert(position, channel)
+        self.members.insert(position, member)
+
+    def positions(self, start: int, end: int) -> range:
+        """ Gets the positions of the records between two minutes of the day, inclusive.
+        :param start: The first minute.
+        :param end: The last minute. """
+
+        return range(bisect_left(self.minutes, start), bisect_right(self.minutes, end))
+
+
+class VoiceActivityStore:
+    """ Columnar storage of who was in which voice channel over the last hours.
+
+    Records are kept as minute-of-the-day buckets, one per hour, in a ring of `limit_hours` hours,
+    so expiring the oldest hour is dropping its bucket. Channel and member names are interned,
+    and time range lookups are binary searches over the buckets' sorted minutes. """
+
+    def __init__(self, limit_hours: int = voice_activity_limit_hours) -> None:
+        """ Class init method.
+        :param limit_hours: The amount of hours to keep. """
+
+        # The buckets are keyed by the hour of the day, so a day is the most it can keep apart
+        self.limit_hours = max(1, min(limit_hours, 24))
+        self._buckets: Deque[HourBucket] = deque()
+        self._ids: List[int] = []
+        self._names: List[str] = []
+        self._index: Dict[int, int] = {}
+
+        # What's still to be written into the database
+        self.pending: List[Record] = []
+        self.pending_names: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return sum(len(bucket.minutes) for bucket in self._buckets)
+
+    @property
+    def hours(self) -> List[int]:
+        """ The hours of the day in the store, from the oldest to the newest. """
+
+        return [bucket.hour for bucket in self._buckets]
+
+    def clear(self) -> None:
+        """ Drops all records. """
+
+        self._buckets.clear()
+        self._ids.clear()
+        self._names.clear()
+        self._index.clear()
+        self.pending.clear()
+        self.pending_names.clear()
+
+    def intern(self, discord_id: int, name: str) -> int:
+        """ Gets the interned index of a channel or member, updating its name.
+        :param discord_id: The ID of the channel or member.
+        :param name: Its current name. """
+
+        if (index := self._index.get(discord_id)) is None:
+            index = len(self._ids)
+            self._index[discord_id] = index
+            self._ids.append(discord_id)
+            self._names.append(name)
+            self.pending_names[discord_id] = name
+        elif self._names[index] != name:
+            self._names[index] = name
+            self.pending_names[discord_id] = name
+
+        return index
+
+    def get_name(self, discord_id: int) -> Optional[str]:
+        """ Gets the last known name of a channel or member.
+        :param discord_id: The ID of the channel or member. """
+
+        if (index := self._index.get(discord_id)) is None:
+            return None
+        return self._names[index]
+
+    def add(self, minute: int, channel_id: int, channel_name: str, member_id: int, member_name: str) -> List[int]:
+        """ Adds a record of a member being in a voice channel.
+        :param minute: The minute of the day.
+        :param channel_id: The ID of the channel.
+        :param channel_name: The name of the channel.
+        :param member_id: The ID of the member.
+        :param member_name: The name of the member.
+        :returns: The hours of the day that expired. """
+
+        expired = self._rotate(minute // 60)
+        channel, member = self.intern(channel_id, channel_name), self.intern(member_id, member_name)
+        self._buckets[-1].append(minute, channel, member)
+        self.pending.append((minute, channel_id, member_id))
+        return expired
+
+    def _rotate(self, hour: int) -> List[int]:
+        """ Makes sure the newest bucket is the one of the given hour, expiring the ones that fell out of the ring.
+        :param hour: The current hour of the day. """
+
+        if self._buckets and self._buckets[-1].hour == hour:
+            return []
+
+        self._buckets.append(HourBucket(hour))
+        expired = []
+        while len(self._buckets) > self.limit_hours or (hour - self._buckets[0].hour) % 24 >= self.limit_hours:
+            expired.append(self._buckets.popleft().hour)
+
+        if expired:
+            self._compact()
+        return expired
+
+    def _compact(self) -> None:
+        """ Drops the interned channels and members that aren't in any record anymore. """
+
+        used = sorted({index for bucket in self._buckets for column in (bucket.channels, bucket.members) for index in column})
+        if len(used) == len(self._ids):
+            return
+
+        remap = {old: new for new, old in enumerate(used)}
+        for bucket in self._buckets:
+            bucket.channels = array('I', (remap[index] for index in bucket.channels))
+            bucket.members = array('I', (remap[index] for index in bucket.members))
+
+        self._ids = [self._ids[index] for index in used]
+        self._names = [self._names[index] for index in used]
+        self._index = {discord_id: index for index, discord_id in enumerate(self._ids)}
+
+    def load(self, records: Iterable[Record], names: Iterable[Tuple[int, str]], current_minute: int) -> List[int]:
+        """ Rebuilds the store from the records in the database.
+        :param records: The (minute of the day, channel ID, member ID) records.
+        :param names: The (ID, name) pairs of the channels and members.
+        :param current_minute: The current minute of the day.
+        :returns: The hours of the day that expired. """
+
+        self.clear()
+        names = dict(names)
+        current_hour = current_minute // 60
+
+        # The hours are replayed from the oldest to the newest, counting back from the current one
+        records = sorted(records, key=lambda record: (-((current_hour - record[0] // 60) % 24), record[0]))
+        expired = []
+        for minute, channel_id, member_id in records:
+            expired.extend(self.add(minute, channel_id, names.get(channel_id, str(channel_id)), member_id, names.get(member_id, str(member_id))))
+        expired.extend(self._rotate(current_hour))
+
+        self.pending.clear()
+        self.pending_names.clear()
+        return expired
+
+    def scan(self, start: int, end: int, channel_id: Optional[int] = None, member_id: Optional[int] = None) -> Iterator[Record]:
+        """ Gets the records between two minutes of the day, inclusive.
+        :param start: The first minute of the day.
+        :param end: The last minute of the day. If it's before the first one, the range goes past midnight.
+        :param channel_id: The ID of the channel to filter by. [Optional]
+        :param member_id: The ID of the member to filter by. [Optional] """
+
+        channel = member = None
+        if channel_id is not None and (channel := self._index.get(channel_id)) is None:
+            return
+        if member_id is not None and (member := self._index.get(member_id)) is None:
+            return
+
+        ranges = [(start, end)] if start <= end else [(start, 1439), (0, end)]
+        for bucket in self._buckets:
+            first, last = bucket.hour * 60, bucket.hour * 60 + 59
+            for range_start, range_end in ranges:
+                if range_end < first or range_start > last:
+                    continue
+
+                for position in bucket.positions(range_start, range_end):
+                    if channel is not None and bucket.channels[position] != channel:
+                        continue
+                    if member is not None and bucket.members[position] != member:
+                        continue
+                    yield bucket.minutes[position], self._ids[bucket.channels[position]], self._ids[bucket.members[position]]
+
+
+voice_activity_store = VoiceActivityStore()
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands, tasks
 
-from mysqldb import the_database
+from mysqldb import the_database, table_exists
 from typing import List, Union, Optional
 from extra import utils
 
@@ -74,14 +74,7 @@ class VoiceChannelHistoryTable(commands.Cog):
     async def check_voice_channel_history_exists(self) -> bool:
         """ Checks whether the VoiceChannelHistory table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'VoiceChannelHistory'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
-        if exists:
-            return True
-        else:
-            return False
+        return await table_exists('VoiceChannelHistory')
 
     async def insert_voice_channel_history(self, user_id: int, action_label: str, action_ts: int, vc_id: int, vc2_id: Optional[int] = None) -> None:
         """ Inserts a channel into the user's Voice Channel history.
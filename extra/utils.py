@@ -3,17 +3,34 @@ from discord.ext import commands
 from datetime import datetime
 import aiohttp
 
+import os
 import re
 from pytz import timezone
-from io import BytesIO
-from PIL import Image, ImageDraw
+from PIL import Image
 from typing import List, Dict, Optional, Union
 
 from extra.customerrors import CommandNotReady
+from extra.imaging.avatars import avatar_cache
+from extra.rolemembership import role_index
 from collections import OrderedDict
 import shlex
 
-session = aiohttp.ClientSession()
+http_max_connections = int(os.getenv('HTTP_MAX_CONNECTIONS', 20))
+session: Optional[aiohttp.ClientSession] = None
+
+def get_session() -> aiohttp.ClientSession:
+    """ Gets the bot's shared, connection-limited HTTP session, creating it if needed. """
+
+    global session
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=http_max_connections))
+    return session
+
+async def close_session() -> None:
+    """ Closes the shared HTTP session. """
+
+    if session is not None and not session.closed:
+        await session.close()
 
 async def get_timestamp(tz: str = 'Etc/GMT') -> int:
     """ Gets the current timestamp.
@@ -56,9 +73,8 @@ def is_allowed(roles: List[int], check_adm: Optional[bool] = True, throw_exc: Op
             if perms.administrator:
                 return True
                 
-        for rid in roles:
-            if rid in [role.id for role in member.roles]:
-                return True
+        if role_index.has_any_role(member, roles):
+            return True
 
         if throw_exc:
             raise commands.MissingAnyRole(roles)
@@ -367,40 +383,11 @@ def not_ready():
     return commands.check(real_check)
 
 async def get_user_pfp(member, thumb_width: int = 59) -> Image:
-    """ Gets the user's profile picture.
+    """ Gets the user's profile picture, as a round thumbnail.
     :param member: The member from whom to get the profile picture.
     :param thumb_width: The width of the thumbnail. [Default = 59] """
 
-    async with session.get(str(member.display_avatar)) as response:
-        image_bytes = await response.content.read()
-        with BytesIO(image_bytes) as pfp:
-            image = Image.open(pfp)
-            im = image.convert('RGBA')
-
-    def crop_center(pil_img, crop_width, crop_height):
-        img_width, img_height = pil_img.size
-        return pil_img.crop(((img_width - crop_width) // 2,
-                                (img_height - crop_height) // 2,
-                                (img_width + crop_width) // 2,
-                                (img_height + crop_height) // 2))
-
-    def crop_max_square(pil_img):
-        return crop_center(pil_img, min(pil_img.size), min(pil_img.size))
-
-    def mask_circle_transparent(pil_img, blur_radius, offset=0):
-        offset = blur_radius * 2 + offset
-        mask = Image.new("L", pil_img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((offset, offset, pil_img.size[0] - offset, pil_img.size[1] - offset), fill=255)
-
-        result = pil_img.copy()
-        result.putalpha(mask)
-
-        return result
-
-    im_square = crop_max_square(im).resize((thumb_width, thumb_width), Image.LANCZOS)
-    im_thumb = mask_circle_transparent(im_square, 4)
-    return im_thumb
+    return await avatar_cache.get(member, thumb_width, get_session())
 
 async def get_member_public_flags(member: discord.Member) -> List[str]:
     """ Gets the member's public flags.
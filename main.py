@@ -5,12 +5,22 @@ from dotenv import load_dotenv
 from discord.ext import commands, tasks
 
 from extra import utils
-from typing import List
+from typing import Dict, List
 import os
+import time
 from datetime import datetime
 from itertools import cycle
 
 from extra.useful_variables import patreon_roles
+from mysqldb import sloth_pool, django_pool, schema, close_pools
+from extra.currency.activitybuffer import activity_buffer
+from extra.moderation.modactivitybuffer import mod_activity_buffer
+from extra.imaging.renderer import renderer
+from extra.imaging.rendercache import profile_cache
+from extra.imaging.workingset import working_images
+from extra.ranking import ranking
+from extra.scheduler import scheduler
+from extra.rolemembership import role_index
 
 from extra.customerrors import (
     MissingRequiredSlothClass, ActionSkillOnCooldown, CommandNotReady, 
@@ -50,14 +60,37 @@ shades_of_pink = cycle([(252, 15, 192), (255, 0, 255), (248, 24, 148),
               (223, 82, 134), (254, 127, 156), (253, 171, 159)
               ])
 
+class SlothBot(commands.Bot):
+    """ The bot's client, which also releases the shared resources on shutdown. """
+
+    async def close(self) -> None:
+        """ Closes the bot, stops the deadline scheduler, flushes the pending activity counters
+        and moderator activity, closes the database pools, the HTTP session and the render workers. """
+
+        await super().close()
+        scheduler.stop()
+        await activity_buffer.stop()
+        await mod_activity_buffer.stop()
+        await close_pools()
+        await utils.close_session()
+        renderer.shutdown()
+
 # Making the client variable
-client = commands.Bot(command_prefix='z!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
+client = SlothBot(command_prefix='z!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
 
 # Tells when the bot is online
 @client.event
 async def on_ready() -> None:
-    change_status.start()
-    change_color.start()
+    await sloth_pool.start()
+    await schema.load()
+    activity_buffer.start()
+    renderer.start()
+    ranking.start()
+    role_index.build(client.get_guild(server_id))
+    if not change_status.is_running():
+        change_status.start()
+    if not change_color.is_running():
+        change_color.start()
     print('Bot is ready!')
 
 
@@ -75,28 +108,17 @@ async def on_member_update(before, after) -> None:
     if not after.guild:
         return
 
-    roles = before.roles
-    roles2 = after.roles
-    if len(roles2) < len(roles):
-        return
-
-    new_role = None
-
-    for r2 in roles2:
-        if r2 not in roles:
-            new_role = r2
-            break
-
-    if new_role:
-        for pr in patreon_roles.keys():
-            if new_role.id == pr:
-                support_us_channel = discord.utils.get(before.guild.channels, id=support_us_channel_id)
-                await support_us_channel.send(patreon_roles[pr][0].format(member=after))
-                return await after.send(patreon_roles[pr][1])
+    new_role_ids = role_index.update_member(before, after)
+    for pr in patreon_roles.keys():
+        if pr in new_role_ids:
+            support_us_channel = discord.utils.get(before.guild.channels, id=support_us_channel_id)
+            await support_us_channel.send(patreon_roles[pr][0].format(member=after))
+            return await after.send(patreon_roles[pr][1])
 
 
 @client.event
 async def on_member_remove(member) -> None:
+    role_index.remove_member(member)
     roles = [role for role in member.roles]
     channel = discord.utils.get(member.guild.channels, id=admin_commands_channel_id)
     embed = discord.Embed(title=member.name, description=f"User has left the server.", colour=discord.Colour.dark_red())
@@ -127,7 +149,7 @@ async def on_command_error(ctx, error) -> None:
         await ctx.send(error)
 
     elif isinstance(error, commands.MissingAnyRole):
-        role_names = [f"**{str(discord.utils.get(ctx.guild.roles, id=role_id))}**" for role_id in error.missing_roles]
+        role_names = [f"**{str(ctx.guild.get_role(role_id))}**" for role_id in error.missing_roles]
         await ctx.send(f"You are missing at least one of the required roles: {', '.join(role_names)}")
 
     elif isinstance(error, commands.errors.RoleNotFound):
@@ -207,7 +229,7 @@ async def on_application_command_error(ctx, error) -> None:
         await ctx.respond("**You can't do that!**")
 
     elif isinstance(error, commands.MissingAnyRole):
-        role_names = [f"**{str(discord.utils.get(ctx.guild.roles, id=role_id))}**" for role_id in error.missing_roles]
+        role_names = [f"**{str(ctx.guild.get_role(role_id))}**" for role_id in error.missing_roles]
         await ctx.respond(f"You are missing at least one of the required roles: {', '.join(role_names)}")
 
     elif isinstance(error, commands.errors.RoleNotFound):
@@ -443,12 +465,99 @@ async def reload(ctx, extension: str = None) -> None:
     client.load_extension(f'cogs.{extension}')
     return await ctx.send(f"**{extension} reloaded!**", delete_after=3)
 
+@client.command(hidden=True)
+@commands.has_permissions(administrator=True)
+async def db_stats(ctx) -> None:
+    """ Shows the usage statistics of the database pools. """
+
+    embed = discord.Embed(title="__Database Pools__", color=ctx.author.color, timestamp=ctx.message.created_at)
+    for name, pool in (('Sloth', sloth_pool), ('Django', django_pool)):
+        stats = pool.stats()
+        embed.add_field(
+            name=name,
+            value=f"**In use:** `{stats['in_use']}/{stats['max_size']}` | **Idle:** `{stats['idle']}`\n"
+            f"**Acquisitions:** `{stats['acquisitions']}` | **Avg wait:** `{stats['avg_wait_ms']:.2f}ms` | **Max wait:** `{stats['max_wait_ms']:.2f}ms`",
+            inline=False)
+    await ctx.send(embed=embed)
+
+@client.command(hidden=True)
+@commands.has_permissions(administrator=True)
+async def reload_schema(ctx) -> None:
+    """ Probes the database tables again, in case they were changed outside the bot. """
+
+    tables = await schema.load()
+    await ctx.send(f"**Schema reloaded, `{len(tables)}` tables found!**", delete_after=3)
+
+@client.command(hidden=True)
+@commands.has_permissions(administrator=True)
+async def render_stats(ctx) -> None:
+    """ Shows the usage statistics of the image renderer. """
+
+    stats = renderer.stats()
+    embed = discord.Embed(title="__Image Renderer__", color=ctx.author.color, timestamp=ctx.message.created_at)
+    embed.add_field(
+        name="Workers",
+        value=f"**Workers:** `{stats['workers']}` | **Running:** `{stats['running']}/{stats['max_concurrency']}`\n"
+        f"**Queued:** `{stats['queued']}` | **Max queued:** `{stats['max_queued']}`",
+        inline=False)
+    embed.add_field(
+        name="Renders",
+        value=f"**Renders:** `{stats['renders']}` | **Failures:** `{stats['failures']}`\n"
+        f"**Avg time:** `{stats['avg_time_ms']:.2f}ms` | **Max time:** `{stats['max_time_ms']:.2f}ms`",
+        inline=False)
+    cache_stats = profile_cache.stats()
+    embed.add_field(
+        name="Profile Cache",
+        value=f"**Entries:** `{cache_stats['entries']}` | **Size:** `{cache_stats['size_mb']:.2f}/{cache_stats['max_mb']:.0f}MB`\n"
+        f"**Hits:** `{cache_stats['hits']}` | **Misses:** `{cache_stats['misses']}`",
+        inline=False)
+    working_stats = working_images.stats()
+    embed.add_field(
+        name="Working Images",
+        value=f"**Entries:** `{working_stats['entries']}` | **Size:** `{working_stats['size_mb']:.2f}/{working_stats['max_mb']:.0f}MB`\n"
+        f"**Hits:** `{working_stats['hits']}` | **Misses:** `{working_stats['misses']}`",
+        inline=False)
+    await ctx.send(embed=embed)
+
+@client.command(hidden=True)
+@commands.has_permissions(administrator=True)
+async def cog_stats(ctx) -> None:
+    """ Shows how long each cog took to load on startup. """
+
+    rows = sorted(cog_load_times.items(), key=lambda item: -item[1])
+    total = sum(load_time for _, load_time in rows)
+    embed = discord.Embed(
+        title="__Cog Load Times__",
+        description='\n'.join(f"**{name}:** `{load_time * 1000:.0f}ms`" for name, load_time in rows[:25]),
+        color=ctx.author.color, timestamp=ctx.message.created_at)
+    embed.set_footer(text=f"{len(rows)} cogs loaded in {total:.2f}s")
+    await ctx.send(embed=embed)
+
 forbidden_files: List[str] = [
     # 'createdynamicroom.py'
 ]
 
-for filename in os.listdir('./cogs'):
-    if filename.endswith('.py') and filename not in forbidden_files:
-        client.load_extension(f'cogs.{filename[:-3]}')
+# How long each cog took to load, in seconds
+# PS: It includes the first import of the cog's dependencies, so shared ones count for the first cog that imports them
+cog_load_times: Dict[str, float] = {}
+
+def load_cogs() -> None:
+    """ Loads all cogs, timing how long each one takes to load,
+    and prints the slowest ones. """
+
+    for filename in sorted(os.listdir('./cogs')):
+        if not filename.endswith('.py') or filename in forbidden_files:
+            continue
+
+        name = filename[:-3]
+        start = time.perf_counter()
+        client.load_extension(f'cogs.{name}')
+        cog_load_times[name] = time.perf_counter() - start
+
+    print(f'Loaded {len(cog_load_times)} cogs in {sum(cog_load_times.values()):.2f}s')
+    for name, load_time in sorted(cog_load_times.items(), key=lambda item: -item[1])[:10]:
+        print(f'  {name}: {load_time * 1000:.0f}ms')
+
+load_cogs()
 
 client.run(os.getenv('TOKEN'))
@@ -1,31 +1,234 @@
 import aiomysql
 import asyncio
-#from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager
 import os
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
 load_dotenv()
 
-loop = asyncio.get_event_loop()
-
-#@asynccontextmanager
-async def the_database():
-    pool = await aiomysql.create_pool(
-        host=os.getenv("SLOTH_DB_HOST"),
-        user=os.getenv("SLOTH_DB_USER"),
-        password=os.getenv("SLOTH_DB_PASSWORD"),
-        db=os.getenv("SLOTH_DB_NAME"), loop=loop)
-    db = await pool.acquire()
-    mycursor = await db.cursor()
-    return mycursor, db
-
-django_loop = asyncio.get_event_loop()
-async def the_django_database():
-    pool = await aiomysql.create_pool(
-        host=os.getenv("DJANGO_DB_HOST"),
-        user=os.getenv("DJANGO_DB_USER"),
-        password=os.getenv("DJANGO_DB_PASSWORD"),
-        db=os.getenv("DJANGO_DB_NAME"), loop=django_loop)
-
-    db = await pool.acquire()
-    mycursor = await db.cursor()
-    return mycursor, db
+
+class PooledCursor:
+    """ Cursor proxy that gives its connection back to the pool when it's closed.
+
+    It lets the old `mycursor, db = await the_database()` call sites keep working,
+    as they all end up calling `await mycursor.close()`. """
+
+    def __init__(self, cursor: aiomysql.Cursor, connection: aiomysql.Connection, pool: 'DatabasePool') -> None:
+        self._cursor = cursor
+        self._connection = connection
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    async def execute(self, query: str, args: Any = None) -> int:
+        """ Executes a query, keeping the schema registry in sync with CREATE/DROP TABLE statements. """
+
+        result = await self._cursor.execute(query, args)
+        if self._pool is sloth_pool and (match := ddl_regex.match(query)):
+            if match.group(1).upper() == 'CREATE':
+                schema.add(match.group(2))
+            else:
+                schema.discard(match.group(2))
+        return result
+
+    async def close(self) -> None:
+        """ Closes the cursor and releases its connection back to the pool. """
+
+        try:
+            await self._cursor.close()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """ Releases the connection back to the pool, only once. """
+
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+    def __del__(self) -> None:
+        # Safety net for call sites that raise before closing their cursor
+        self._release()
+
+
+class DatabasePool:
+    """ Process-wide aiomysql connection pool, configured from environment variables.
+    :param prefix: The prefix of the env vars, e.g. `SLOTH_DB`. """
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self._pool: Optional[aiomysql.Pool] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._acquisitions: int = 0
+        self._total_wait: float = 0
+        self._max_wait: float = 0
+
+    async def start(self) -> aiomysql.Pool:
+        """ Creates the pool, if it wasn't created yet, and returns it. """
+
+        if self._pool is not None:
+            return self._pool
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._pool is None:
+                self._pool = await aiomysql.create_pool(
+                    host=os.getenv(f"{self.prefix}_HOST"),
+                    user=os.getenv(f"{self.prefix}_USER"),
+                    password=os.getenv(f"{self.prefix}_PASSWORD"),
+                    db=os.getenv(f"{self.prefix}_NAME"),
+                    minsize=int(os.getenv(f"{self.prefix}_POOL_MIN_SIZE", 1)),
+                    maxsize=int(os.getenv(f"{self.prefix}_POOL_MAX_SIZE", 10)),
+                    pool_recycle=int(os.getenv(f"{self.prefix}_POOL_RECYCLE", 3600)),
+                    autocommit=True)
+
+        return self._pool
+
+    async def acquire(self) -> Tuple[PooledCursor, aiomysql.Connection]:
+        """ Acquires a connection from the pool.
+
+        PS: The connection is released back when the returned cursor is closed. """
+
+        pool = await self.start()
+        start = time.perf_counter()
+        db = await pool.acquire()
+        wait = time.perf_counter() - start
+
+        self._acquisitions += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+        try:
+            mycursor = await db.cursor()
+        except Exception:
+            pool.release(db)
+            raise
+
+        return PooledCursor(mycursor, db, self), db
+
+    def release(self, db: aiomysql.Connection) -> None:
+        """ Releases a connection back to the pool.
+        :param db: The connection to release. """
+
+        if self._pool is not None:
+            self._pool.release(db)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Tuple[PooledCursor, aiomysql.Connection]]:
+        """ Acquires a connection and releases it back to the pool on exit. """
+
+        mycursor, db = await self.acquire()
+        try:
+            yield mycursor, db
+        finally:
+            await mycursor.close()
+
+    async def close(self) -> None:
+        """ Closes the pool, waiting for its connections to be released. """
+
+        if self._pool is None:
+            return
+
+        pool, self._pool = self._pool, None
+        pool.close()
+        await pool.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        """ Gets the current usage statistics of the pool. """
+
+        size = self._pool.size if self._pool else 0
+        idle = self._pool.freesize if self._pool else 0
+        return {
+            'size': size,
+            'in_use': size - idle,
+            'idle': idle,
+            'max_size': self._pool.maxsize if self._pool else 0,
+            'acquisitions': self._acquisitions,
+            'avg_wait_ms': (self._total_wait / self._acquisitions) * 1000 if self._acquisitions else 0,
+            'max_wait_ms': self._max_wait * 1000,
+        }
+
+
+class SchemaRegistry:
+    """ In-memory registry of the tables that exist in the Sloth database.
+
+    All tables are probed with a single query the first time it's needed,
+    and existence checks are answered from memory afterwards. """
+
+    def __init__(self) -> None:
+        self._tables: Optional[Set[str]] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def load(self) -> Set[str]:
+        """ (Re)loads the names of all tables in the database. """
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            async with sloth_pool.connection() as (mycursor, _):
+                await mycursor.execute("SHOW TABLES")
+                self._tables = {row[0].lower() for row in await mycursor.fetchall()}
+
+        return self._tables
+
+    async def table_exists(self, table_name: str) -> bool:
+        """ Checks whether a table exists in the database.
+        :param table_name: The name of the table. """
+
+        tables = self._tables if self._tables is not None else await self.load()
+        return table_name.lower() in tables
+
+    def add(self, table_name: str) -> None:
+        """ Registers a table that was just created.
+        :param table_name: The name of the table. """
+
+        if self._tables is not None:
+            self._tables.add(table_name.lower())
+
+    def discard(self, table_name: str) -> None:
+        """ Unregisters a table that was just dropped.
+        :param table_name: The name of the table. """
+
+        if self._tables is not None:
+            self._tables.discard(table_name.lower())
+
+    def invalidate(self) -> None:
+        """ Invalidates the registry, so all tables are probed again on the next check. """
+
+        self._tables = None
+
+
+ddl_regex = re.compile(r"\s*(CREATE|DROP)\s+TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?`?(\w+)`?", re.IGNORECASE)
+
+sloth_pool = DatabasePool("SLOTH_DB")
+django_pool = DatabasePool("DJANGO_DB")
+schema = SchemaRegistry()
+
+
+async def the_database() -> Tuple[PooledCursor, aiomysql.Connection]:
+    """ Gets a cursor and a connection from the Sloth database pool. """
+
+    return await sloth_pool.acquire()
+
+async def table_exists(table_name: str) -> bool:
+    """ Checks whether a table exists in the Sloth database, using the schema registry.
+    :param table_name: The name of the table. """
+
+    return await schema.table_exists(table_name)
+
+async def the_django_database() -> Tuple[PooledCursor, aiomysql.Connection]:
+    """ Gets a cursor and a connection from the Django database pool. """
+
+    return await django_pool.acquire()
+
+async def close_pools() -> None:
+    """ Closes all database pools. """
+
+    await sloth_pool.close()
+    await django_pool.close()
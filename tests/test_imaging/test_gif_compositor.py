@@ -0,0 +1,106 @@
+from io import BytesIO
+from typing import List, Tuple
+
+from PIL import Image, ImageSequence
+
+from extra.gif_manager import GIFCompositor
+
+RED = (255, 0, 0, 255)
+BLUE = (0, 0, 255, 255)
+
+
+def make_layer_frames() -> List[Image.Image]:
+    """ Makes the frames of a layer whose red square moves to the right, leaving transparent pixels behind. """
+
+    frames = []
+    for x in (0, 8, 16):
+        frame = Image.new('RGBA', (32, 16), (0, 0, 0, 0))
+        frame.paste(RED, (x, 0, x + 16, 16))
+        frames.append(frame)
+    return frames
+
+
+def expected_frames(background: Image.Image, layers: List[Image.Image], cords: Tuple[int, int]) -> List[Image.Image]:
+    """ Composites the frames the GIF should show.
+    :param background: The background of the GIF.
+    :param layers: The frames of the layer.
+    :param cords: Where the layer is pasted. """
+
+    frames = []
+    for layer in layers:
+        frame = background.copy()
+        frame.paste(layer, cords, layer)
+        frames.append(frame)
+    return frames
+
+
+def decode(background: Image.Image, layers: List[Image.Image], cords: Tuple[int, int]) -> List[Image.Image]:
+    """ Encodes a GIF with the compositor and decodes its frames back.
+    :param background: The background of the GIF.
+    :param layers: The frames of the layer.
+    :param cords: Where the layer is pasted. """
+
+    compositor = GIFCompositor(background=background, frame_duration=40, layers=[(layers, cords)])
+    with BytesIO() as fp:
+        compositor.export(fp)
+        fp.seek(0)
+        gif = Image.open(fp)
+        return [frame.convert('RGBA') for frame in ImageSequence.Iterator(gif)]
+
+
+def assert_same(decoded: Image.Image, expected: Image.Image) -> None:
+    """ Compares a decoded frame to the expected one, where fully transparent pixels only need to be transparent.
+    :param decoded: The decoded frame.
+    :param expected: The expected frame. """
+
+    assert decoded.size == expected.size
+    for xy, pixel in zip(((x, y) for y in range(expected.height) for x in range(expected.width)), expected.getdata()):
+        if pixel[3] == 0:
+            assert decoded.getpixel(xy)[3] == 0, xy
+        else:
+            assert decoded.getpixel(xy) == pixel, xy
+
+
+class TestGIFCompositor:
+    """ Class for testing that the GIFs the compositor encodes decode to the right frames. """
+
+    def test_opaque_background(self) -> None:
+        """ Checks the frames over an opaque background. """
+
+        background = Image.new('RGBA', (48, 32), BLUE)
+        layers = make_layer_frames()
+
+        decoded = decode(background, layers, (8, 8))
+
+        expected = expected_frames(background, layers, (8, 8))
+        assert len(decoded) == len(expected)
+        for decoded_frame, expected_frame in zip(decoded, expected):
+            assert_same(decoded_frame, expected_frame)
+
+    def test_transparent_background(self) -> None:
+        """ Checks the frames over a half-transparent background, where the layer clears what it drew before. """
+
+        background = Image.new('RGBA', (48, 32), (0, 0, 0, 0))
+        background.paste(BLUE, (24, 0, 48, 32))
+        layers = make_layer_frames()
+
+        decoded = decode(background, layers, (8, 8))
+
+        expected = expected_frames(background, layers, (8, 8))
+        assert len(decoded) == len(expected)
+        for decoded_frame, expected_frame in zip(decoded, expected):
+            assert_same(decoded_frame, expected_frame)
+        assert decoded[1].getpixel((12, 12))[3] == 0
+
+    def test_transparent_background_outside_layers(self) -> None:
+        """ Checks the frames over a background that's only transparent away from the layer. """
+
+        background = Image.new('RGBA', (48, 32), (0, 0, 0, 0))
+        background.paste(BLUE, (8, 8, 40, 24))
+        layers = make_layer_frames()
+
+        decoded = decode(background, layers, (8, 8))
+
+        expected = expected_frames(background, layers, (8, 8))
+        for decoded_frame, expected_frame in zip(decoded, expected):
+            assert_same(decoded_frame, expected_frame)
@@ -0,0 +1,115 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from extra.moderation.fakeaccountindex import FakeAccountIndex
+from extra.moderation.fakeaccounts import ModerationFakeAccountsTable
+
+A, B, C, D = 1, 2, 3, 4
+
+
+def make_database(edges=()) -> AsyncMock:
+    """ Makes a `the_database` function whose cursor returns the given associations.
+    :param edges: The (user ID, fake user ID) rows of the FakeAccounts table. """
+
+    cursor = MagicMock(execute=AsyncMock(), fetchall=AsyncMock(return_value=list(edges)), close=AsyncMock())
+    return AsyncMock(return_value=(cursor, MagicMock(commit=AsyncMock())))
+
+
+class TestFakeAccountIndex:
+    """ Class for testing the union-find index of the fake account associations. """
+
+    def setup_method(self) -> None:
+        """ Makes an index with the chain A-B-C. """
+
+        self.index = FakeAccountIndex()
+        self.index.link(A, B)
+        self.index.link(B, C)
+
+    def test_chain(self) -> None:
+        """ Checks all accounts of a chain are in the same cluster. """
+
+        assert self.index.get_accounts(A) == {B, C}
+        assert self.index.get_accounts(C) == {A, B}
+        assert sorted(self.index.get_edges(C)) == [(A, B), (B, C)]
+        assert self.index.find(A) == self.index.find(C)
+
+    def test_unlink_splits_cluster(self) -> None:
+        """ Removes B-C and checks C is no longer linked to A nor B. """
+
+        self.index.unlink(C, only_as_fake=True)
+
+        assert self.index.get_accounts(A) == {B}
+        assert self.index.get_accounts(B) == {A}
+        assert self.index.get_accounts(C) == set()
+        assert self.index.get_edges(A) == [(A, B)]
+        assert self.index.find(C) is None
+
+    def test_unlink_only_as_fake(self) -> None:
+        """ Removes B's associations as a fake account only, keeping the one where it's the main account. """
+
+        self.index.unlink(B, only_as_fake=True)
+
+        assert self.index.get_accounts(A) == set()
+        assert self.index.get_accounts(B) == {C}
+
+    def test_unlink_all(self) -> None:
+        """ Removes all of B's associations, leaving A and C apart. """
+
+        self.index.unlink(B)
+
+        assert self.index.get_accounts(A) == set()
+        assert self.index.get_accounts(C) == set()
+        assert self.index.get_edges(B) == []
+
+    def test_merge_clusters(self) -> None:
+        """ Links two clusters together and unlinks the bridge again. """
+
+        self.index.link(D, D + 1)
+        self.index.link(C, D)
+        assert self.index.get_accounts(A) == {B, C, D, D + 1}
+
+        self.index.unlink(D, only_as_fake=True)
+        assert self.index.get_accounts(A) == {B, C}
+        assert self.index.get_accounts(D) == {D + 1}
+
+    def test_missing_account(self) -> None:
+        """ Checks an account without associations has no cluster and unlinking it changes nothing. """
+
+        self.index.unlink(D)
+
+        assert self.index.get_accounts(D) == set()
+        assert self.index.get_edges(D) == []
+        assert self.index.get_accounts(A) == {B, C}
+
+    async def test_load(self) -> None:
+        """ Builds the index from the FakeAccounts rows. """
+
+        index = FakeAccountIndex()
+        with patch('extra.moderation.fakeaccountindex.the_database', make_database([(A, B), (B, C), (D, D + 1)])):
+            await index.ensure_loaded()
+
+        assert index.loaded
+        assert index.get_accounts(A) == {B, C}
+        assert index.get_accounts(D) == {D + 1}
+
+
+class TestAltIds:
+    """ Class for testing the moderation's alt lookups, which are answered by the index. """
+
+    async def test_get_alt_ids_after_deletion(self) -> None:
+        """ Links A-B-C, deletes B-C and checks `get_alt_ids` splits the cluster. """
+
+        index = FakeAccountIndex()
+        cog = ModerationFakeAccountsTable(MagicMock())
+        with patch('extra.moderation.fakeaccounts.fake_account_index', index), \
+                patch('extra.moderation.fakeaccounts.the_database', make_database()), \
+                patch('extra.moderation.fakeaccountindex.the_database', make_database()):
+            await index.load()
+            await cog.insert_fake_account(A, B)
+            await cog.insert_fake_account(B, C)
+            assert await cog.get_alt_ids(A) == {B, C}
+
+            await cog.delete_fake_account(C)
+
+            assert await cog.get_alt_ids(A) == {B}
+            assert await cog.get_alt_ids(B) == {A}
+            assert await cog.get_alt_ids(C) == set()
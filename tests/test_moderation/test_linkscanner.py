@@ -0,0 +1,119 @@
+from extra import useful_variables
+from extra.moderation.linkscanner import AhoCorasick, LinkScanner, link_scanner, normalize_link
+
+MALFORMED_LINK: str = 'https/giant.gfycat.com/RevolvingPassionateCirriped.mp4'
+
+
+class TestAhoCorasick:
+    """ Class for testing the Aho-Corasick automaton. """
+
+    def test_overlapping_patterns(self) -> None:
+        """ Finds patterns that overlap and patterns that are suffixes of others. """
+
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+
+        assert sorted(automaton.finditer('ushers')) == [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+    def test_repeated_pattern(self) -> None:
+        """ Finds every occurrence of a pattern, including ones that overlap. """
+
+        automaton = AhoCorasick(['aa'])
+
+        assert list(automaton.finditer('aaaa')) == [(0, 'aa'), (1, 'aa'), (2, 'aa')]
+
+    def test_no_match(self) -> None:
+        """ Finds nothing in a text without the patterns, nor with no patterns at all. """
+
+        assert list(AhoCorasick(['discord.gg/']).finditer('discord.com/channels')) == []
+        assert list(AhoCorasick([]).finditer('anything')) == []
+
+
+class TestNormalizeLink:
+    """ Class for testing how links are normalized. """
+
+    def test_scheme_and_www(self) -> None:
+        """ Drops the scheme and the `www.` prefix. """
+
+        assert normalize_link('https://www.example.com/x') == 'example.com/x'
+        assert normalize_link('http://example.com/x') == 'example.com/x'
+
+    def test_query_fragment_and_case(self) -> None:
+        """ Drops the query string, the fragment, the trailing slash and the angle brackets, and lowers the case. """
+
+        assert normalize_link(' <https://Gfycat.com/WetAngryFlamingo/?utm=x#top> ') == 'gfycat.com/wetangryflamingo'
+
+    def test_malformed_link(self) -> None:
+        """ Keeps a link without a proper scheme as it is. """
+
+        assert normalize_link(MALFORMED_LINK) == MALFORMED_LINK.lower()
+
+
+class TestLinkScanner:
+    """ Class for testing the banned link and invite scanner. """
+
+    def setup_method(self) -> None:
+        """ Makes a scanner with a few banned links. """
+
+        self.scanner = LinkScanner([
+            'https://example.com/x',
+            'https://giant.gfycat.com/TartAdolescentBird.mp4',
+            MALFORMED_LINK,
+        ])
+
+    def test_banned_link(self) -> None:
+        """ Finds banned links, whatever their scheme, case or surrounding text. """
+
+        assert self.scanner.scan('look https://example.com/x').banned_link == 'example.com/x'
+        assert self.scanner.scan('look <http://www.EXAMPLE.com/x>!').banned_link == 'example.com/x'
+        assert self.scanner.scan('example.com/x').banned_link == 'example.com/x'
+        assert self.scanner.scan('https://sub.example.com/x').banned_link == 'example.com/x'
+
+    def test_longer_links(self) -> None:
+        """ Ignores links that only contain a banned one. """
+
+        assert self.scanner.scan('https://evil-example.com/x') is None
+        assert self.scanner.scan('https://notexample.com/x') is None
+        assert self.scanner.scan('https://example.com/xyz') is None
+        assert self.scanner.scan('https://example.com/x-y') is None
+
+    def test_malformed_link(self) -> None:
+        """ Finds the malformed banned link on its own and inside a proxied link. """
+
+        assert self.scanner.scan(MALFORMED_LINK).banned_link == MALFORMED_LINK.lower()
+        proxied = f"https://images-ext-2.discordapp.net/external/pMKck/{MALFORMED_LINK}"
+        assert self.scanner.scan(proxied).banned_link == MALFORMED_LINK.lower()
+
+    def test_attachments(self) -> None:
+        """ Finds banned links among the attachments. """
+
+        result = self.scanner.scan('', ['https://giant.gfycat.com/TartAdolescentBird.mp4'])
+        assert result.banned_link == 'https://giant.gfycat.com/TartAdolescentBird.mp4'
+        assert self.scanner.scan('', ['https://giant.gfycat.com/Other.mp4']) is None
+
+    def test_invites(self) -> None:
+        """ Finds the first invite and where it starts. """
+
+        result = self.scanner.scan('join discord.gg/abc or Discord.com/invite/def')
+        assert (result.banned_link, result.invite_root, result.invite_index) == (None, 'discord.gg/', 5)
+
+        result = self.scanner.scan('https://example.com/x discord.com/invite/def')
+        assert (result.banned_link, result.invite_root) == ('example.com/x', 'discord.com/invite/')
+
+    def test_clean_message(self) -> None:
+        """ Finds nothing in a clean message. """
+
+        assert self.scanner.scan('hello there, https://example.org/x') is None
+
+    def test_reload(self) -> None:
+        """ Rebuilds the scanner from another list of banned links. """
+
+        self.scanner.load(['https://example.org/x'])
+
+        assert self.scanner.scan('https://example.com/x') is None
+        assert self.scanner.scan('https://example.org/x').banned_link == 'example.org/x'
+
+    def test_every_banned_link(self) -> None:
+        """ Checks each of the bot's banned links is found when it's posted. """
+
+        for link in useful_variables.banned_links:
+            assert link_scanner.scan(f"look {link} here").banned_link is not None, link
@@ -0,0 +1,163 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from typing import List, Tuple
+
+from extra.ranking import RankIndex, RankingService
+
+# (user ID, score)
+ROWS: List[Tuple[int, int]] = [(1, 50), (2, 30), (3, 30), (4, 30), (5, 10)]
+
+
+def make_cursor(rows: List[Tuple[int, int]]) -> MagicMock:
+    """ Makes a database cursor that returns the given rows.
+    :param rows: The rows the cursor returns. """
+
+    return MagicMock(execute=AsyncMock(), fetchall=AsyncMock(return_value=rows), close=AsyncMock())
+
+
+class TestRankIndex:
+    """ Class for testing the ranks of the bisect rank index. """
+
+    def setup_method(self) -> None:
+        """ Makes an index of the scores. """
+
+        self.index = RankIndex('score', "SELECT * FROM Scores", 1)
+        self.index.load(ROWS)
+
+    def ranks(self) -> List[int]:
+        """ Gets the IDs of the users in ranking order, checking they match their positions. """
+
+        user_ids = [row[0] for row in self.index.top(len(self.index))]
+        assert [self.index.rank(user_id)[0] for user_id in user_ids] == list(range(1, len(user_ids) + 1))
+        return user_ids
+
+    def test_ties_are_ordered_by_user_id(self) -> None:
+        """ Checks users with the same score are ranked by their IDs. """
+
+        assert self.ranks() == [1, 2, 3, 4, 5]
+        assert self.index.rank(3) == (3, 30)
+
+    def test_increment_across_ties(self) -> None:
+        """ Moves a user above the users they were tied with, then below them. """
+
+        self.index.increment(4, 1)
+        assert self.ranks() == [1, 4, 2, 3, 5]
+        assert self.index.rank(4) == (2, 31)
+
+        self.index.increment(4, -2)
+        assert self.ranks() == [1, 2, 3, 4, 5]
+        assert self.index.rank(4) == (4, 29)
+
+    def test_set_score_into_ties(self) -> None:
+        """ Moves a user into a tie, where their ID decides their position. """
+
+        self.index.set_score(1, 30)
+        assert self.ranks() == [1, 2, 3, 4, 5]
+
+        self.index.set_score(5, 30)
+        assert self.ranks() == [1, 2, 3, 4, 5]
+        assert self.index.rank(5) == (5, 30)
+
+        self.index.set_score(2, 10)
+        assert self.ranks() == [1, 3, 4, 5, 2]
+
+    def test_update_new_user(self) -> None:
+        """ Inserts a user who wasn't in the index. """
+
+        self.index.update((6, 30))
+        assert self.ranks() == [1, 2, 3, 4, 6, 5]
+        assert len(self.index) == 6
+
+    def test_remove(self) -> None:
+        """ Removes users, including one in a tie, and checks the others move up. """
+
+        self.index.remove(3)
+        assert self.ranks() == [1, 2, 4, 5]
+        assert self.index.rank(3) is None
+
+        self.index.remove(1)
+        assert self.ranks() == [2, 4, 5]
+        assert self.index.rank(2) == (1, 30)
+        assert len(self.index) == 3
+
+        # Removing someone who isn't there changes nothing
+        self.index.remove(1)
+        assert len(self.index) == 3
+
+    def test_missing_user(self) -> None:
+        """ Checks a missing user has no rank and their score changes are ignored. """
+
+        assert self.index.rank(42) is None
+
+        self.index.increment(42, 100)
+        self.index.set_score(42, 100)
+        assert self.index.rank(42) is None
+        assert self.ranks() == [1, 2, 3, 4, 5]
+
+    def test_empty_scores(self) -> None:
+        """ Checks rows without a score count as zero. """
+
+        self.index.update((6, None))
+        assert self.index.rank(6) == (6, None)
+        assert self.ranks()[-1] == 6
+
+
+class TestRankingService:
+    """ Class for testing that the ranking service serves and updates its snapshots. """
+
+    def setup_method(self) -> None:
+        """ Makes a ranking service with a metric and a snapshot. """
+
+        self.ranking = RankingService()
+        self.ranking.register('score', "SELECT * FROM Scores", 1)
+        self.ranking.register_snapshot('tribes', "SELECT * FROM Tribes")
+
+    async def test_loads_on_first_use(self) -> None:
+        """ Checks a leaderboard is loaded from the database the first time, then served from memory. """
+
+        cursor = make_cursor(ROWS)
+        with patch('extra.ranking.the_database', AsyncMock(return_value=(cursor, MagicMock()))) as the_database:
+            assert await self.ranking.rank('score', 3) == (3, 30)
+            assert [row[0] for row in await self.ranking.top('score', 2)] == [1, 2]
+            assert await self.ranking.rank('score', 42) is None
+
+        assert the_database.await_count == 1
+
+    async def test_write_path(self) -> None:
+        """ Checks the write path updates loaded indexes and ignores ones that aren't loaded yet. """
+
+        self.ranking.increment('score', 5, 100)
+        self.ranking.update('score', (6, 100))
+        assert not self.ranking.indexes['score'].loaded
+
+        cursor = make_cursor(ROWS)
+        with patch('extra.ranking.the_database', AsyncMock(return_value=(cursor, MagicMock()))):
+            await self.ranking.get_index('score')
+
+        self.ranking.increment('score', 5, 100)
+        assert await self.ranking.rank('score', 5) == (1, 110)
+
+        self.ranking.remove('score', 5)
+        assert await self.ranking.rank('score', 5) is None
+        assert await self.ranking.rank('score', 1) == (1, 50)
+
+    async def test_snapshot(self) -> None:
+        """ Checks a snapshot keeps the rows in the order the query gave them. """
+
+        cursor = make_cursor([('Sloths', 300), ('Pandas', 200), ('Koalas', 100)])
+        with patch('extra.ranking.the_database', AsyncMock(return_value=(cursor, MagicMock()))):
+            assert await self.ranking.top('tribes', 2) == [('Sloths', 300), ('Pandas', 200)]
+
+    async def test_refresh_error_keeps_snapshot(self) -> None:
+        """ Checks a failed rebuild keeps serving the last snapshot. """
+
+        cursor = make_cursor(ROWS)
+        with patch('extra.ranking.the_database', AsyncMock(return_value=(cursor, MagicMock()))):
+            await self.ranking.get_index('score')
+
+        cursor = make_cursor([])
+        cursor.execute.side_effect = ConnectionError("Database is down")
+        with patch('extra.ranking.the_database', AsyncMock(return_value=(cursor, MagicMock()))):
+            await self.ranking.refresh('score')
+
+        assert await self.ranking.rank('score', 3) == (3, 30)
+        cursor.close.assert_awaited()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import List, Optional
+from unittest.mock import patch
+
+from extra.scheduler import DeadlineScheduler
+
+
+class TestDeadlineScheduler:
+    """ Class for testing the deadline scheduler's heap, retries and resyncs. """
+
+    def setup_method(self) -> None:
+        """ Makes a scheduler and the log of the sweeps it runs. """
+
+        self.scheduler = DeadlineScheduler()
+        self.fired: List[str] = []
+
+    def teardown_method(self) -> None:
+        """ Stops the scheduler's task. """
+
+        self.scheduler.stop()
+
+    def sweep(self, name: str):
+        """ Makes a sweep that logs when it runs.
+        :param name: The name of the job. """
+
+        async def real_sweep() -> None:
+            self.fired.append(name)
+        return real_sweep
+
+    async def test_replaced_deadline(self) -> None:
+        """ Moves a job's deadline earlier and checks the stale heap entry never fires it. """
+
+        deadlines: List[Optional[float]] = [time.time() + 0.2]
+
+        async def next_deadline() -> Optional[float]:
+            return deadlines.pop(0) if deadlines else None
+
+        await self.scheduler.register('job', self.sweep('job'), next_deadline)
+        self.scheduler.schedule('job', time.time() + 0.05)
+        assert len(self.scheduler._heap) == 2
+
+        await asyncio.sleep(0.1)
+        assert self.fired == ['job']
+
+        # The old deadline comes due, but it's no longer the job's deadline
+        await asyncio.sleep(0.2)
+        assert self.fired == ['job']
+        assert self.scheduler._heap == []
+
+    async def test_later_deadline_is_ignored(self) -> None:
+        """ Schedules a later deadline than the job's and checks it doesn't replace it. """
+
+        async def next_deadline() -> Optional[float]:
+            return None
+
+        await self.scheduler.register('job', self.sweep('job'), next_deadline)
+        when = time.time() + 10
+        self.scheduler.schedule('job', when)
+        self.scheduler.schedule('job', when + 10)
+
+        assert self.scheduler._deadlines == {'job': when}
+        assert self.scheduler._heap == [(when, 'job')]
+        await asyncio.sleep(0)
+
+    async def test_retry_after_loader_error(self) -> None:
+        """ Makes a job's loader fail and checks the job is retried after the retry interval. """
+
+        calls = 0
+
+        async def next_deadline() -> Optional[float]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("Database is down")
+            return None
+
+        with patch('extra.scheduler.scheduler_retry_interval', 0.1):
+            await self.scheduler.register('job', self.sweep('job'), next_deadline)
+
+            await asyncio.sleep(0.05)
+            assert self.fired == []
+
+            await asyncio.sleep(0.1)
+            assert self.fired == ['job']
+            assert calls == 2
+
+            # Nothing is pending anymore
+            await asyncio.sleep(0.15)
+            assert self.fired == ['job']
+
+    async def test_fire_due_during_resync(self) -> None:
+        """ Makes a deadline come due while a resync is waiting on a loader and checks it fires once afterwards. """
+
+        resyncing = asyncio.Event()
+        release = asyncio.Event()
+        loads = 0
+
+        async def slow_next_deadline() -> Optional[float]:
+            nonlocal loads
+            loads += 1
+            # The first load is the registration; the second one is the resync
+            if loads == 2:
+                resyncing.set()
+                await release.wait()
+            return None
+
+        async def next_deadline() -> Optional[float]:
+            return None
+
+        with patch('extra.scheduler.scheduler_resync_interval', 0.05):
+            await self.scheduler.register('slow', self.sweep('slow'), slow_next_deadline)
+            await self.scheduler.register('job', self.sweep('job'), next_deadline)
+
+            await asyncio.wait_for(resyncing.wait(), timeout=1)
+            self.scheduler.schedule('job', time.time())
+            await asyncio.sleep(0.05)
+            # The resync is still running
+            assert self.fired == []
+
+            release.set()
+            await asyncio.sleep(0.02)
+            assert self.fired == ['job']
+
+            await asyncio.sleep(0.1)
+            assert self.fired == ['job']
@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from typing import List, Union
+
+import pytest
+
+from cogs.slothclass import SlothClass
+
+ATTACKER_ID: int = 111
+TARGET_ID: int = 222
+
+
+class FakeChannel:
+    """ A text channel whose sends can be held until the test releases them. """
+
+    def __init__(self) -> None:
+        self.sent: List[str] = []
+        self.hold = asyncio.Event()
+        self.hold.set()
+        self.sending = asyncio.Event()
+
+    async def fetch_message(self, message_id: int) -> MagicMock:
+        return MagicMock(embeds=[MagicMock()], edit=AsyncMock(), remove_reaction=AsyncMock())
+
+    async def send(self, content: str = None, **kwargs) -> None:
+        self.sending.set()
+        await self.hold.wait()
+        self.sent.append(content)
+
+
+class TestSkillSweeps:
+    """ Class for testing that the skill action sweeps never handle a skill action twice. """
+
+    def setup_method(self) -> None:
+        """ Makes a SlothClass cog whose database is a list of skill actions. """
+
+        self.currency = MagicMock(update_user_money=AsyncMock())
+        client = MagicMock()
+        client.get_cog.return_value = self.currency
+
+        self.cog = SlothClass(client)
+        self.cog.bots_txt = self.channel = FakeChannel()
+
+        # (attacker ID, skill type, timestamp, target ID, message ID, ...)
+        self.steals: List[List[Union[str, int]]] = [
+            [ATTACKER_ID, 'steal', 0, TARGET_ID, 1],
+            [ATTACKER_ID, 'steal', 0, TARGET_ID + 1, 2],
+        ]
+        self.sabotages: List[List[Union[str, int]]] = [
+            [ATTACKER_ID, 'sabotage', 0, TARGET_ID, None],
+            [ATTACKER_ID, 'sabotage', 0, TARGET_ID + 1, None],
+        ]
+
+        async def delete_by_message_id(message_id: int) -> None:
+            self.steals[:] = [steal for steal in self.steals if steal[4] != message_id]
+
+        async def delete_by_target_id_and_skill_type(target_id: int, skill_type: str) -> None:
+            self.sabotages[:] = [st for st in self.sabotages if st[3] != target_id]
+
+        self.cog.get_expired_steals = AsyncMock(side_effect=lambda: list(self.steals))
+        self.cog.get_expired_sabotages = AsyncMock(side_effect=lambda: list(self.sabotages))
+        self.cog.delete_skill_action_by_message_id = AsyncMock(side_effect=delete_by_message_id)
+        self.cog.delete_skill_action_by_target_id_and_skill_type = AsyncMock(side_effect=delete_by_target_id_and_skill_type)
+        self.cog.get_user_currency = AsyncMock(return_value=(TARGET_ID, 100))
+        self.cog.get_sloth_profile = AsyncMock(return_value=[ATTACKER_ID, 'Prawler', 0, 0, 0, 0, 0])
+        self.cog.get_steal_embed = AsyncMock(return_value=MagicMock())
+
+    def transfers(self) -> List[int]:
+        """ Gets the users whose money moved to the attacker. """
+
+        return [call.args[0] for call in self.currency.update_user_money.await_args_list if call.args[1] < 0]
+
+    async def test_cancelled_steal_sweep(self) -> None:
+        """ Cancels a steal sweep after it moved money and checks the next one doesn't move it again. """
+
+        self.channel.hold.clear()
+        sweep = asyncio.create_task(self.cog.check_steals())
+        await self.channel.sending.wait()
+        sweep.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sweep
+
+        assert self.transfers() == [TARGET_ID]
+
+        self.channel.hold.set()
+        await self.cog.check_steals()
+
+        assert self.transfers() == [TARGET_ID, TARGET_ID + 1]
+        assert self.steals == []
+
+    async def test_timed_out_steal_sweep(self) -> None:
+        """ Lets the Discord calls of a steal sweep time out and checks the next one doesn't move money again. """
+
+        self.channel.hold.clear()
+        with patch('extra.slothclasses.player.skill_sweep_timeout', 0.01):
+            await self.cog.run_skill_sweep(asyncio.Semaphore(1), 'check_steals')
+
+        assert self.transfers() == [TARGET_ID, TARGET_ID + 1]
+        assert self.steals == []
+
+        self.channel.hold.set()
+        await self.cog.run_skill_sweep(asyncio.Semaphore(1), 'check_steals')
+
+        assert self.transfers() == [TARGET_ID, TARGET_ID + 1]
+        assert self.channel.sent == []
+
+    async def test_timed_out_expiry_sweep(self) -> None:
+        """ Lets the Discord call of an expiry sweep time out and checks each skill action is only announced once. """
+
+        self.channel.hold.clear()
+        with patch('extra.slothclasses.player.skill_sweep_timeout', 0.01):
+            await self.cog.run_skill_sweep(asyncio.Semaphore(1), 'check_sabotages')
+
+        stats = self.cog.skill_sweep_stats['check_sabotages']
+        assert stats['timeouts'] == 1
+        assert self.sabotages == [[ATTACKER_ID, 'sabotage', 0, TARGET_ID + 1, None]]
+
+        self.channel.hold.set()
+        await self.cog.run_skill_sweep(asyncio.Semaphore(1), 'check_sabotages')
+
+        assert len(self.channel.sent) == 1
+        assert self.sabotages == []
+        assert stats['rows'] == 1
@@ -0,0 +1,140 @@
+from typing import List, Tuple
+
+from extra.tool.voice_activity_store import VoiceActivityStore
+
+CHANNEL, OTHER_CHANNEL = 10, 11
+MEMBER, OTHER_MEMBER = 20, 21
+
+
+def minute(hour: int, minute: int = 0) -> int:
+    """ Gets the minute of the day of a time.
+    :param hour: The hour of the day.
+    :param minute: The minute of the hour. """
+
+    return hour * 60 + minute
+
+
+class TestVoiceActivityStore:
+    """ Class for testing the ring of hour buckets of the voice channel activity. """
+
+    def setup_method(self) -> None:
+        """ Makes a store that keeps 3 hours. """
+
+        self.store = VoiceActivityStore(limit_hours=3)
+
+    def add(self, the_minute: int, channel_id: int = CHANNEL, member_id: int = MEMBER) -> List[int]:
+        """ Adds a record to the store.
+        :param the_minute: The minute of the day.
+        :param channel_id: The ID of the channel.
+        :param member_id: The ID of the member. """
+
+        return self.store.add(the_minute, channel_id, f"channel-{channel_id}", member_id, f"member-{member_id}")
+
+    def test_expiry_across_midnight(self) -> None:
+        """ Fills hours past midnight and checks the oldest ones expire in the right order. """
+
+        assert self.add(minute(22, 5)) == []
+        assert self.add(minute(23, 0)) == []
+        assert self.add(minute(0, 10)) == []
+        assert self.store.hours == [22, 23, 0]
+
+        assert self.add(minute(1, 0)) == [22]
+        assert self.store.hours == [23, 0, 1]
+        assert len(self.store) == 3
+
+    def test_expiry_after_a_gap(self) -> None:
+        """ Skips hours past midnight and checks every hour that fell out of the ring expires at once. """
+
+        self.add(minute(22, 5))
+        self.add(minute(23, 0))
+
+        assert self.add(minute(1, 30)) == [22]
+        assert self.add(minute(5, 0)) == [23, 1]
+        assert self.store.hours == [5]
+
+    def test_expired_names_are_dropped(self) -> None:
+        """ Checks the names of channels and members that are only in expired hours are dropped. """
+
+        self.add(minute(23, 0), OTHER_CHANNEL, OTHER_MEMBER)
+        self.add(minute(0, 0))
+        self.add(minute(2, 0))
+
+        assert self.store.get_name(OTHER_MEMBER) is None
+        assert self.store.get_name(OTHER_CHANNEL) is None
+        assert self.store.get_name(MEMBER) == f"member-{MEMBER}"
+        assert list(self.store.scan(0, 1439)) == [(minute(0, 0), CHANNEL, MEMBER), (minute(2, 0), CHANNEL, MEMBER)]
+
+    def test_scan_past_midnight(self) -> None:
+        """ Scans a range that starts before midnight and ends after it. """
+
+        self.add(minute(22, 50))
+        self.add(minute(23, 10))
+        self.add(minute(23, 59), OTHER_CHANNEL)
+        self.add(minute(0, 0), member_id=OTHER_MEMBER)
+        self.add(minute(0, 30))
+        self.add(minute(0, 31))
+
+        assert list(self.store.scan(minute(23, 0), minute(0, 30))) == [
+            (minute(23, 10), CHANNEL, MEMBER),
+            (minute(23, 59), OTHER_CHANNEL, MEMBER),
+            (minute(0, 0), CHANNEL, OTHER_MEMBER),
+            (minute(0, 30), CHANNEL, MEMBER),
+        ]
+
+    def test_scan_filters(self) -> None:
+        """ Scans for a single channel and member, and for ones the store doesn't know. """
+
+        self.add(minute(23, 10))
+        self.add(minute(23, 59), OTHER_CHANNEL)
+        self.add(minute(0, 0), member_id=OTHER_MEMBER)
+
+        assert list(self.store.scan(minute(23, 0), minute(0, 30), channel_id=OTHER_CHANNEL)) == [
+            (minute(23, 59), OTHER_CHANNEL, MEMBER)]
+        assert list(self.store.scan(minute(23, 0), minute(0, 30), member_id=OTHER_MEMBER)) == [
+            (minute(0, 0), CHANNEL, OTHER_MEMBER)]
+        assert list(self.store.scan(minute(23, 0), minute(0, 30), channel_id=42)) == []
+
+    def test_out_of_order_minutes(self) -> None:
+        """ Adds a minute before the last one of the same hour and checks the bucket stays sorted. """
+
+        self.add(minute(12, 30))
+        self.add(minute(12, 10), OTHER_CHANNEL)
+
+        assert [record[0] for record in self.store.scan(minute(12, 0), minute(12, 59))] == [minute(12, 10), minute(12, 30)]
+
+    def test_load_replays_oldest_hours_first(self) -> None:
+        """ Loads unsorted records from across midnight and checks they're replayed from the oldest hour. """
+
+        records: List[Tuple[int, int, int]] = [
+            (minute(0, 5), CHANNEL, MEMBER),
+            (minute(23, 10), CHANNEL, MEMBER),
+            (minute(20, 0), OTHER_CHANNEL, OTHER_MEMBER),
+            (minute(22, 50), CHANNEL, OTHER_MEMBER),
+            (minute(0, 1), CHANNEL, MEMBER),
+        ]
+        names = [(CHANNEL, 'General'), (MEMBER, 'Sloth')]
+
+        expired = self.store.load(records, names, current_minute=minute(0, 30))
+
+        assert expired == [20]
+        assert self.store.hours == [22, 23, 0]
+        assert list(self.store.scan(minute(22, 0), minute(0, 59))) == [
+            (minute(22, 50), CHANNEL, OTHER_MEMBER),
+            (minute(23, 10), CHANNEL, MEMBER),
+            (minute(0, 1), CHANNEL, MEMBER),
+            (minute(0, 5), CHANNEL, MEMBER),
+        ]
+        assert self.store.get_name(CHANNEL) == 'General'
+        assert self.store.get_name(OTHER_MEMBER) == str(OTHER_MEMBER)
+        # What was loaded is already in the database
+        assert self.store.pending == []
+        assert self.store.pending_names == {}
+
+    def test_load_expires_stale_hours(self) -> None:
+        """ Loads records that are all older than the ring and checks nothing is kept. """
+
+        expired = self.store.load([(minute(10, 0), CHANNEL, MEMBER)], [], current_minute=minute(15, 0))
+
+        assert expired == [10]
+        assert self.store.hours == [15]
+        assert len(self.store) == 0